@@ -0,0 +1,216 @@
+"""
+Times level loading, from JSON and compiled, and each phase of a frame on synthetic levels of growing size, headless.
+Also measures the pixel memory and draw time of each render scale's framebuffer.
+Run from the repository root:
+    python -m benchmarks.frame_phases --sizes 100 1000 10000 100000 --out bench.json
+    python -m benchmarks.frame_phases --compare old.json new.json
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import pygame
+from benchmarks.level_generator import write_level
+from utility.image_loader import ImageLoader
+from utility.spritesheet import SpriteSheet
+from utility.game_constants import SCREEN_WIDTH, SCREEN_HEIGHT, SIMULATION_DT
+from utility.render_layers import WORLD_LAYERS
+from game_objects.other.level import Level
+from game_objects.other.level_compiler import compile_level
+from game_objects.entities.player import Player, BLUE_WIDTH, BLUE_HEIGHT, BLACK
+
+# Constants
+DEFAULT_SIZES : list[int] = [100, 1000, 10000, 100000]
+DEFAULT_FRAMES : int = 300
+DEFAULT_SCALES : list[int] = [1, 2]
+FRAME_PHASES : list[str] = ["find_near_blocks", "handle_collisions", "animate", "layers_draw"]
+
+# Helpers
+def summarize(samples : list[float]) -> dict[str, float]:
+    """
+    Reduces timings (seconds) to stats in microseconds
+    :param samples: list[float]
+    :return dict[str, float]
+    """
+    ordered : list[float] = sorted(samples)
+    def percentile(p : float) -> float: return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1e6
+    return {"n": len(ordered), "mean_us": statistics.fmean(ordered) * 1e6, "p50_us": percentile(0.5),
+            "p99_us": percentile(0.99), "max_us": ordered[-1] * 1e6}
+
+def timed(samples : list[float], function):
+    def wrapper(*args, **kwargs):
+        start : float = time.perf_counter()
+        result = function(*args, **kwargs)
+        samples.append(time.perf_counter() - start)
+        return result
+    return wrapper
+
+def surface_bytes(surface : pygame.Surface) -> int: return surface.get_bytesize() * surface.get_width() * surface.get_height()
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+# Benchmarks
+def bench_get_frame(assets : ImageLoader, repeats : int) -> dict[str, float]:
+    sheet : SpriteSheet = SpriteSheet(image=assets.get_image("entities", "frog_hop.png"))
+    samples : list[float] = []
+    for i in range(repeats):
+        start : float = time.perf_counter()
+        sheet.get_frame(i % 7, 21, 24, (BLUE_WIDTH, BLUE_HEIGHT), BLACK, 48, 11, 9)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+def bench_load(path : str, assets : ImageLoader, tilemap : bool) -> dict[str, float]:
+    """
+    Times making a Level and streaming in the first screen of it, which is where compiled levels read their chunks
+    :return dict[str, float]: seconds
+    """
+    start : float = time.perf_counter()
+    level : Level = Level(level_data=path, assets=assets, tilemap=tilemap)
+    load_s : float = time.perf_counter() - start
+    start = time.perf_counter()
+    level.stream(pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+    first_view_s : float = time.perf_counter() - start
+    level.close()
+    return {"load_s": load_s, "first_view_s": first_view_s}
+
+def bench_render_scale(path : str, assets : ImageLoader, scale : int, frames : int, tilemap : bool) -> dict[str, object]:
+    """
+    Pixel memory of the first screen of a level drawn at 1/scale, background, chunks and static layer included,
+    and the time to draw it into a framebuffer that size. Assets cached for another scale are dropped first.
+    :return dict[str, object]
+    """
+    assets.cache.clear()
+    level : Level = Level(level_data=path, assets=assets, tilemap=tilemap, render_scale=scale)
+    view : pygame.Rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+    level.stream(view)
+    static_layer : pygame.Surface = level.static_layer()[0]
+    framebuffer : pygame.Surface = pygame.Surface((SCREEN_WIDTH // scale, SCREEN_HEIGHT // scale))
+    samples : list[float] = []
+    for _ in range(frames):
+        start : float = time.perf_counter()
+        level.layers.draw(framebuffer, view, WORLD_LAYERS, scale)
+        samples.append(time.perf_counter() - start)
+    images : int = sum(surface_bytes(sprite.image) for sprite in level.layers.sprites())
+    level.close()
+    return {"image_bytes": images, "static_layer_bytes": surface_bytes(static_layer), "framebuffer_bytes": surface_bytes(framebuffer),
+            "cache_bytes": assets.cache.bytes, "draw": summarize(samples)}
+
+def bench_level(path : str, assets : ImageLoader, window : pygame.Surface, frames : int, tilemap : bool) -> dict[str, object]:
+    start : float = time.perf_counter()
+    level : Level = Level(level_data=path, assets=assets, tilemap=tilemap)
+    load_s : float = time.perf_counter() - start
+
+    player : Player = Player(pos=level.start_pos, assets=assets)
+    player.set_layers(level.layers)
+    view : pygame.Rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+    level.stream(view)
+    samples : dict[str, list[float]] = {phase: [] for phase in FRAME_PHASES}
+    samples["frame"] = []
+    find_near_blocks = timed(samples["find_near_blocks"], level.find_near_blocks)
+    player._handle_collisions = timed(samples["handle_collisions"], player._handle_collisions)
+    player._animate = timed(samples["animate"], player._animate)
+    draw = timed(samples["layers_draw"], level.layers.draw) # the whole scene, drawn the way Game draws it
+
+    player.handle_input(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_d))
+    for frame in range(frames):
+        if frame % 40 == 0: player.handle_input(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+        elif frame % 40 == 10: player.handle_input(pygame.event.Event(pygame.KEYUP, key=pygame.K_SPACE))
+        frame_start : float = time.perf_counter()
+        player.move(dt=SIMULATION_DT, blocks=find_near_blocks(player, SIMULATION_DT))
+        draw(window, view)
+        samples["frame"].append(time.perf_counter() - frame_start)
+
+    return {"loaded_blocks": len(level.terrain), "loaded_chunks": level.loaded_chunks, "load_s": load_s,
+            "phases": {phase: summarize(phase_samples) for phase, phase_samples in samples.items()}}
+
+def run(sizes : list[int], frames : int, seed : int, level_dir : str, tilemap : bool = False,
+        scales : list[int] = DEFAULT_SCALES) -> dict[str, object]:
+    pygame.init()
+    window : pygame.Surface = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    assets : ImageLoader = ImageLoader()
+    results : dict[str, object] = {
+        "meta": {"commit": git_commit(), "python": platform.python_version(), "pygame": pygame.version.ver,
+                 "frames": frames, "seed": seed, "tilemap": tilemap, "video_driver": os.environ["SDL_VIDEODRIVER"]},
+        "get_frame": bench_get_frame(assets, repeats=frames),
+        "levels": {}
+    }
+    for size in sizes:
+        path : str = write_level(os.path.join(level_dir, f"synthetic_{size}.json"), size, seed)
+        level_results : dict[str, object] = bench_level(path, assets, window, frames, tilemap)
+        level_results["json"] = bench_load(path, assets, tilemap)
+        level_results["compiled"] = bench_load(compile_level(path), assets, tilemap)
+        level_results["render_scales"] = {str(scale): bench_render_scale(path, assets, scale, frames, tilemap) for scale in scales}
+        results["levels"][str(size)] = level_results
+        print(f"{size:>7} blocks: load {level_results['load_s'] * 1000:.1f} ms, "
+              f"JSON load + first view {sum(level_results['json'].values()) * 1000:.1f} ms, "
+              f"compiled {sum(level_results['compiled'].values()) * 1000:.1f} ms, "
+              f"frame p50 {level_results['phases']['frame']['p50_us']:.0f} us", file=sys.stderr)
+        for scale, scale_results in level_results["render_scales"].items():
+            print(f"{'':>7} scale {scale}: {(scale_results['image_bytes'] + scale_results['static_layer_bytes']) / 2 ** 20:.1f} MiB of images, "
+                  f"draw p50 {scale_results['draw']['p50_us']:.0f} us", file=sys.stderr)
+    pygame.quit()
+    return results
+
+def compare(old : dict, new : dict) -> list[str]:
+    """
+    Lines of new/old ratios for load time and per-phase p50, above 1 means slower
+    :return list[str]
+    """
+    lines : list[str] = []
+    for size, new_level in new["levels"].items():
+        old_level : dict | None = old["levels"].get(size)
+        if old_level is None: continue
+        lines.append(f"{size} blocks: load x{new_level['load_s'] / old_level['load_s']:.2f}")
+        for kind in ("json", "compiled"):
+            if kind in new_level and kind in old_level:
+                lines.append(f"  {kind} load + first view: x{sum(new_level[kind].values()) / sum(old_level[kind].values()):.2f}")
+        for scale, stats in new_level.get("render_scales", {}).items():
+            old_stats : dict | None = old_level.get("render_scales", {}).get(scale)
+            if old_stats is None: continue
+            lines.append(f"  scale {scale} image bytes: x{stats['image_bytes'] / old_stats['image_bytes']:.2f}, "
+                         f"draw p50 x{stats['draw']['p50_us'] / old_stats['draw']['p50_us']:.2f}")
+        for phase, stats in new_level["phases"].items():
+            if phase in old_level["phases"] and old_level["phases"][phase]["p50_us"] > 0:
+                lines.append(f"  {phase}: p50 x{stats['p50_us'] / old_level['phases'][phase]['p50_us']:.2f}")
+    return lines
+
+def main():
+    parser : argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tilemap", action="store_true", help="load terrain into the tilemap backend")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES, help="render scales to measure memory and draw time at")
+    parser.add_argument("--levels", default="", help="keep generated levels in this directory")
+    parser.add_argument("--out", default="", help="write results JSON here instead of stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two results files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as old_file, open(args.compare[1]) as new_file:
+            print("\n".join(compare(json.load(old_file), json.load(new_file))))
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        level_dir : str = args.levels or temp_dir
+        os.makedirs(level_dir, exist_ok=True)
+        results : dict[str, object] = run(args.sizes, args.frames, args.seed, level_dir, args.tilemap, args.scales)
+    if args.out:
+        with open(args.out, "w") as file: json.dump(results, file, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import json
+import math
+import random
+from utility.game_constants import CELL_SIZE, SCREEN_WIDTH, SCREEN_HEIGHT
+
+# Constants
+DENSITY : float = 0.25 # fraction of the grid's cells that get a block
+BACKGROUND : str = "background.png"
+
+def generate_level(blocks : int, seed : int = 0, name : str = "") -> dict:
+    """
+    Builds level data in the terrain/start_pos schema with the given number of terrain entries.
+    Blocks are 1x1 cells scattered over a grid sized so about DENSITY of it is filled, with a floor under the start.
+    :param blocks: int
+    :param seed: int
+    :param name: str
+    :return dict
+    """
+    rng : random.Random = random.Random(seed)
+    screen_cols : int = SCREEN_WIDTH // CELL_SIZE
+    screen_rows : int = SCREEN_HEIGHT // CELL_SIZE
+    cols : int = max(screen_cols, math.ceil(math.sqrt(blocks / DENSITY * screen_cols / screen_rows)))
+    rows : int = max(screen_rows, math.ceil(blocks / DENSITY / cols))
+
+    floor_row : int = screen_rows - 1
+    terrain : list[dict] = [{"x": 0, "y": floor_row, "kind": 1, "width": screen_cols, "height": 1}]
+    free_cells : list[int] = [cell for cell in range(cols * rows) if cell // cols != floor_row or cell % cols >= screen_cols]
+    for cell in rng.sample(free_cells, min(blocks - 1, len(free_cells))):
+        terrain.append({"x": cell % cols, "y": cell // cols, "kind": 1, "width": 1, "height": 1})
+
+    return {
+        "level_name": name or f"synthetic-{blocks}",
+        "start_pos": [SCREEN_WIDTH // 2, 0],
+        "background": BACKGROUND,
+        "terrain": terrain
+    }
+
+def write_level(path : str, blocks : int, seed : int = 0) -> str:
+    with open(path, "w") as file:
+        json.dump(generate_level(blocks, seed), file)
+    return path
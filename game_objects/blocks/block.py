@@ -1,10 +1,11 @@
 import pygame
 from utility.game_constants import CELL_SIZE
+from utility.image_loader import derive_surface, load_cached, mask_for
 
 # Block Constants
 DIRECTIONS : list[str] = ["top", "bot", "left", "right"]
 
-class Block(pygame.sprite.Sprite):
+class Block(pygame.sprite.DirtySprite):
     # Attributes
     _passthrough : dict[str, bool]
 
@@ -15,9 +16,9 @@ class Block(pygame.sprite.Sprite):
         if sprite_path == "" and image is None: raise ValueError("Block: At least one of sprite_path or image must be provided")
         super().__init__()
         if image is not None:
-            self.image = pygame.transform.scale(image, size=(width, height)).convert_alpha()
+            self.image = derive_surface(image, size=(width, height))
         elif sprite_path != "":
-            self.image = pygame.transform.scale(pygame.image.load(sprite_path), size=(width, height)).convert_alpha()
+            self.image = derive_surface(load_cached(sprite_path), size=(width, height))
         self.rect = self.image.get_rect()
         self.rect.x, self.rect.y = pos
         self._passthrough = {"top": top, "bot": bot, "left": left, "right": right}
@@ -29,5 +30,8 @@ class Block(pygame.sprite.Sprite):
     @property
     def pos(self) -> tuple[int, int]: return self.rect.x // CELL_SIZE, self.rect.y // CELL_SIZE
 
+    @property
+    def mask(self) -> pygame.Mask: return mask_for(self.image) # cached per surface, also what collide_mask looks for
+
     # Methods
     def collide(self): return
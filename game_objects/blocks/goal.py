@@ -0,0 +1,16 @@
+import pygame
+from utility.image_loader import derive_surface
+from game_objects.blocks.trigger import Trigger, GOAL
+
+# Goal Constants
+GOAL_IMAGE : tuple[str, str] = ("blocks", "goal_flag.png")
+
+class Goal(Trigger):
+    """
+    The Trigger that finishes a level, drawn as the goal flag stretched over its area
+    """
+    # Magic Methods
+    def __init__(self, pos : tuple[int, int], width : int, height : int, image : pygame.Surface, name : str = ""):
+        super().__init__(kind=GOAL, pos=pos, width=width, height=height, name=name)
+        self.image = derive_surface(image, size=(width, height))
+        self.visible = 1
@@ -1,39 +1,156 @@
 import pygame
-from utility.game_constants import CELL_SIZE, GRAVITY_ACC, TERMINAL_VELOCITY
+from collections import deque
+from utility.game_constants import CELL_SIZE
+from utility.image_loader import derive_surface, load_cached
 from game_objects.blocks.block import Block
+from game_objects.entities.entity_store import EntityStore, GRAVITY, MOVES, CULL, COLLIDES
 
 # Platform Constants
 BROKEN_PATH : str = './assets/blocks/falling_platform.png'
 PLATFORM_WIDTH : int = 3 * CELL_SIZE
 PLATFORM_HEIGHT : int = CELL_SIZE
+FALLING_FLAGS : int = GRAVITY | MOVES | CULL | COLLIDES
 
 class Platform(Block):
+    """
+    A Block whose fall is simulated by an EntityStore: drop() switches its row over to gravity,
+    the owner steps the store and calls sync() to move the rect.
+    """
     # Attributes
-    _vel_y : float = 0
     _falling : bool = False
+    _store : EntityStore
+    _index : int # row in the store, -1 while released
+    _normal_image : pygame.Surface
 
     # Magic Methods
-    def __init__(self, pos : tuple[int, int], image : pygame.Surface):
+    def __init__(self, pos : tuple[int, int], image : pygame.Surface, store : EntityStore):
+        """
+        :param pos: tuple[int, int], top centre
+        :param image: pygame.Surface
+        :param store: EntityStore, shared with the other Platforms, see PlatformPool
+        """
         pos = (pos[0] - PLATFORM_WIDTH // 2, pos[1])
         super().__init__(image=image, pos=pos, width=PLATFORM_WIDTH, height=PLATFORM_HEIGHT)
+        self._store = store
+        self._index = self._store.add(pos=self.rect.topleft, size=self.rect.size)
+        self._normal_image = self.image
 
     # Accessors/Setters
     @property
     def is_falling(self) -> bool: return self._falling
 
     @property
-    def speed(self) -> float: return self._vel_y
+    def speed(self) -> float: return float(self._store.vel[self._index, 1])
+
+    @property
+    def index(self) -> int: return self._index
 
     # Methods
     def collide(self):
         self._falling = True
-        self.image = pygame.transform.scale(pygame.image.load(BROKEN_PATH), size=(PLATFORM_WIDTH, PLATFORM_HEIGHT)).convert_alpha()
-
-    def _accelerate_by_gravity(self, dt : float):
-        if self._falling:
-            new_vel_y : float = self._vel_y + (GRAVITY_ACC * dt)
-            self._vel_y = min(new_vel_y, TERMINAL_VELOCITY)
+        self.image = derive_surface(load_cached(BROKEN_PATH), size=(PLATFORM_WIDTH, PLATFORM_HEIGHT))
 
     def move(self, dt : float):
-        self._accelerate_by_gravity(dt)
-        self.rect.y += self._vel_y * dt
+        """
+        Steps this Platform alone, owners of many Platforms step their shared store instead
+        """
+        if not self._falling: return
+        self.drop()
+        self._store.step_one(self._index, dt)
+        self.sync()
+
+    def drop(self):
+        """
+        Lets the store move the Platform, collide() only breaks it
+        """
+        self._store.set_flag(self._index, FALLING_FLAGS)
+
+    def reset(self, pos : tuple[int, int]):
+        """
+        Puts a released Platform back in the world as if it was just made at pos, claiming a new row
+        :param pos: tuple[int, int]
+        """
+        self.rect.topleft = (pos[0] - PLATFORM_WIDTH // 2, pos[1])
+        self.image = self._normal_image
+        self._falling = False
+        self._index = self._store.add(pos=self.rect.topleft, size=self.rect.size)
+
+    def save_state(self) -> tuple[tuple[int, int, int, int], pygame.Surface, bool, int]:
+        return tuple(self.rect), self.image, self._falling, self._index
+
+    def load_state(self, state : tuple[tuple[int, int, int, int], pygame.Surface, bool, int]):
+        """
+        Restores a save_state(), the row in the store is restored with the store itself
+        """
+        rect, self.image, self._falling, self._index = state
+        self.rect.update(rect)
+
+    def sync(self): self.rect.y = int(self._store.pos[self._index, 1])
+
+    def release(self, culled : bool = False):
+        """
+        Gives the Platform's row back to the store
+        :param culled: bool, the store already removed the row itself
+        """
+        if self._index < 0: return
+        if not culled: self._store.remove(self._index)
+        self._index = -1
+
+class PlatformPool:
+    """
+    Recycles Platforms: spawning one reuses a released Platform and its surfaces when there is one, so placing
+    and losing platforms allocates nothing once the pool is warm. Live Platforms share one store, pooled ones hold no row.
+    """
+    # Attributes
+    store : EntityStore
+    _image : pygame.Surface
+    _free : deque[Platform]
+
+    # Magic Methods
+    def __init__(self, image : pygame.Surface, store : EntityStore = None):
+        """
+        :param image: pygame.Surface, unbroken platform image
+        :param store: EntityStore, shared with whoever else steps it, such as the Player, a new one if None
+        """
+        self.store = store if store is not None else EntityStore()
+        self._image = image
+        self._free = deque()
+
+    def __len__(self) -> int: return len(self._free)
+
+    # Methods
+    def spawn(self, pos : tuple[int, int]) -> Platform:
+        """
+        A Platform centred on pos horizontally, recycled when possible
+        :param pos: tuple[int, int]
+        :return Platform
+        """
+        if not self._free: return Platform(pos=pos, image=self._image, store=self.store)
+        platform : Platform = self._free.pop()
+        platform.reset(pos)
+        return platform
+
+    def recycle(self, platform : Platform, culled : bool = False):
+        """
+        Takes back a Platform that left the world
+        :param platform: Platform
+        :param culled: bool, the store already removed its row
+        """
+        platform.release(culled)
+        self._free.append(platform)
+
+    def reserve(self, count : int):
+        """
+        Makes sure count Platforms are pooled, so the next count spawns create nothing
+        :param count: int
+        """
+        for _ in range(count - len(self._free)): self.recycle(Platform(pos=(0, 0), image=self._image, store=self.store))
+
+    def save_state(self) -> tuple[list[Platform], tuple]:
+        return list(self._free), self.store.save_state()
+
+    def load_state(self, state : tuple[list[Platform], tuple]):
+        free, store = state
+        self._free = deque(free)
+        self.store.load_state(store)
+        for platform in self._free: platform.release(culled=True) # rows they held since were restored away with the store
@@ -0,0 +1,44 @@
+import pygame
+from utility.game_constants import CELL_SIZE
+
+# Trigger Kinds
+GOAL : str = "goal" # finishes the level
+HAZARD : str = "hazard" # sends the Player back to its last checkpoint
+CHECKPOINT : str = "checkpoint" # where the Player comes back after a hazard
+ZONE : str = "zone" # only reported, for scripted events
+TRIGGER_KINDS : list[str] = [GOAL, HAZARD, CHECKPOINT, ZONE]
+
+class Trigger(pygame.sprite.DirtySprite):
+    """
+    An area of a level that does something when the Player enters it, nothing collides with it.
+    Invisible unless a subclass gives it an image, see game_objects.other.triggers for how entering one is noticed.
+    """
+    # Attributes
+    kind : str
+    name : str
+
+    # Magic Methods
+    def __init__(self, kind : str, pos : tuple[int, int], width : int, height : int, name : str = ""):
+        if kind not in TRIGGER_KINDS: raise ValueError(f"Trigger: Unknown kind {kind}, expected one of {TRIGGER_KINDS}")
+        super().__init__()
+        self.kind = kind
+        self.name = name
+        self.rect = pygame.Rect(pos, (width, height))
+        self.image = pygame.Surface((0, 0))
+        self.visible = 0
+
+    def __repr__(self) -> str: return f"Trigger({self.kind}, {self.name or tuple(self.rect)})"
+
+    # Accessors/Setters
+    @property
+    def pos(self) -> tuple[int, int]: return self.rect.x // CELL_SIZE, self.rect.y // CELL_SIZE
+
+    # Methods
+    def spawn_pos(self, width : int, height : int) -> tuple[int, int]:
+        """
+        Top left an entity of this size is placed at to come back here: centred, feet on the bottom edge
+        :param width: int
+        :param height: int
+        :return tuple[int, int]
+        """
+        return self.rect.centerx - width // 2, self.rect.bottom - height
@@ -1,31 +1,81 @@
 import pygame
 from utility.game_constants import GRAVITY_ACC, TERMINAL_VELOCITY
+from utility.image_loader import derive_surface, load_cached
+from game_objects.entities.entity_store import EntityStore, ACTIVE, GRAVITY, MOVES, CULL
 
-class Entity(pygame.sprite.Sprite):
+class Entity(pygame.sprite.DirtySprite):
+    """
+    A sprite with a row in an EntityStore. Its velocity is a view into the row, so entities that share a store are
+    moved together by EntityStore.step and only sync() their rect afterwards.
+    A subclass that steps itself in Python can shadow _vel_x and _vel_y with plain float attributes, see Player.
+    """
     # Attributes
     rect : pygame.Rect
     _image : pygame.Surface
     _width : int
     _height : int
-    _vel_x : float = 0
-    _vel_y : float = 0
+    _store : EntityStore
+    _index : int
 
     # Methods
-    def __init__(self, pos : tuple[int, int], width : int, height : int, sprite_path : str = "", image : pygame.Surface = None):
+    def __init__(self, pos : tuple[int, int], width : int, height : int, sprite_path : str = "", image : pygame.Surface = None,
+                 store : EntityStore = None, flags : int = ACTIVE | GRAVITY | MOVES | CULL):
         if sprite_path == "" and image is None: raise ValueError("Entity: At least one of sprite_path or image must be provided")
         super().__init__()
-        if image is not None: self._image = pygame.transform.scale(image, size=(width, height)).convert_alpha()
-        elif sprite_path != "": self._image = pygame.transform.scale(pygame.image.load(sprite_path), size=(width, height)).convert_alpha()
+        if image is not None: self._image = derive_surface(image, size=(width, height))
+        elif sprite_path != "": self._image = derive_surface(load_cached(sprite_path), size=(width, height))
         self.rect = self._image.get_rect()
         self._width = width
         self._height = height
         self.rect.x, self.rect.y = pos
+        self._store = store if store is not None else EntityStore()
+        self._index = self._store.add(pos=self.rect.topleft, flags=flags, size=(width, height))
 
     def _accelerate_by_gravity(self, dt : float):
         new_vel_y : float = self._vel_y + (GRAVITY_ACC * dt)
         self._vel_y = min(TERMINAL_VELOCITY, new_vel_y)
 
+    def push(self):
+        """
+        Copies rect into the store, after the Entity was moved outside of an EntityStore.step
+        """
+        self._store.pos[self._index] = self.rect.topleft
+
+    def sync(self):
+        """
+        Copies the store's position into rect, after an EntityStore.step
+        """
+        self.rect.x, self.rect.y = int(self._store.pos[self._index, 0]), int(self._store.pos[self._index, 1])
+
+    def place(self, pos : tuple[int, int]):
+        """
+        Puts the Entity at pos at rest, without moving it through anything in between
+        :param pos: tuple[int, int]
+        """
+        self.rect.topleft = pos
+        self._vel_x = 0.0
+        self._vel_y = 0.0
+        self.push()
+
+    def release(self):
+        """
+        Hands the Entity's row back to its store
+        """
+        self._store.remove(self._index)
+
     # Accessors/Setters
+    @property
+    def _vel_x(self) -> float: return float(self._store.vel[self._index, 0])
+
+    @_vel_x.setter
+    def _vel_x(self, value : float): self._store.vel[self._index, 0] = value
+
+    @property
+    def _vel_y(self) -> float: return float(self._store.vel[self._index, 1])
+
+    @_vel_y.setter
+    def _vel_y(self, value : float): self._store.vel[self._index, 1] = value
+
     @property
     def width(self) -> int: return self._width
 
@@ -33,4 +83,7 @@ class Entity(pygame.sprite.Sprite):
     def height(self) -> int: return self._height
 
     @property
-    def vel(self) -> tuple[float, float]: return self._vel_x, self._vel_y
\ No newline at end of file
+    def vel(self) -> tuple[float, float]: return self._vel_x, self._vel_y
+
+    @property
+    def index(self) -> int: return self._index
@@ -0,0 +1,133 @@
+import numpy as np
+import pygame
+from utility.game_constants import GRAVITY_ACC, TERMINAL_VELOCITY
+from utility.collision import TerrainCollider, round_like_rect
+
+# Flag Constants
+ACTIVE : int = 1 # slot is in use
+GRAVITY : int = 2 # accelerated by gravity in step()
+MOVES : int = 4 # integrated by step()
+CULL : int = 8 # removed by step() once it falls past the cull line
+COLLIDES : int = 16 # integrated through the terrain passed to step()
+GROUNDED : int = 32 # set by step() while a COLLIDES entity stands on terrain
+# Store Constants
+INITIAL_CAPACITY : int = 64
+
+class EntityStore:
+    """
+    Struct-of-arrays storage for moving things: positions, velocities and flags live in contiguous NumPy arrays,
+    so gravity, integration and culling run as one batched operation for every entity at once.
+    Slots are handed out by add() and recycled after remove().
+    """
+    # Attributes
+    pos : np.ndarray # (capacity, 2) top left, px
+    vel : np.ndarray # (capacity, 2) px/s
+    size : np.ndarray # (capacity, 2) width, height, px
+    flags : np.ndarray # (capacity,) uint8
+    _free : list[int]
+    _size : int # slots ever handed out
+
+    # Magic Methods
+    def __init__(self, capacity : int = INITIAL_CAPACITY):
+        self.pos = np.zeros((capacity, 2), dtype=np.float64)
+        self.vel = np.zeros((capacity, 2), dtype=np.float64)
+        self.size = np.zeros((capacity, 2), dtype=np.float64)
+        self.flags = np.zeros(capacity, dtype=np.uint8)
+        self._free = []
+        self._size = 0
+
+    def __len__(self) -> int: return self._size - len(self._free)
+
+    # Methods
+    def add(self, pos : tuple[float, float], vel : tuple[float, float] = (0, 0), flags : int = ACTIVE,
+            size : tuple[float, float] = (0, 0)) -> int:
+        """
+        Claims a slot for an entity
+        :return int: the entity's index
+        """
+        if self._free: index : int = self._free.pop()
+        else:
+            if self._size == len(self.flags): self._grow()
+            index = self._size
+            self._size += 1
+        self.pos[index] = pos
+        self.vel[index] = vel
+        self.size[index] = size
+        self.flags[index] = flags | ACTIVE
+        return index
+
+    def remove(self, index : int):
+        if not self.flags[index] & ACTIVE: return
+        self.flags[index] = 0
+        self._free.append(index)
+
+    def set_flag(self, index : int, flag : int, on : bool = True):
+        if on: self.flags[index] |= flag
+        else: self.flags[index] &= ~flag & 0xFF
+
+    def has_flag(self, index : int, flag : int) -> bool: return bool(self.flags[index] & flag)
+
+    def step(self, dt : float, cull_bottom : float = None, terrain : TerrainCollider = None, bounds : pygame.Rect = None) -> np.ndarray:
+        """
+        Applies gravity with terminal velocity clamping, integrates positions and culls what fell past cull_bottom,
+        for every active entity in one go. COLLIDES entities are moved through terrain instead, when given.
+        :param dt: float
+        :param cull_bottom: float, y at or past which CULL entities are removed, None to never cull
+        :param terrain: TerrainCollider
+        :param bounds: pygame.Rect, world edges for COLLIDES entities
+        :return np.ndarray: indices of the culled entities
+        """
+        flags : np.ndarray = self.flags[:self._size]
+        falling : np.ndarray = (flags & (ACTIVE | GRAVITY)) == (ACTIVE | GRAVITY)
+        vel_y : np.ndarray = self.vel[:self._size, 1]
+        vel_y[falling] = np.minimum(vel_y[falling] + GRAVITY_ACC * dt, TERMINAL_VELOCITY)
+
+        moving : np.ndarray = (flags & (ACTIVE | MOVES)) == (ACTIVE | MOVES)
+        if terrain is not None:
+            colliding : np.ndarray = np.flatnonzero(moving & ((flags & COLLIDES) != 0))
+            moving &= (flags & COLLIDES) == 0
+            if len(colliding):
+                pos, vel, on_ground, _ = terrain.resolve(self.pos[colliding], self.size[colliding], self.vel[colliding], dt, bounds)
+                self.pos[colliding] = pos
+                self.vel[colliding] = vel
+                flags[colliding] = np.where(on_ground, flags[colliding] | GROUNDED, flags[colliding] & (~GROUNDED & 0xFF))
+        self.pos[:self._size][moving] = round_like_rect(self.pos[:self._size][moving] + self.vel[:self._size][moving] * dt)
+
+        if cull_bottom is None: return np.empty(0, dtype=np.intp)
+        culled : np.ndarray = np.flatnonzero(((flags & (ACTIVE | CULL)) == (ACTIVE | CULL)) & (self.pos[:self._size, 1] >= cull_bottom))
+        for index in culled.tolist(): self.remove(index)
+        return culled
+
+    def step_one(self, index : int, dt : float):
+        """
+        The update step() applies, for a single entity
+        :param index: int
+        :param dt: float
+        """
+        flags : int = int(self.flags[index])
+        if flags & GRAVITY: self.vel[index, 1] = min(self.vel[index, 1] + GRAVITY_ACC * dt, TERMINAL_VELOCITY)
+        if flags & MOVES: self.pos[index] = round_like_rect(self.pos[index] + self.vel[index] * dt)
+
+    def save_state(self) -> tuple:
+        """
+        A copy of every row and the free list, for load_state()
+        :return tuple
+        """
+        return self.pos.copy(), self.vel.copy(), self.size.copy(), self.flags.copy(), list(self._free), self._size
+
+    def load_state(self, state : tuple):
+        """
+        Puts the store back the way save_state() found it, indices handed out since then are invalid
+        :param state: tuple
+        """
+        pos, vel, size, flags, free, count = state
+        self.pos, self.vel, self.size, self.flags = pos.copy(), vel.copy(), size.copy(), flags.copy()
+        self._free = list(free)
+        self._size = count
+
+    def _grow(self):
+        capacity : int = len(self.flags) * 2
+        self.pos = np.resize(self.pos, (capacity, 2))
+        self.vel = np.resize(self.vel, (capacity, 2))
+        self.size = np.resize(self.size, (capacity, 2))
+        self.flags = np.concatenate([self.flags, np.zeros(capacity - len(self.flags), dtype=np.uint8)])
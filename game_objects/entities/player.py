@@ -1,11 +1,15 @@
 import pygame
+from collections import OrderedDict
+from collections.abc import Callable
 from enum import Enum
-from utility.spritesheet import SpriteSheet
-from utility.image_loader import ImageLoader
-from utility.game_constants import TERMINAL_VELOCITY, SCREEN_WIDTH, SCREEN_HEIGHT
+from utility.image_loader import ImageLoader, derive_surface, mask_for, mask_bounds
+from utility.collision import TerrainCollider, sweep_hits, stands_on, mask_overlap
+from utility.render_layers import RenderLayers, PLATFORM_LAYER, ENTITY_LAYER
+from utility.game_constants import GRAVITY_ACC, TERMINAL_VELOCITY, SCREEN_WIDTH, SCREEN_HEIGHT, GROUND_TOLERANCE, PIXEL_COLLISION
 from game_objects.blocks.block import Block
 from game_objects.entities.entity import Entity
-from game_objects.blocks.platform import Platform
+from game_objects.entities.entity_store import EntityStore, ACTIVE, GROUNDED
+from game_objects.blocks.platform import Platform, PlatformPool
 
 # Size Constants
 BLUE_WIDTH : int = 48 # px
@@ -18,6 +22,9 @@ AIRBORNE_MOVEMENT_FACTOR : float = 0.1
 # Jump Constants
 JUMP_STRENGTH : float = 625 # px/s
 COYOTE_TIME : float = 0.1 # s
+# Platform Constants
+MAX_PLATFORMS : int = 1 # standing at once
+PLATFORM_POOL_SPARE : int = 4 # pooled beyond the standing ones: one add_platform makes before retiring the oldest, the rest falling
 # Animation Constants
 BLACK : tuple[int, int, int] = (0, 0, 0)
 FRAME_SIZE : int = 24
@@ -26,70 +33,110 @@ HOP_KEY : str = "hop"
 IDLE_KEY : str = "idle"
 FALL_KEY : str = "fall"
 JUMP_KEY : str = "jump"
+HOP_ANIMATION : str = "frog_hop" # in assets/animations.json
+IDLE_ANIMATION : str = "frog_idle"
 FALL_FRAME_INDEX : int = 5
 JUMP_FRAME_INDEX : int = 3
+# Asset Constants
+PLAYER_ASSETS : list[tuple[str, str]] = [
+    ("entities", "blue_person.png"), ("entities", "frog_hop.png"), ("entities", "frog_idle.png"),
+    ("blocks", "platform.png")
+]
+# Input Constants
+INPUT_KEYS : list[int] = [pygame.K_SPACE, pygame.K_w, pygame.K_UP, pygame.K_a, pygame.K_LEFT, pygame.K_d, pygame.K_RIGHT] # bit order of input_bits
+# Frame Table Indices
+RIGHT_IMAGE : int = 0
+RIGHT_MASK : int = 1
+LEFT_IMAGE : int = 2
+LEFT_MASK : int = 3
+
+# Helpers
+def mirror_frame(image : pygame.Surface) -> tuple[pygame.Surface, pygame.Mask, pygame.Surface, pygame.Mask]:
+    """
+    Builds a frame table entry: the right-facing image and mask, then the mirrored left-facing ones
+    :param image: pygame.Surface
+    :return tuple[pygame.Surface, pygame.Mask, pygame.Surface, pygame.Mask]
+    """
+    flipped : pygame.Surface = derive_surface(image, flip=(True, False), colorkey=BLACK)
+    return image, mask_for(image), flipped, mask_for(flipped)
 
 class PlayerStates(Enum):
     MOVED_LEFT = 0
     MOVED_RIGHT = 1
 
 class Player(Entity):
+    """
+    Steps itself one scalar tick at a time, so it keeps its velocity in plain floats instead of the store's row:
+    a float attribute costs ~0.1us against ~1us for an item of the row, and move() reads it dozens of times a tick.
+    The row only follows the Player through place(), nothing batches it.
+    """
     # Movement Fields
+    _vel_x : float = 0.0 # shadows Entity's view into the store
+    _vel_y : float = 0.0
     _on_ground : bool
     _coyote_time_counter : float
     _input_map : dict[pygame.key, bool]
+    _bounds : pygame.Rect
+    _pixel_collision : bool
     # Platform Fields
-    _platforms : list[Platform]
+    _platforms : OrderedDict[Platform, None] # standing, oldest first
     _max_platforms : int
-    _falling_platforms : list[Platform]
-    _platform_group : pygame.sprite.Group = pygame.sprite.Group()
+    _falling_platforms : dict[int, Platform] # by row in the pool's store
+    _platform_pool : PlatformPool
+    _collider : Callable[[pygame.Rect], TerrainCollider] | None # terrain falling platforms land on, see set_collider
+    _platform_group : pygame.sprite.Group
+    _layers : RenderLayers | None
     # Animation Fields
     _frame : int
     _mask : pygame.Mask
     image : pygame.Surface
     _animation_cd : float
-    _animation_frames : dict[str, pygame.Surface | list[pygame.Surface]]
+    _animation_frames : dict[str, list[tuple[pygame.Surface, pygame.Mask, pygame.Surface, pygame.Mask]]]
     _last_direction : PlayerStates
     # Constants
     _NORMAL_PLATFORM_IMAGE : pygame.Surface
 
     # Public -----------------------------------------------------------------------------------------------------------
 
-    def __init__(self, pos: tuple[int, int], assets : ImageLoader):
-        super().__init__(pos=pos, width=BLUE_WIDTH, height=BLUE_HEIGHT, image=assets.get_image("entities", "blue_person.png"))
+    def __init__(self, pos: tuple[int, int], assets : ImageLoader, store : EntityStore = None):
+        """
+        :param pos: tuple[int, int]
+        :param assets: ImageLoader
+        :param store: EntityStore, shared by the Player and its platforms, a new one if None
+        """
+        super().__init__(pos=pos, width=BLUE_WIDTH, height=BLUE_HEIGHT, image=assets.get_image("entities", "blue_person.png"),
+                         store=store, flags=ACTIVE)
         # Initializing movement fields
         self._on_ground = False
         self._coyote_time_counter = COYOTE_TIME
-        self._input_map = {
-            pygame.K_SPACE: False, pygame.K_w: False, pygame.K_UP: False,
-            pygame.K_a: False, pygame.K_LEFT: False,
-            pygame.K_d: False, pygame.K_RIGHT: False
-        }
+        self._input_map = {key: False for key in INPUT_KEYS}
+        self._bounds = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+        self._pixel_collision = PIXEL_COLLISION
         # Initializing platform fields
-        self._platforms = []
-        self._max_platforms = 1
-        self._falling_platforms = []
+        self._platforms = OrderedDict()
+        self._falling_platforms = {}
+        self._collider = None
         self._platform_group = pygame.sprite.Group()
+        self._layers = None
         self._NORMAL_PLATFORM_IMAGE = assets.get_image("blocks", "platform.png")
+        self._platform_pool = PlatformPool(image=self._NORMAL_PLATFORM_IMAGE, store=self._store)
+        self.set_max_platforms(MAX_PLATFORMS)
 
         # Initializing animation fields
-        HOP_SPRITE_SHEET : SpriteSheet = SpriteSheet(image=assets.get_image("entities", "frog_hop.png"))
-        IDLE_SPRITE_SHEET : SpriteSheet = SpriteSheet(image=assets.get_image("entities", "frog_idle.png"))
-        self._animation_frames: dict[str, pygame.Surface | list[pygame.Surface]] = {
-            HOP_KEY: [HOP_SPRITE_SHEET.get_frame(i, 21, 24, (BLUE_WIDTH, BLUE_HEIGHT), BLACK, 48, 11, 9) for i in range(7)],
-            IDLE_KEY: [IDLE_SPRITE_SHEET.get_frame(i, 21, 24, (BLUE_WIDTH, BLUE_HEIGHT), BLACK, 48, 11, 9) for i in range(8)],
-            FALL_KEY: HOP_SPRITE_SHEET.get_frame(FALL_FRAME_INDEX, 21, 24, (BLUE_WIDTH, BLUE_HEIGHT), BLACK, 48, 11, 9),
-            JUMP_KEY: HOP_SPRITE_SHEET.get_frame(JUMP_FRAME_INDEX, 21, 24, (BLUE_WIDTH, BLUE_HEIGHT), BLACK, 48, 11, 9)
+        hop_frames : list[pygame.Surface] = assets.get_animation(HOP_ANIMATION)
+        idle_frames : list[pygame.Surface] = assets.get_animation(IDLE_ANIMATION)
+        # Every frame is mirrored and masked once here so _animate only has to pick an entry
+        self._animation_frames = {
+            HOP_KEY: [mirror_frame(frame) for frame in hop_frames],
+            IDLE_KEY: [mirror_frame(frame) for frame in idle_frames],
+            FALL_KEY: [mirror_frame(hop_frames[FALL_FRAME_INDEX])],
+            JUMP_KEY: [mirror_frame(hop_frames[JUMP_FRAME_INDEX])]
         }
         self._frame = 0
-        self.image = self._animation_frames[IDLE_KEY][self._frame]
         self._animation_cd = ANIMATION_COOLDOWN
         self._last_direction = PlayerStates.MOVED_RIGHT
-        self._mask = pygame.mask.from_surface(self.image)
-
-    def draw(self, surface : pygame.Surface):
-        self._platform_group.draw(surface)
-        surface.blit(self.image, self.rect.topleft)
+        self.image = self._animation_frames[IDLE_KEY][self._frame][RIGHT_IMAGE]
+        self._mask = self._animation_frames[IDLE_KEY][self._frame][RIGHT_MASK]
 
     def move(self, dt : float, blocks : list[Block]):
         """
@@ -113,6 +160,7 @@ class Player(Entity):
 
         self._handle_collisions(dt, blocks)
         self._animate(dt)
+        if self._pixel_collision: self._settle(blocks) # the new frame's mask may overlap what the old one was resolved against
 
     def handle_input(self, event : pygame.event):
         """
@@ -128,20 +176,121 @@ class Player(Entity):
 
     def add_platform(self, pos: tuple[int, int]):
         """
-        Creates a platform
+        Places a platform from the pool, replacing the oldest standing one when at the limit
         :param pos: tuple[int, int]
         """
         if self._max_platforms <= 0: return
-        new_platform : Platform = Platform(pos=pos, image=self._NORMAL_PLATFORM_IMAGE)
-        if self.rect.colliderect(new_platform.rect): return
-        # if pygame.sprite.collide_mask(self, new_platform): return
+        new_platform : Platform = self._platform_pool.spawn(pos)
+        if self.rect.colliderect(new_platform.rect) and (not self._pixel_collision or pygame.sprite.collide_mask(self, new_platform)):
+            self._platform_pool.recycle(new_platform)
+            return
         if len(self._platforms) >= self._max_platforms:
-            self._platform_group.remove(self._platforms[0])
-            self._platforms = self._platforms[1:]
-        self._platforms.append(new_platform)
-        self._platform_group.add(new_platform)
+            oldest, _ = self._platforms.popitem(last=False)
+            oldest.kill()
+            self._platform_pool.recycle(oldest)
+        self._platforms[new_platform] = None
+        self._show_platform(new_platform)
+
+    def set_max_platforms(self, new_max : int):
+        self._max_platforms = new_max
+        self._platform_pool.reserve(new_max + PLATFORM_POOL_SPARE) # made up front, so placing platforms allocates nothing
+
+    def set_bounds(self, bounds : pygame.Rect): self._bounds = bounds
+
+    def set_collider(self, collider : Callable[[pygame.Rect], TerrainCollider] | None):
+        """
+        Lets falling platforms land on terrain instead of falling through it
+        :param collider: Callable[[pygame.Rect], TerrainCollider], the terrain inside a rect, such as Level.collider
+        """
+        self._collider = collider
+
+    def set_layers(self, layers : RenderLayers):
+        """
+        Puts the Player on the entity layer and its platforms on the platform layer of layers, which they then follow
+        :param layers: RenderLayers
+        """
+        if self._layers is not None:
+            self._layers.remove(self, *self._platform_group)
+        self._layers = layers
+        layers.add(self, layer=ENTITY_LAYER)
+        layers.add(*self._platform_group, layer=PLATFORM_LAYER)
+
+    def set_pixel_collision(self, enabled : bool): self._pixel_collision = enabled
+
+    @property
+    def mask(self) -> pygame.Mask: return self._mask
+
+    @property
+    def input_bits(self) -> int:
+        """
+        The held keys packed one bit each, in INPUT_KEYS order
+        """
+        return sum(1 << bit for bit, key in enumerate(INPUT_KEYS) if self._input_map[key])
+
+    def save_state(self) -> dict[str, object]:
+        """
+        Everything move() reads or writes, platforms included, for load_state()
+        :return dict[str, object]
+        """
+        return {
+            "rect": tuple(self.rect), "vel": (self._vel_x, self._vel_y), "on_ground": self._on_ground,
+            "coyote_time": self._coyote_time_counter, "input_map": dict(self._input_map), "bounds": tuple(self._bounds),
+            "platforms": list(self._platforms), "falling_platforms": list(self._falling_platforms.values()),
+            "platform_group": self._platform_group.sprites(), "max_platforms": self._max_platforms,
+            "platform_states": [platform.save_state() for platform in self._platform_group],
+            "platform_pool": self._platform_pool.save_state(), # the store, shared with the pool, included
+            "frame": self._frame, "animation_cd": self._animation_cd, "last_direction": self._last_direction,
+            "image": self.image, "mask": self._mask
+        }
+
+    def load_state(self, state : dict[str, object]):
+        """
+        Restores a save_state()
+        :param state: dict[str, object]
+        """
+        self._load_body(state)
+        self._platform_pool.load_state(state["platform_pool"])
+        for platform in self._platform_group: platform.kill()
+        for platform, platform_state in zip(state["platform_group"], state["platform_states"]):
+            platform.load_state(platform_state)
+            self._show_platform(platform)
+        self._platforms = OrderedDict.fromkeys(state["platforms"])
+        self._falling_platforms = {platform.index: platform for platform in state["falling_platforms"]}
+
+    def respawn(self, state : dict[str, object]):
+        """
+        Restores a save_state() taken with no platforms out, like the one at spawn. The platforms out now go back to
+        the pool, which keeps its own state: restoring it would lose every platform made or recycled since.
+        :param state: dict[str, object]
+        """
+        self.clear_platforms()
+        self._load_body(state)
+
+    def clear_platforms(self):
+        """
+        Hands every platform out, standing or falling, back to the pool
+        """
+        for platform in self._platform_group.sprites():
+            platform.kill()
+            self._platform_pool.recycle(platform)
+        self._platforms.clear()
+        self._falling_platforms.clear()
 
-    def set_max_platforms(self, new_max : int): self._max_platforms = new_max
+    def swept_rect(self, dt : float) -> pygame.Rect:
+        """
+        Rect covering everywhere the Player can reach during the next move(dt), padded by a pixel for ground checks
+        :param dt: float
+        :return pygame.Rect
+        """
+        # Bound the velocities move() can produce before collisions are resolved
+        reach_x : float = max(abs(self._vel_x), MOVEMENT_SPEED) * dt
+        reach_up : float = max(-self._vel_y, JUMP_STRENGTH) * dt
+        reach_down : float = min(max(self._vel_y, 0) + GRAVITY_ACC * dt, TERMINAL_VELOCITY) * dt
+        left : int = int(self.rect.left - reach_x) - 1
+        top : int = int(self.rect.top - reach_up) - 1
+        right : int = int(self.rect.right + reach_x) + 2
+        bottom : int = int(self.rect.bottom + reach_down) + 2
+        return pygame.Rect(left, top, right - left, bottom - top)
 
     # Private ----------------------------------------------------------------------------------------------------------
 
@@ -156,7 +305,7 @@ class Player(Entity):
             case 1:
                 self.add_platform(mouse.pos)
             case _: # TP for debug
-                self.rect.centerx, self.rect.y = pygame.mouse.get_pos()
+                self.rect.centerx, self.rect.y = mouse.pos
 
     def _horizontal_movement(self, left : bool, right : bool, dt : float):
         direction: int = 0
@@ -203,53 +352,128 @@ class Player(Entity):
         self._coyote_time_counter = COYOTE_TIME
 
     def _handle_collisions(self, dt : float, blocks : list[Block]):
-        # Future movement
+        # A single rect against a handful of Blocks is cheaper in plain Python, batches go through TerrainCollider
+        # Future movement, swept per axis so a long move stops at the first Block it crosses instead of skipping it
         dx : float = self._vel_x * dt
         dy : float = self._vel_y * dt
+        # What is swept, relative to rect: the whole rect, or in pixel mode only the part of the frame that has pixels
+        bounds : pygame.Rect = mask_bounds(self.image) if self._pixel_collision else pygame.Rect((0, 0), self.rect.size)
 
+        start : pygame.Rect = self.rect.copy()
         self.rect.x += dx
-        for block in blocks:
-            if self.rect.colliderect(block.rect) and not self._can_passthrough(block):
-            # if pygame.sprite.collide_mask(self, block) and not self._can_passthrough(block):
+        body : pygame.Rect = bounds.move(self.rect.topleft)
+        swept : pygame.Rect = bounds.move(start.topleft)
+        hits : list[Block] = [block for block in blocks if body.top < block.rect.bottom and body.bottom > block.rect.top
+                              and sweep_hits(swept.left, swept.right, body.left, body.right, block.rect.left, block.rect.right)
+                              and not self._can_passthrough(block)]
+        if hits:
+            # In pixel mode rects only stop the Blocks jumped clean over, the ones still overlapped are left to the masks
+            crossed : list[Block] = [block for block in hits if not body.colliderect(block.rect)] if self._pixel_collision else hits
+            if crossed:
                 self._vel_x = 0
-                if dx > 0: self.rect.right = block.rect.left
-                elif dx < 0: self.rect.left = block.rect.right
-        if self.rect.right > SCREEN_WIDTH:
+                if dx > 0: self.rect.x = min(block.rect.left for block in crossed) - bounds.right
+                elif dx < 0: self.rect.x = max(block.rect.right for block in crossed) - bounds.left
+            if self._pixel_collision and self._push_out(hits, 0, dx, start): self._vel_x = 0
+        if self.rect.right > self._bounds.right:
             self._vel_x = 0
-            self.rect.right = SCREEN_WIDTH
-        if self.rect.left < 0:
+            self.rect.right = self._bounds.right
+        if self.rect.left < self._bounds.left:
             self._vel_x = 0
-            self.rect.left = 0
+            self.rect.left = self._bounds.left
 
+        start = self.rect.copy()
         self.rect.y += dy
-        self._on_ground = False
-        for block in blocks: # Terrain collisions
-            if self.rect.bottom == block.rect.top: self._on_ground = True
-            if self.rect.colliderect(block.rect) and not self._can_passthrough(block):
-            # if pygame.sprite.collide_mask(self, block) and not self._can_passthrough(block):
+        body = bounds.move(self.rect.topleft)
+        swept = bounds.move(start.topleft)
+        hits = [block for block in blocks if body.left < block.rect.right and body.right > block.rect.left
+                and sweep_hits(swept.top, swept.bottom, body.top, body.bottom, block.rect.top, block.rect.bottom)
+                and not self._can_passthrough(block)]
+        if hits: # Terrain collisions
+            crossed = [block for block in hits if not body.colliderect(block.rect)] if self._pixel_collision else hits
+            landed : bool = False
+            if crossed:
+                self._vel_y = 0
+                landed = dy > 0
+                if dy > 0: self.rect.y = min(block.rect.top for block in crossed) - bounds.bottom
+                elif dy < 0: self.rect.y = max(block.rect.bottom for block in crossed) - bounds.top
+            if self._pixel_collision and self._push_out(hits, 1, dy, start):
                 self._vel_y = 0
-                if dy > 0:
-                    self.rect.bottom = block.rect.top
-                    self._reset_jump()
-                elif dy < 0:
-                    self.rect.top = block.rect.bottom
-        for platform in self._platforms + self._falling_platforms: # Platform collisions
-            if self.rect.bottom == platform.rect.top:
-                self._on_ground = True
-                platform.collide()
-            if self.rect.colliderect(platform.rect) and not self._can_passthrough(platform):
-            # if pygame.sprite.collide_mask(self, platform) and not self._can_passthrough(platform):
-                self._reset_jump()
-                if dy > 0: self.rect.bottom = platform.rect.top + 1
-                if platform in self._platforms:
-                    platform.collide()
-                    self._platforms.remove(platform)
-                    self._falling_platforms.append(platform)
-        if self.rect.bottom > SCREEN_HEIGHT: # Bottom of screen collision
+                landed = landed or dy > 0
+            if landed: self._reset_jump()
+        self._on_ground = any(self._stands_on(block) for block in blocks)
+        # Platform collisions, platforms landed on start falling once the pass is over
+        dropped : list[Platform] = [platform for platform in self._platforms if self._collide_platform(platform, start, bounds)]
+        for platform in self._falling_platforms.values(): self._collide_platform(platform, start, bounds)
+        for platform in dropped:
+            platform.collide()
+            platform.drop()
+            del self._platforms[platform]
+            self._falling_platforms[platform.index] = platform
+        if self.rect.bottom > self._bounds.bottom: # Bottom of world collision
             self._vel_y = 0
-            self.rect.bottom = SCREEN_HEIGHT
+            self.rect.bottom = self._bounds.bottom
             self._reset_jump()
 
+    def _collide_platform(self, platform : Platform, start : pygame.Rect, bounds : pygame.Rect) -> bool:
+        if self._stands_on(platform):
+            self._on_ground = True
+            platform.collide()
+        body : pygame.Rect = bounds.move(self.rect.topleft)
+        swept : pygame.Rect = bounds.move(start.topleft)
+        if (body.left < platform.rect.right and body.right > platform.rect.left and not self._can_passthrough(platform)
+                and sweep_hits(swept.top, swept.bottom, body.top, body.bottom, platform.rect.top, platform.rect.bottom)
+                and (not self._pixel_collision or not body.colliderect(platform.rect) or pygame.sprite.collide_mask(self, platform))):
+            self._reset_jump()
+            if self.rect.y > start.y:
+                if not self._pixel_collision or not self._push_out([platform], 1, self.rect.y - start.y, start):
+                    self.rect.y = platform.rect.top - bounds.bottom
+                self.rect.y += 1 # sink a pixel in so the Player stays on the platform while it starts to fall
+            return True
+        return False
+
+    def _stands_on(self, block : Block) -> bool:
+        if not self._pixel_collision: return stands_on(self.rect, block.rect)
+        # Masks touch once the Player is lowered by the tolerance
+        if not self.rect.move(0, GROUND_TOLERANCE).colliderect(block.rect): return False
+        return self._mask.overlap(block.mask, (block.rect.x - self.rect.x, block.rect.y - self.rect.y - GROUND_TOLERANCE)) is not None
+
+    def _push_out(self, blocks : list[Block], axis : int, step : float, start : pygame.Rect) -> bool:
+        """
+        Backs the Player out of the Blocks its mask came to overlap by moving along axis, against the direction it moved
+        :param blocks: list[Block], already known to overlap the Player's rect or to have been swept over
+        :param axis: int, 0 for x, 1 for y
+        :param step: float, movement along axis this move
+        :param start: pygame.Rect, where the move along axis began, Blocks the mask already overlapped there are skipped
+        :return bool: whether any mask overlapped
+        """
+        blocks = [block for block in blocks if self._mask.overlap(block.mask, (block.rect.x - start.x, block.rect.y - start.y)) is None]
+        direction : int = (step > 0) - (step < 0)
+        touched : bool = False
+        for _ in range(self.rect.size[axis]): # every push is at least a px, so this always ends
+            overlaps : list[pygame.Rect] = [overlap for block in blocks
+                                            if (overlap := mask_overlap(self._mask, self.rect.topleft, block.mask, block.rect.topleft)) is not None]
+            if not overlaps: break
+            touched = True
+            if direction == 0: break
+            depth : int = max(overlap.size[axis] for overlap in overlaps)
+            if axis == 0: self.rect.x -= direction * depth
+            else: self.rect.y -= direction * depth
+        return touched
+
+    def _settle(self, blocks : list[Block]):
+        """
+        Pushes the Player's mask out of solid Blocks it overlaps, along whichever axis the overlap is thinner on
+        :param blocks: list[Block]
+        """
+        for block in blocks:
+            if any(block.passthrough.values()) or not self.rect.colliderect(block.rect): continue
+            overlap : pygame.Rect | None = mask_overlap(self._mask, self.rect.topleft, block.mask, block.rect.topleft)
+            if overlap is None: continue
+            if overlap.width <= overlap.height:
+                self.rect.x += -overlap.width if overlap.centerx >= self.rect.width // 2 else overlap.width
+            else:
+                self.rect.y += -overlap.height if overlap.centery >= self.rect.height // 2 else overlap.height
+
     def _can_passthrough(self, block : Block) -> bool:
         passthrough: dict[str, bool] = block.passthrough
         if self._vel_x > 0 and passthrough["left"]: return True
@@ -258,14 +482,46 @@ class Player(Entity):
         if self._vel_y < 0 and passthrough["bot"]: return True
         return False
 
+    def _load_body(self, state : dict[str, object]):
+        # Everything load_state() restores but the platforms
+        self.rect = pygame.Rect(state["rect"])
+        self._vel_x, self._vel_y = state["vel"]
+        self._on_ground = state["on_ground"]
+        self._coyote_time_counter = state["coyote_time"]
+        self._input_map = dict(state["input_map"])
+        self._bounds = pygame.Rect(state["bounds"])
+        self._max_platforms = state["max_platforms"]
+        self._frame = state["frame"]
+        self._animation_cd = state["animation_cd"]
+        self._last_direction = state["last_direction"]
+        self.image = state["image"]
+        self._mask = state["mask"]
+
+    def _show_platform(self, platform : Platform):
+        self._platform_group.add(platform)
+        if self._layers is not None: self._layers.add(platform, layer=PLATFORM_LAYER)
+
     def _platform_movement(self, dt : float):
-        for platform in self._falling_platforms:
-            platform.move(dt)
-            if platform.rect.top >= SCREEN_HEIGHT: # delete off-screen falling platforms
-                self._platform_group.remove(platform)
-                self._falling_platforms.remove(platform)
+        if not self._falling_platforms: return
+        # Every falling platform is moved through the terrain below it in one batch, the ones that left the world are
+        # culled by the store and the ones that landed break, both go back to the pool
+        store : EntityStore = self._platform_pool.store
+        terrain : TerrainCollider | None = None
+        if self._collider is not None:
+            rects : list[pygame.Rect] = [platform.rect for platform in self._falling_platforms.values()]
+            reach : pygame.Rect = rects[0].unionall(rects[1:])
+            reach.height += int(TERMINAL_VELOCITY * dt) + 1
+            terrain = self._collider(reach)
+        culled : list[int] = store.step(dt, cull_bottom=self._bounds.bottom, terrain=terrain).tolist()
+        for platform in self._falling_platforms.values(): platform.sync()
+        landed : list[int] = [index for index in self._falling_platforms if index not in culled and store.has_flag(index, GROUNDED)]
+        for index in culled + landed:
+            platform : Platform = self._falling_platforms.pop(index)
+            platform.kill()
+            self._platform_pool.recycle(platform, culled=index not in landed)
 
     def _animate(self, dt : float):
+        key : str = IDLE_KEY
         if self._on_ground:
             self._animation_cd -= dt
             if self._animation_cd <= 0:
@@ -273,27 +529,22 @@ class Player(Entity):
                 self._frame += 1
             if self._frame >= len(self._animation_frames[HOP_KEY]) * len(self._animation_frames[IDLE_KEY]):
                 self._frame = 0
-
-            if self._vel_x > 0: # going right
-                self.image = self._animation_frames[HOP_KEY][self._frame % len(self._animation_frames[HOP_KEY])]
-            elif self._vel_x < 0: # going left
-                self.image = self._animation_frames[HOP_KEY][self._frame % len(self._animation_frames[HOP_KEY])]
-            else: # idle
-                self.image = self._animation_frames[IDLE_KEY][self._frame % len(self._animation_frames[IDLE_KEY])]
+            if self._vel_x != 0: key = HOP_KEY # going left or right
         elif self._vel_y > 0: # falling
-            self.image = self._animation_frames[FALL_KEY]
+            key = FALL_KEY
         elif self._vel_y < 0: # jumping
-            self.image = self._animation_frames[JUMP_KEY]
-        else:
-            self.image = self._animation_frames[IDLE_KEY][self._frame % len(self._animation_frames[IDLE_KEY])]
+            key = JUMP_KEY
 
-        # If moving left, mirror the image
+        frames : list[tuple[pygame.Surface, pygame.Mask, pygame.Surface, pygame.Mask]] = self._animation_frames[key]
+        frame : tuple[pygame.Surface, pygame.Mask, pygame.Surface, pygame.Mask] = frames[self._frame % len(frames)]
+        # If moving left, use the mirrored image
         if self._last_direction == PlayerStates.MOVED_LEFT:
-            self.image = pygame.transform.flip(self.image, True, False)
-            self.image.set_colorkey((0, 0, 0))
-
-        # Update rect
-        pos : tuple[int, int] = self.rect.center
-        self.rect = self.image.get_rect(center=pos)
-        self.rect.width = BLUE_WIDTH
-        self._mask = pygame.mask.from_surface(self.image)
\ No newline at end of file
+            self.image, self._mask = frame[LEFT_IMAGE], frame[LEFT_MASK]
+        else:
+            self.image, self._mask = frame[RIGHT_IMAGE], frame[RIGHT_MASK]
+
+        # Update rect, only needed if the frame size changed
+        if self.image.get_height() != self.rect.height:
+            pos : tuple[int, int] = self.rect.center
+            self.rect = self.image.get_rect(center=pos)
+            self.rect.width = BLUE_WIDTH
@@ -0,0 +1,40 @@
+import pygame
+from utility.game_constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+class Camera:
+    """
+    The part of the world shown on screen, kept centred on a target and inside the world's bounds.
+    """
+    # Attributes
+    _view : pygame.Rect
+    _world : pygame.Rect
+
+    # Magic Methods
+    def __init__(self, size : tuple[int, int] = (SCREEN_WIDTH, SCREEN_HEIGHT), world : pygame.Rect = None):
+        self._view = pygame.Rect((0, 0), size)
+        self._world = world if world is not None else self._view.copy()
+
+    # Accessors/Setters
+    @property
+    def view(self) -> pygame.Rect: return self._view
+
+    @property
+    def offset(self) -> tuple[int, int]: return self._view.topleft
+
+    @property
+    def world(self) -> pygame.Rect: return self._world
+
+    def set_world(self, world : pygame.Rect):
+        self._world = world
+        self._view.clamp_ip(self._world)
+
+    # Methods
+    def follow(self, target : pygame.Rect):
+        self._view.center = target.center
+        self._view.clamp_ip(self._world)
+
+    def to_world(self, pos : tuple[int, int]) -> tuple[int, int]:
+        return pos[0] + self._view.x, pos[1] + self._view.y
+
+    def to_screen(self, rect : pygame.Rect) -> pygame.Rect:
+        return rect.move(-self._view.x, -self._view.y)
@@ -1,16 +1,52 @@
+import os
 import pygame
 from enum import Enum
 from utility.image_loader import ImageLoader
-from utility.game_constants import FPS, NAME, SCREEN_WIDTH, SCREEN_HEIGHT
+from utility.profiler import FrameProfiler, OVERLAY_POS
+from utility.render_layers import RenderLayers, UI_LAYER, PLATFORM_LAYER, ENTITY_LAYER, DYNAMIC_LAYERS, WORLD_LAYERS
+from utility.timestep import FixedTimestep
+from utility.level_format import COMPILED_LEVEL_EXTENSION
+from utility.game_constants import FPS, NAME, SCREEN_WIDTH, SCREEN_HEIGHT, DIRTY_RENDERING, PROFILING, PROFILER_OVERLAY, \
+    RENDER_SCALE, UPSCALE_FILTER, INTERPOLATION, MAX_TICK_MOVE
 from game_objects.other.level import Level
 from game_objects.entities.player import Player
+from game_objects.other.simulation import Simulation
+from game_objects.other.level_manager import LevelManager
+from game_objects.other.camera import Camera
 
 # Constants
 LEVEL_DATA_BASE_PATH : str = "./assets/levels/"
+LEVEL_EXTENSION : str = ".json"
+LEVEL_ORDER : list[str] = ["test"]
+RESTART_KEY : int = pygame.K_r
+INTERPOLATED_LAYERS : tuple[int, ...] = (PLATFORM_LAYER, ENTITY_LAYER)
+# Profiler Phases
+FRAME_PHASE : str = "frame"
+EVENTS_PHASE : str = "events"
+STEP_PHASE : str = "simulation.step"
+DISPLAY_PHASE : str = "display.update"
+UPSCALE_PHASE : str = "display.upscale"
+INSTRUMENTED_PHASES : list[tuple[str, str, str]] = [ # (Game attribute, method, phase)
+    ("player", "move", "player.move"), ("player", "_horizontal_movement", "player.horizontal"),
+    ("player", "_vertical_movement", "player.vertical"), ("player", "_platform_movement", "player.platforms"),
+    ("player", "_handle_collisions", "player.collisions"), ("player", "_animate", "player.animate"),
+    ("level", "find_near_blocks", "level.find_near_blocks"), ("level", "stream", "level.stream"),
+    ("level", "draw_static", "level.draw"), ("level", "restore", "level.restore"), ("layers", "draw", "layers.draw")
+]
 
 # Helper
 def get_level_data(level : str) -> str:
-    return f"./assets/levels/{level}.json"
+    """
+    Path of a level: a .json or compiled path is used as given, a name is looked up under LEVEL_DATA_BASE_PATH,
+    compiled when a compiled copy at least as new as the JSON exists there
+    :param level: str, name or path
+    :return str
+    """
+    if os.path.splitext(level)[1] in (LEVEL_EXTENSION, COMPILED_LEVEL_EXTENSION): return level
+    source : str = os.path.join(LEVEL_DATA_BASE_PATH, level + LEVEL_EXTENSION)
+    compiled : str = os.path.join(LEVEL_DATA_BASE_PATH, level + COMPILED_LEVEL_EXTENSION)
+    if os.path.exists(compiled) and (not os.path.exists(source) or os.path.getmtime(compiled) >= os.path.getmtime(source)): return compiled
+    return source
 
 class GameState(Enum):
     PLAY = 0
@@ -19,47 +55,286 @@ class GameState(Enum):
 
 class Game:
     window : pygame.Surface
-    clock : pygame.time.Clock
+    timestep : FixedTimestep
     assets : ImageLoader
+    levels : LevelManager
+    simulation : Simulation
     level : Level
     player : Player
+    camera : Camera
+    layers : RenderLayers
+    dirty_rendering : bool
+    render_scale : int
+    upscale : str
+    interpolation : bool
+    record_path : str
+    profiler : FrameProfiler
+    profile_path : str
+    show_overlay : bool
+    _frame_phase : int
+    _events_phase : int
+    _step_phase : int
+    _display_phase : int
+    _upscale_phase : int
+    _overlay : pygame.sprite.DirtySprite
+    _dirty_rects : list[pygame.Rect] | None
+    _static_version : int
+    _framebuffer : pygame.Surface | None
+    _viewport : pygame.Rect # area of the window the framebuffer is upscaled into
+    _target : pygame.Surface # window subsurface at _viewport
+    _previous : dict[object, tuple[int, int]] # where the moving sprites and the camera were before the last tick
 
-    def __init__(self):
+    def __init__(self, dirty_rendering : bool = DIRTY_RENDERING, record_path : str = "", profile_path : str = "",
+                 render_scale : int = RENDER_SCALE, upscale : str = UPSCALE_FILTER, levels : list[str] = None,
+                 frame_rate : int = FPS, interpolation : bool = INTERPOLATION):
         # PyGame Setup
         pygame.init()
         pygame.font.init()
         pygame.mixer.init()
         pygame.display.init()
-        self.window : pygame.Surface = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.render_scale = max(1, render_scale)
+        self.upscale = upscale
+        self.window : pygame.Surface = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE if self.render_scale > 1 else 0)
         pygame.display.set_caption(NAME)
-        self.clock = pygame.time.Clock()
 
-        # Load images
-        self.assets = ImageLoader()
+        # Load images lazily, the level manager decodes what each level uses as it loads it
+        self.assets = ImageLoader(lazy=True)
+        # Input is recorded tick by tick when there is somewhere to save it, see game_objects.other.replay
+        self.record_path = record_path
+        self.levels = LevelManager([get_level_data(level) for level in levels or LEVEL_ORDER], self.assets, record=bool(record_path),
+                                   render_scale=self.render_scale)
 
-        self.level = Level(level_data=get_level_data("test"), assets=self.assets)
+        # Profiling, written out as a Chrome trace on quit when there is somewhere to save it
+        self.profile_path = profile_path
+        self.profiler = FrameProfiler(enabled=PROFILING or bool(profile_path))
+        self.show_overlay = PROFILER_OVERLAY
+        # Everything on screen is a sprite in the level's layers, the profiler overlay included
+        self._overlay = pygame.sprite.DirtySprite()
+        self._overlay.image = pygame.Surface((0, 0))
+        self._overlay.rect = pygame.Rect(OVERLAY_POS, (0, 0))
+        self._overlay.visible = 0
+        self.simulation = None
+        self._bind(self.levels.simulation)
+        self._frame_phase = self.profiler.phase(FRAME_PHASE)
+        self._events_phase = self.profiler.phase(EVENTS_PHASE)
+        self._step_phase = self.profiler.phase(STEP_PHASE)
+        self._display_phase = self.profiler.phase(DISPLAY_PHASE)
+        self._upscale_phase = self.profiler.phase(UPSCALE_PHASE)
 
-        self.player = Player(pos=self.level.start_pos, assets=self.assets)
+        # Rendering
+        self.dirty_rendering = dirty_rendering
+        self._static_version = -1
+        # Low resolution framebuffer, the world is drawn into it at 1/render_scale and upscaled into the window once per frame
+        self._framebuffer = None
+        if self.render_scale > 1:
+            self._framebuffer = pygame.Surface((SCREEN_WIDTH // self.render_scale, SCREEN_HEIGHT // self.render_scale)).convert()
+            self._fit_viewport()
+
+        # Fixed rate ticks, frames paced separately and drawn between the last two ticks
+        self.interpolation = interpolation
+        self._previous = {}
+        self.timestep = FixedTimestep(frame_rate=frame_rate)
 
     def run(self) -> GameState:
-        delta_time: float = self.clock.tick(FPS) / 1000.0
+        """
+        Reads input and runs the simulation ticks that fall due until a frame is due, then draws it.
+        Input is read INPUT_POLL_RATE times a second meanwhile, so each tick sees what was pressed right before it.
+        :return GameState
+        """
+        profiler : FrameProfiler = self.profiler
+        timestep : FixedTimestep = self.timestep
+        state : GameState = GameState.PLAY
+        while True:
+            frame_start : int = profiler.now()
+            if not self._handle_events(): return GameState.QUIT
+            profiler.record(self._events_phase, frame_start)
+
+            for _ in range(timestep.advance()):
+                start : int = profiler.now()
+                self._previous = self._positions()
+                self.simulation.step()
+                profiler.record(self._step_phase, start)
+                if self.simulation.goal_reached:
+                    self.next_level()
+                    state = GameState.WIN
+                    break
+            if state == GameState.WIN or timestep.frame_due(): break
+            timestep.wait()
+
+        # Drawing Everything
+        self._update_overlay()
+        current : dict[object, tuple[int, int]] = self._interpolate(timestep.alpha) if self.interpolation else {}
+        if self._framebuffer is not None: self._draw_upscaled()
+        elif self.dirty_rendering: self._draw_dirty()
+        else:
+            self.layers.draw(self.window, self.camera.view)
+            start = profiler.now()
+            pygame.display.update()
+            profiler.record(self._display_phase, start)
+        self._restore_positions(current)
+        timestep.frame_drawn()
+        profiler.record(self._frame_phase, frame_start)
+        return state
 
-        # Events
+    def restart(self):
+        """
+        Starts the current level over, in place
+        """
+        self.levels.restart()
+        self._dirty_rects = None
+        self._previous = {}
+        self.timestep.reset()
+
+    def next_level(self):
+        """
+        Swaps in the next level, already loaded in the background
+        """
+        self._bind(self.levels.advance())
+        self._previous = {}
+        self.timestep.reset()
+
+    def _handle_events(self) -> bool:
+        """
+        Hands this poll's events to the simulation, they take effect on its next tick
+        :return bool: False once the game is quit
+        """
         for event in pygame.event.get():
             if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
-                return GameState.QUIT
-            self.player.handle_input(event)
+                self._save_logs()
+                self.levels.close()
+                return False
+            if event.type == pygame.KEYDOWN and event.key == RESTART_KEY:
+                self.restart()
+                continue
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3: self.show_overlay = not self.show_overlay
+            if event.type == pygame.VIDEORESIZE and self._framebuffer is not None: self._fit_viewport()
+            if event.type == pygame.MOUSEBUTTONDOWN: # clicks land in the world, not on the screen
+                event = pygame.event.Event(event.type, {**event.dict, "pos": self.camera.to_world(self.to_screen(event.pos))})
+            self.simulation.handle_event(event)
+        return True
 
-        self.player.move(dt=delta_time, blocks=self.level.find_near_blocks(self.player))  # Movement
+    def _positions(self) -> dict[object, tuple[int, int]]:
+        """
+        Where the sprites that move between ticks, and the camera, are now
+        :return dict[object, tuple[int, int]]: sprite or camera -> top left, world space
+        """
+        positions : dict[object, tuple[int, int]] = {sprite: sprite.rect.topleft for layer in INTERPOLATED_LAYERS
+                                                     for sprite in self.layers.get_sprites_from_layer(layer)}
+        positions[self.camera] = self.camera.view.topleft
+        return positions
 
-        # Check win?
+    def _interpolate(self, alpha : float) -> dict[object, tuple[int, int]]:
+        """
+        Moves the sprites and the camera alpha of the way from where they were before the last tick to where it left them.
+        Whatever moved further than anything can in a tick was placed there and is left where it is.
+        :param alpha: float, see FixedTimestep.alpha
+        :return dict[object, tuple[int, int]]: the positions the last tick left, for _restore_positions
+        """
+        current : dict[object, tuple[int, int]] = self._positions()
+        for owner, (x, y) in current.items():
+            previous : tuple[int, int] | None = self._previous.get(owner)
+            if previous is None: continue
+            dx, dy = x - previous[0], y - previous[1]
+            if abs(dx) > MAX_TICK_MOVE or abs(dy) > MAX_TICK_MOVE: continue
+            rect : pygame.Rect = owner.view if owner is self.camera else owner.rect
+            rect.topleft = (round(previous[0] + dx * alpha), round(previous[1] + dy * alpha))
+        return current
 
-        # Drawing Everything
-        self.level.draw(self.window)
-        self.player.draw(self.window)
+    def _restore_positions(self, positions : dict[object, tuple[int, int]]):
+        for owner, pos in positions.items():
+            rect : pygame.Rect = owner.view if owner is self.camera else owner.rect
+            rect.topleft = pos
 
+    def _bind(self, simulation : Simulation):
+        """
+        Plays simulation from now on: its level's layers are drawn, its Player and layers get the overlay and timers
+        :param simulation: Simulation
+        """
+        self._dirty_rects = None # None forces a full frame
+        if simulation is self.simulation: return
+        if self.simulation is not None: self.layers.remove(self._overlay)
+        self.simulation = simulation
+        self.level = simulation.level
+        self.player = simulation.player
+        self.camera = simulation.camera
+        self.layers = self.level.layers
+        self.player.set_layers(self.layers)
+        self.layers.add(self._overlay, layer=UI_LAYER)
+        for owner, method, phase in INSTRUMENTED_PHASES: self.profiler.instrument(getattr(self, owner), method, phase)
+        pygame.display.set_caption(f"{NAME} - {self.level.name}")
+
+    def _draw_dirty(self):
+        """
+        Erases last frame's moving sprites with the level's static layer and only pushes the changed areas.
+        Once the camera scrolls the static layer is rebaked and the whole frame is pushed.
+        """
+        static_version : int = self.level.static_layer(self.camera)[1]
+        if self._dirty_rects is None or static_version != self._static_version:
+            self._static_version = static_version
+            self.level.draw_static(self.window, self.camera)
+            self._dirty_rects = self.layers.draw(self.window, self.camera.view, DYNAMIC_LAYERS)
+            start : int = self.profiler.now()
+            pygame.display.update()
+            self.profiler.record(self._display_phase, start)
+            return
+        self.level.restore(self.window, self._dirty_rects, self.camera)
+        drawn : list[pygame.Rect] = self.layers.draw(self.window, self.camera.view, DYNAMIC_LAYERS)
+        start = self.profiler.now()
+        pygame.display.update(self._dirty_rects + drawn)
+        self.profiler.record(self._display_phase, start)
+        self._dirty_rects = drawn
+
+    def _draw_upscaled(self):
+        """
+        Draws the world into the framebuffer, upscales it into the viewport in one pass and draws the UI over it at full resolution.
+        Every pixel of the framebuffer changes whenever anything is upscaled, so the whole viewport is pushed each frame.
+        """
+        self.layers.draw(self._framebuffer, self.camera.view, WORLD_LAYERS, self.render_scale)
+        start : int = self.profiler.now()
+        size : tuple[int, int] = self._viewport.size
+        if self.upscale == "scale2x" and size == (self._framebuffer.get_width() * 2, self._framebuffer.get_height() * 2):
+            pygame.transform.scale2x(self._framebuffer, self._target)
+        else: pygame.transform.scale(self._framebuffer, size, self._target)
+        self.profiler.record(self._upscale_phase, start)
+        self.layers.draw(self._target, layers=(UI_LAYER,))
+        start = self.profiler.now()
+        pygame.display.update(self._viewport)
+        self.profiler.record(self._display_phase, start)
+
+    def _fit_viewport(self):
+        """
+        Centres the largest whole multiple of the framebuffer that fits in the window, black bars fill the rest.
+        A window smaller than the framebuffer gets it squeezed to fit instead.
+        """
+        self.window = pygame.display.get_surface()
+        window : pygame.Rect = self.window.get_rect()
+        width, height = self._framebuffer.get_size()
+        factor : int = min(window.width // width, window.height // height)
+        self._viewport = pygame.Rect(0, 0, width * factor, height * factor) if factor else window.copy()
+        self._viewport.center = window.center
+        self.window.fill((0, 0, 0))
+        self._target = self.window.subsurface(self._viewport)
         pygame.display.update()
-        return GameState.PLAY
+
+    def to_screen(self, pos : tuple[int, int]) -> tuple[int, int]:
+        """
+        Window position to screen space, the viewport may be letterboxed and scaled when rendering through the framebuffer
+        :param pos: tuple[int, int]
+        :return tuple[int, int]
+        """
+        if self._framebuffer is None: return pos
+        return ((pos[0] - self._viewport.x) * SCREEN_WIDTH // self._viewport.width,
+                (pos[1] - self._viewport.y) * SCREEN_HEIGHT // self._viewport.height)
+
+    def _update_overlay(self):
+        self._overlay.visible = int(self.profiler.enabled and self.show_overlay)
+        if not self._overlay.visible: return
+        self._overlay.image = self.profiler.overlay(FRAME_PHASE)
+        self._overlay.rect = self._overlay.image.get_rect(topleft=OVERLAY_POS)
+
+    def _save_logs(self):
+        if self.record_path: self.levels.save_logs(self.record_path)
+        if self.profile_path: self.profiler.export_trace(self.profile_path)
 
     def __del__(self):
         pygame.quit()
\ No newline at end of file
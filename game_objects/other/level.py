@@ -1,9 +1,17 @@
 import json
 import pygame
-from utility.image_loader import ImageLoader
-from utility.game_constants import NAME, CELL_SIZE, SCREEN_WIDTH, SCREEN_HEIGHT
+from utility.image_loader import ImageLoader, convert_surface, derive_surface
+from utility.spatial_hash import SpatialHash
+from utility.collision import TerrainCollider
+from utility.render_layers import RenderLayers, BACKGROUND_LAYER, TERRAIN_LAYER, STATIC_LAYERS
+from utility.level_format import CompiledLevel, is_compiled_level
+from utility.tilemap import TileMap, pack_passthrough, PASS_TOP, PASS_BOT, PASS_LEFT, PASS_RIGHT
+from utility.game_constants import CELL_SIZE, SCREEN_WIDTH, SCREEN_HEIGHT, TILEMAP_TERRAIN, RENDER_SCALE
 from game_objects.blocks.block import Block
-from game_objects.entities.player import Player
+from game_objects.blocks.trigger import Trigger, TRIGGER_KINDS, GOAL
+from game_objects.blocks.goal import Goal, GOAL_IMAGE
+from game_objects.entities.player import Player, PLAYER_ASSETS
+from game_objects.other.camera import Camera
 
 # Constants
 name_key : str = 'level_name'
@@ -16,63 +24,534 @@ KIND_KEY : str = "kind"
 WIDTH_KEY : str = "width"
 HEIGHT_KEY : str = "height"
 BACKGROUND_KEY : str = "background"
+GOAL_KEY : str = "goal" # optional [x, y, width, height] in cells, the area that finishes the level
+# Trigger Constants, triggers are an optional list of {"kind", "x", "y", "width", "height"} in cells and an optional "name"
+TRIGGERS_KEY : str = "triggers"
+TRIGGER_NAME_KEY : str = "name"
+# Chunk Constants
+CHUNK_CELLS : int = 16 # cells per chunk side
+CHUNK_SIZE : int = CHUNK_CELLS * CELL_SIZE # px
+CHUNK_LOAD_MARGIN : int = 1 # chunks around the view kept loaded
+CHUNK_UNLOAD_MARGIN : int = 2 # chunks around the view before one is unloaded
 
 # Helpers
-def generate_block(kind : int, x : int, y : int, width : int, height : int, assets : ImageLoader) -> Block | None:
+def read_level_data(level_data : str) -> dict:
+    with open(level_data) as file:
+        return json.load(file)
+
+def block_sprite(kind : int) -> str | None:
+    match kind:
+        case 0: # Empty
+            return None
+        case 1: # Default Block
+            return "platform.png"
+
+def block_passthrough(kind : int) -> tuple[bool, bool, bool, bool]:
+    """
+    Which sides (top, bot, left, right) a kind of block can be passed through from
+    :param kind: int
+    :return tuple[bool, bool, bool, bool]
+    """
+    match kind:
+        case _:
+            return False, False, False, False
+
+def block_image(kind : int, assets : ImageLoader) -> pygame.Surface | None:
+    sprite : str | None = block_sprite(kind)
+    if sprite is None: return None
+    return assets.get_image("blocks", sprite)
+
+def read_triggers(data : dict) -> list[tuple[str, int, int, int, int, str]]:
+    """
+    A JSON level's triggers, its "goal" included
+    :param data: dict, read_level_data()
+    :return list[tuple[str, int, int, int, int, str]]: (kind, x, y, width, height, name) in cells
+    """
+    triggers : list[tuple[str, int, int, int, int, str]] = []
+    if data.get(GOAL_KEY) is not None: triggers.append((GOAL, *data[GOAL_KEY], ""))
+    for trigger_data in data.get(TRIGGERS_KEY, []):
+        if trigger_data[KIND_KEY] not in TRIGGER_KINDS: raise ValueError(f"Level: Unknown trigger kind {trigger_data[KIND_KEY]}")
+        triggers.append((trigger_data[KIND_KEY], trigger_data[X_KEY], trigger_data[Y_KEY], trigger_data[WIDTH_KEY],
+                         trigger_data[HEIGHT_KEY], trigger_data.get(TRIGGER_NAME_KEY, "")))
+    return triggers
+
+def generate_trigger(kind : str, x : int, y : int, width : int, height : int, name : str, assets : ImageLoader) -> Trigger:
     pos : (int, int) = (x * CELL_SIZE, y * CELL_SIZE)
     width *= CELL_SIZE
     height *= CELL_SIZE
+    if kind == GOAL: return Goal(pos=pos, width=width, height=height, image=assets.get_image(*GOAL_IMAGE), name=name)
+    return Trigger(kind=kind, pos=pos, width=width, height=height, name=name)
+
+def level_manifest(level_data : str, data : dict = None) -> list[tuple[str, str]]:
+    """
+    Lists the (category, name) images a level and its Player need, for ImageLoader.prefetch
+    :param level_data: str
+    :param data: dict, the JSON level already read, None to read it
+    :return list[tuple[str, str]]
+    """
+    background : str
+    kinds : set[int]
+    triggers : list[tuple[str, int, int, int, int, str]]
+    if is_compiled_level(level_data):
+        with CompiledLevel(level_data) as compiled:
+            background, kinds, triggers = compiled.background, compiled.kinds(), compiled.triggers()
+    else:
+        if data is None: data = read_level_data(level_data)
+        background, kinds, triggers = data[BACKGROUND_KEY], {block_data[KIND_KEY] for block_data in data[terrain_key]}, read_triggers(data)
+    manifest : list[tuple[str, str]] = [("backgrounds", background)] + PLAYER_ASSETS
+    if any(trigger[0] == GOAL for trigger in triggers): manifest.append(GOAL_IMAGE)
+    for kind in kinds:
+        sprite : str | None = block_sprite(kind)
+        if sprite is not None: manifest.append(("blocks", sprite))
+    return list(dict.fromkeys(manifest))
+
+def generate_block(kind : int, x : int, y : int, width : int, height : int, assets : ImageLoader,
+                   image : pygame.Surface = None) -> Block | None:
+    pos : (int, int) = (x * CELL_SIZE, y * CELL_SIZE)
+    width *= CELL_SIZE
+    height *= CELL_SIZE
+    if image is None: image = block_image(kind, assets)
+    if image is None: return None
+    top, bot, left, right = block_passthrough(kind)
     match kind:
-        case 0: # Empty
-            return None
         case 1: # Default Block
-            return Block(image=assets.get_image("blocks", "platform.png"), pos=pos, width=width, height=height)
+            return Block(image=image, pos=pos, width=width, height=height, top=top, bot=bot, left=left, right=right)
+
+def generate_cell_block(kind : int, flags : int, x : int, y : int, assets : ImageLoader) -> Block | None:
+    """
+    Block for a single tilemap cell, passthrough comes from the cell's flags
+    """
+    image : pygame.Surface | None = block_image(kind, assets)
+    if image is None: return None
+    return Block(image=image, pos=(x * CELL_SIZE, y * CELL_SIZE), width=CELL_SIZE, height=CELL_SIZE,
+                 top=bool(flags & PASS_TOP), bot=bool(flags & PASS_BOT), left=bool(flags & PASS_LEFT), right=bool(flags & PASS_RIGHT))
+
+def merge_terrain(terrain : list[dict]) -> list[tuple[int, int, int, int, int, list[tuple[int, int, int, int, int]]]]:
+    """
+    Greedily meshes terrain cells of the same kind and passthrough into as few axis-aligned rects as possible.
+    Each result is (kind, x, y, width, height, members), members being the (x, y, width, height, order) of the blocks
+    drawn inside that rect, order being their index in terrain, which is the order they are drawn in.
+    :param terrain: list[dict]
+    :return list[tuple[int, int, int, int, int, list[tuple[int, int, int, int, int]]]]
+    """
+    # Rasterize, later blocks win where blocks overlap. Cells only merge if they collide the same way
+    keys : dict[int, tuple[int, tuple[bool, bool, bool, bool]]] = {}
+    cells : dict[tuple[int, int], tuple[int, tuple[bool, bool, bool, bool]]] = {}
+    owners : dict[tuple[int, int], int] = {}
+    for i, block_data in enumerate(terrain):
+        if block_data[KIND_KEY] == 0: continue
+        if block_data[KIND_KEY] not in keys: keys[block_data[KIND_KEY]] = (block_data[KIND_KEY], block_passthrough(block_data[KIND_KEY]))
+        key : tuple[int, tuple[bool, bool, bool, bool]] = keys[block_data[KIND_KEY]]
+        for x in range(block_data[X_KEY], block_data[X_KEY] + block_data[WIDTH_KEY]):
+            for y in range(block_data[Y_KEY], block_data[Y_KEY] + block_data[HEIGHT_KEY]):
+                cells[(x, y)] = key
+                owners[(x, y)] = i
+
+    merged : list[tuple[int, int, int, int, int, list[tuple[int, int, int, int, int]]]] = []
+    for x, y in sorted(cells, key=lambda cell: (cell[1], cell[0])):
+        key = cells.get((x, y))
+        if key is None: continue # already part of a merged rect
+        width : int = 1
+        while cells.get((x + width, y)) == key: width += 1
+        height : int = 1
+        while all(cells.get((x + i, y + height)) == key for i in range(width)): height += 1
+
+        member_ids : set[int] = set()
+        for cx in range(x, x + width):
+            for cy in range(y, y + height):
+                del cells[(cx, cy)]
+                member_ids.add(owners[(cx, cy)])
+        merged.append((key[0], x, y, width, height, [(terrain[i][X_KEY], terrain[i][Y_KEY], terrain[i][WIDTH_KEY], terrain[i][HEIGHT_KEY], i)
+                                                     for i in sorted(member_ids)]))
+    return merged
+
+def split_into_chunks(rects) -> dict[tuple[int, int], list[tuple[int, int, int, int, int, list[tuple[int, int, int, int, int]]]]]:
+    """
+    Clips merged terrain rects to the chunks they cross, keeping the members that reach into each piece
+    :param rects: iterable of (kind, x, y, width, height, members) in cells
+    :return dict[tuple[int, int], list[tuple[int, int, int, int, int, list[tuple[int, int, int, int, int]]]]]
+    """
+    chunks : dict[tuple[int, int], list[tuple[int, int, int, int, int, list[tuple[int, int, int, int, int]]]]] = {}
+    for kind, x, y, width, height, members in rects:
+        for cx in range(x // CHUNK_CELLS, (x + width - 1) // CHUNK_CELLS + 1):
+            for cy in range(y // CHUNK_CELLS, (y + height - 1) // CHUNK_CELLS + 1):
+                left : int = max(x, cx * CHUNK_CELLS)
+                top : int = max(y, cy * CHUNK_CELLS)
+                right : int = min(x + width, (cx + 1) * CHUNK_CELLS)
+                bottom : int = min(y + height, (cy + 1) * CHUNK_CELLS)
+                inside : list[tuple[int, int, int, int, int]] = [member for member in members
+                                                            if member[0] < right and member[0] + member[2] > left
+                                                            and member[1] < bottom and member[1] + member[3] > top]
+                chunks.setdefault((cx, cy), []).append((kind, left, top, right - left, bottom - top, inside))
+    return chunks
+
+class Chunk(pygame.sprite.DirtySprite):
+    """
+    A resident CHUNK_CELLS square of terrain: one baked surface, drawn as a sprite on the terrain layer,
+    and its Blocks for collision unless the level's tilemap answers collision queries.
+    Above an image_scale of 1 the surface is baked straight from the source images at 1/image_scale, see RenderLayers.
+    """
+    # Attributes
+    pos : tuple[int, int]
+    blocks : list[Block]
+    image : pygame.Surface
+    image_scale : int # world px per image px
+    rect : pygame.Rect
+
+    # Magic Methods
+    def __init__(self, pos : tuple[int, int], assets : ImageLoader,
+                 rects : list[tuple[int, int, int, int, int, list[tuple[int, int, int, int, int]]]] = None, tilemap : TileMap = None,
+                 image_scale : int = 1):
+        super().__init__()
+        self.pos = pos
+        self.rect = pygame.Rect(pos[0] * CHUNK_SIZE, pos[1] * CHUNK_SIZE, CHUNK_SIZE, CHUNK_SIZE)
+        self.blocks = []
+        self.image_scale = image_scale
+        self.image = pygame.Surface((CHUNK_SIZE // image_scale, CHUNK_SIZE // image_scale), pygame.SRCALPHA)
+        if tilemap is not None: self._stamp_tiles(tilemap, assets)
+        else: self._bake_rects(rects, assets)
+        self.image = convert_surface(self.image)
+
+    # Methods
+    def _stamp_tiles(self, tilemap : TileMap, assets : ImageLoader):
+        scale : int = self.image_scale
+        tiles : dict[int, pygame.Surface | None] = {}
+        stamps : list[tuple[pygame.Surface, tuple[int, int]]] = []
+        for x, y, kind in tilemap.cells_in(self.rect):
+            if kind not in tiles:
+                image : pygame.Surface | None = block_image(kind, assets)
+                tiles[kind] = derive_surface(image, size=(CELL_SIZE // scale, CELL_SIZE // scale)) if image is not None else None
+            if tiles[kind] is not None:
+                stamps.append((tiles[kind], ((x * CELL_SIZE - self.rect.x) // scale, (y * CELL_SIZE - self.rect.y) // scale)))
+        self.image.blits(stamps, doreturn=False)
+
+    def _bake_rects(self, rects : list[tuple[int, int, int, int, int, list[tuple[int, int, int, int, int]]]], assets : ImageLoader):
+        scale : int = self.image_scale
+        # Draw the original blocks rather than the merged rects so merging keeps the level looking the same,
+        # in the order the level lists them, since a block split across rects is only drawn once
+        drawn : dict[int, tuple[pygame.Surface, int, int, int, int]] = {}
+        for kind, x, y, width, height, members in rects:
+            new_block : Block = generate_block(x=x, y=y, kind=kind, width=width, height=height, assets=assets)
+            if new_block is None: continue
+            self.blocks.append(new_block)
+            image : pygame.Surface = block_image(kind, assets)
+            for member_x, member_y, member_width, member_height, order in members: drawn[order] = (image, member_x, member_y, member_width, member_height)
+        for order in sorted(drawn):
+            image, member_x, member_y, member_width, member_height = drawn[order]
+            self.image.blit(derive_surface(image, size=(member_width * CELL_SIZE // scale, member_height * CELL_SIZE // scale)),
+                            ((member_x * CELL_SIZE - self.rect.x) // scale, (member_y * CELL_SIZE - self.rect.y) // scale))
 
 class Level:
+    """
+    Terrain is kept as plain rect data per chunk, or as a TileMap when tilemap is set. Only chunks near the camera
+    (or a collision query) are turned into Blocks and a baked surface, and chunks that fall far behind are dropped again.
+    With a TileMap, collision reads cells straight from the map and chunks only hold their surface.
+    Triggers are few and never move, they are all made at load into their own index, visible ones drawn with the terrain.
+    With a render_scale above 1 the background and chunks are only ever made at 1/render_scale, for a framebuffer that small.
+    """
     # Attributes
-    _terrain : list[Block]
-    _terrain_group : pygame.sprite.Group = pygame.sprite.Group()
+    _name : str
+    _assets : ImageLoader
+    _chunk_data : dict[tuple[int, int], list[tuple[int, int, int, int, int, list[tuple[int, int, int, int, int]]]]]
+    _compiled : CompiledLevel | None # kept open while chunks stream in from it
+    _chunk_table : dict[tuple[int, int], tuple[int, int]] # compiled chunk -> (first rect, rect count)
+    _tilemap : TileMap | None
+    _empty_chunks : set[tuple[int, int]]
+    _chunks : dict[tuple[int, int], Chunk]
+    _terrain_index : SpatialHash
+    _triggers : list[Trigger]
+    _trigger_index : SpatialHash
+    _world_rect : pygame.Rect
     _start_pos : (int, int)
+    _goal : pygame.Rect | None
     _background : pygame.Surface
+    _render_scale : int
+    _layers : RenderLayers
+    _static_layer : pygame.Surface | None
+    _static_key : tuple | None
+    _static_version : int
+    _chunk_version : int
 
     # Magic Methods
-    def __init__(self, level_data : str, assets : ImageLoader):
-        self._terrain = []
-        file = open(level_data)
-        data = json.load(file)
-        pygame.display.set_caption(f"{NAME} - {data[name_key]}")
-        self._start_pos = data[start_pos_key]
-
-        for block_data in data[terrain_key]:
-            new_block : Block = generate_block(x=block_data[X_KEY], y=block_data[Y_KEY], kind=block_data[KIND_KEY], width=block_data[WIDTH_KEY], height=block_data[HEIGHT_KEY], assets=assets)
-            if new_block is not None:
-                self._terrain.append(new_block)
-                self._terrain_group.add(new_block)
-        self._background = pygame.transform.scale(assets.get_image("backgrounds", data[BACKGROUND_KEY]), size=(SCREEN_WIDTH, SCREEN_HEIGHT)).convert_alpha()
+    def __init__(self, level_data : str, assets : ImageLoader, tilemap : bool = TILEMAP_TERRAIN, data : dict = None,
+                 render_scale : int = RENDER_SCALE):
+        """
+        :param level_data: str, path of a JSON or compiled level
+        :param assets: ImageLoader
+        :param tilemap: bool
+        :param data: dict, the JSON level already read, None to read it
+        :param render_scale: int, world px per px of the surfaces it is drawn onto
+        """
+        self._assets = assets
+        self._render_scale = max(1, render_scale)
+        self._chunk_data = {}
+        self._compiled = None
+        self._chunk_table = {}
+        self._tilemap = None
+        self._empty_chunks = set()
+        self._chunks = {}
+        self._static_layer = None
+        self._static_key = None
+        self._static_version = 0
+        self._chunk_version = 0
+        self._terrain_index = SpatialHash(CELL_SIZE)
+        self._trigger_index = SpatialHash(CELL_SIZE)
+
+        background : str
+        triggers : list[tuple[str, int, int, int, int, str]]
+        world_size : tuple[int, int] = (0, 0) # cells
+        if is_compiled_level(level_data):
+            compiled : CompiledLevel = CompiledLevel(level_data).open()
+            self._name, self._start_pos, background = compiled.name, compiled.start_pos, compiled.background
+            triggers = compiled.triggers()
+            if tilemap:
+                self._build_tilemap(compiled.boxes())
+                compiled.close()
+            elif compiled.chunk_cells != CHUNK_CELLS:
+                compiled.close()
+                raise ValueError(f"Level: {level_data} was compiled with {compiled.chunk_cells} cell chunks, expected {CHUNK_CELLS}, recompile it")
+            else:
+                # Only the chunk table is read now, each chunk's rects are sliced out of the map as it streams in
+                self._compiled = compiled
+                self._chunk_table = compiled.chunks()
+                world_size = compiled.world_size
+        else:
+            if data is None: data = read_level_data(level_data)
+            self._name, self._start_pos, background = data[name_key], data[start_pos_key], data[BACKGROUND_KEY]
+            triggers = read_triggers(data)
+            if tilemap:
+                self._build_tilemap([(block_data[KIND_KEY], block_data[X_KEY], block_data[Y_KEY], block_data[WIDTH_KEY], block_data[HEIGHT_KEY])
+                                     for block_data in data[terrain_key]])
+            else: self._chunk_data = split_into_chunks(merge_terrain(data[terrain_key]))
+        self._background = assets.get_derived("backgrounds", background,
+                                              size=(SCREEN_WIDTH // self._render_scale, SCREEN_HEIGHT // self._render_scale))
+        # Loaded chunks join the terrain layer as they load, the Player adds itself and its platforms in Game
+        self._layers = RenderLayers()
+        background_sprite : pygame.sprite.DirtySprite = pygame.sprite.DirtySprite()
+        background_sprite.image = self._background
+        background_sprite.image_scale = self._render_scale
+        background_sprite.rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+        self._layers.add(background_sprite, layer=BACKGROUND_LAYER)
+        self._triggers = [generate_trigger(*trigger, assets=assets) for trigger in triggers]
+        for trigger in self._triggers:
+            self._trigger_index.insert(trigger)
+            if trigger.visible: self._layers.add(trigger, layer=TERRAIN_LAYER)
+        self._goal = next((trigger.rect for trigger in self._triggers if trigger.kind == GOAL), None)
+
+        # The world is at least a screen, and otherwise as big as the terrain reaches
+        right : int = SCREEN_WIDTH
+        bottom : int = SCREEN_HEIGHT
+        if self._tilemap is not None:
+            right = max(right, self._tilemap.width * CELL_SIZE)
+            bottom = max(bottom, self._tilemap.height * CELL_SIZE)
+        for rects in self._chunk_data.values():
+            for _, x, y, width, height, _ in rects:
+                right = max(right, (x + width) * CELL_SIZE)
+                bottom = max(bottom, (y + height) * CELL_SIZE)
+        right = max(right, world_size[0] * CELL_SIZE)
+        bottom = max(bottom, world_size[1] * CELL_SIZE)
+        self._world_rect = pygame.Rect(0, 0, right, bottom)
+
+    def _build_tilemap(self, boxes):
+        """
+        Rasterizes (kind, x, y, width, height) terrain into a TileMap, later blocks win where blocks overlap
+        """
+        boxes = [box for box in boxes if box[0] != 0]
+        width : int = max([SCREEN_WIDTH // CELL_SIZE] + [x + box_width for _, x, _, box_width, _ in boxes])
+        height : int = max([SCREEN_HEIGHT // CELL_SIZE] + [y + box_height for _, _, y, _, box_height in boxes])
+        assets : ImageLoader = self._assets
+        self._tilemap = TileMap(width, height, lambda kind, flags, x, y: generate_cell_block(kind, flags, x, y, assets))
+        for kind, x, y, box_width, box_height in boxes:
+            self._tilemap.fill(x, y, box_width, box_height, kind, pack_passthrough(*block_passthrough(kind)))
 
     # Accessors/Setters
+    @property
+    def name(self) -> str:
+        return self._name
+
     @property
     def terrain(self) -> list[Block]:
-        return self._terrain
+        """
+        Blocks of the chunks currently loaded
+        :return list[Block]
+        """
+        if self._tilemap is not None:
+            return [block for chunk in self._chunks.values() for block in self._tilemap.blocks_in(chunk.rect)]
+        return [block for chunk in self._chunks.values() for block in chunk.blocks]
+
+    @property
+    def tilemap(self) -> TileMap | None:
+        return self._tilemap
 
     @property
     def start_pos(self) -> (int, int):
         return self._start_pos
 
+    @property
+    def goal(self) -> pygame.Rect | None:
+        """
+        World space area of the level's first goal, None if it has none
+        :return pygame.Rect | None
+        """
+        return self._goal
+
+    @property
+    def triggers(self) -> list[Trigger]:
+        return self._triggers
+
+    @property
+    def trigger_index(self) -> SpatialHash:
+        """
+        Every Trigger, indexed by the cells it covers, see game_objects.other.triggers.TriggerTracker
+        :return SpatialHash
+        """
+        return self._trigger_index
+
+    @property
+    def world_rect(self) -> pygame.Rect:
+        return self._world_rect
+
+    @property
+    def loaded_chunks(self) -> int:
+        return len(self._chunks)
+
+    @property
+    def layers(self) -> RenderLayers:
+        return self._layers
+
+    @property
+    def render_scale(self) -> int: return self._render_scale
+
+    def static_layer(self, camera : Camera = None) -> tuple[pygame.Surface, int]:
+        """
+        Background and the visible terrain baked into one surface, rebaked only when the view or loaded chunks change.
+        :param camera: Camera, None for an unscrolled screen
+        :return tuple[pygame.Surface, int]: the layer and a version that changes whenever it is rebaked
+        """
+        view : pygame.Rect = self._view(camera)
+        key : tuple = (view.topleft, self._chunk_version)
+        if key != self._static_key:
+            self._load_chunks(view)
+            if self._static_layer is None: self._static_layer = self._background.copy()
+            self._layers.draw(self._static_layer, view, STATIC_LAYERS, self._render_scale)
+            self._static_key = (view.topleft, self._chunk_version)
+            self._static_version += 1
+        return self._static_layer, self._static_version
+
     # Methods
-    def draw(self, surface : pygame.Surface):
-        surface.blit(self._background, (0, 0))
-        self._terrain_group.draw(surface)
+    def close(self):
+        """
+        Lets go of the compiled level chunks stream in from, chunks already loaded stay
+        """
+        if self._compiled is not None: self._compiled.close()
+        self._compiled = None
+        self._chunk_table = {}
+
+    def draw(self, surface : pygame.Surface, camera : Camera = None):
+        view : pygame.Rect = self._view(camera)
+        self._load_chunks(view)
+        self._layers.draw(surface, view, STATIC_LAYERS, self._render_scale)
+
+    def draw_static(self, surface : pygame.Surface, camera : Camera = None):
+        surface.blit(self.static_layer(camera)[0], (0, 0))
 
-    def find_near_blocks(self, player : Player) -> list[Block]:
+    def restore(self, surface : pygame.Surface, rects : list[pygame.Rect], camera : Camera = None):
         """
-        Finds nearest Blocks (terrain) to a Player.
+        Paints the static layer back over rects (screen space), erasing whatever moved there last frame.
+        :param surface: pygame.Surface
+        :param rects: list[pygame.Rect]
+        :param camera: Camera
+        """
+        static_layer : pygame.Surface = self.static_layer(camera)[0]
+        surface.blits([(static_layer, rect, rect) for rect in rects], doreturn=False)
+
+    def stream(self, view : pygame.Rect):
+        """
+        Loads the chunks within CHUNK_LOAD_MARGIN chunks of view and unloads those beyond CHUNK_UNLOAD_MARGIN.
+        :param view: pygame.Rect, world space
+        """
+        self._load_chunks(view.inflate(2 * CHUNK_LOAD_MARGIN * CHUNK_SIZE, 2 * CHUNK_LOAD_MARGIN * CHUNK_SIZE))
+        keep : pygame.Rect = view.inflate(2 * CHUNK_UNLOAD_MARGIN * CHUNK_SIZE, 2 * CHUNK_UNLOAD_MARGIN * CHUNK_SIZE)
+        for pos in [pos for pos, chunk in self._chunks.items() if not keep.colliderect(chunk.rect)]:
+            self._unload_chunk(pos)
+
+    def find_near_blocks(self, player : Player, dt : float) -> list[Block]:
+        """
+        Finds the Blocks (terrain) a Player could touch while moving for dt seconds.
         :param player: Player
+        :param dt: float
         :return list[Block]
         """
-        # TEMPORARY
-        return self._terrain
-        # nearest_blocks : list[Block] = []
-        # for block in self._terrain:
-        #     nearest_blocks.append(block)
-        # return nearest_blocks
+        return self._blocks_in(player.swept_rect(dt))
+
+    def collider(self, rect : pygame.Rect) -> TerrainCollider:
+        """
+        The terrain inside rect as a TerrainCollider, for moving many entities through it in one EntityStore.step
+        :param rect: pygame.Rect, covering everywhere the entities can reach this step
+        :return TerrainCollider
+        """
+        return TerrainCollider.from_blocks(self._blocks_in(rect))
+
+    def save_state(self) -> list[tuple[int, int]]:
+        """
+        The loaded chunks in load order, which is the order terrain queries return their blocks in
+        :return list[tuple[int, int]]
+        """
+        return list(self._chunks)
+
+    def load_state(self, state : list[tuple[int, int]]):
+        """
+        Loads exactly the chunks of a save_state(), in its order, reusing the ones already loaded
+        :param state: list[tuple[int, int]]
+        """
+        if list(self._chunks) == state: return
+        loaded : dict[tuple[int, int], Chunk] = dict(self._chunks)
+        for pos in loaded: self._unload_chunk(pos)
+        for pos in state: self._add_chunk(pos, loaded[pos] if pos in loaded else self._make_chunk(pos))
+
+    def _blocks_in(self, rect : pygame.Rect) -> list[Block]:
+        if self._tilemap is not None: return self._tilemap.blocks_in(rect)
+        self._load_chunks(rect)
+        return self._terrain_index.query(rect)
+
+    def _view(self, camera : Camera | None) -> pygame.Rect:
+        if camera is None: return pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+        return camera.view
+
+    def _chunk_range(self, rect : pygame.Rect) -> tuple[range, range]:
+        return (range(rect.left // CHUNK_SIZE, (rect.right - 1) // CHUNK_SIZE + 1),
+                range(rect.top // CHUNK_SIZE, (rect.bottom - 1) // CHUNK_SIZE + 1))
+
+    def _load_chunks(self, rect : pygame.Rect):
+        cols, rows = self._chunk_range(rect)
+        for cx in cols:
+            for cy in rows:
+                if (cx, cy) in self._chunks or (cx, cy) in self._empty_chunks: continue
+                chunk : Chunk | None = self._make_chunk((cx, cy))
+                if chunk is None:
+                    self._empty_chunks.add((cx, cy))
+                    continue
+                self._add_chunk((cx, cy), chunk)
+
+    def _add_chunk(self, pos : tuple[int, int], chunk : Chunk):
+        self._chunks[pos] = chunk
+        self._layers.add(chunk, layer=TERRAIN_LAYER)
+        for block in chunk.blocks: self._terrain_index.insert(block)
+        self._chunk_version += 1
+
+    def _make_chunk(self, pos : tuple[int, int]) -> Chunk | None:
+        if self._compiled is not None:
+            if pos not in self._chunk_table: return None
+            return Chunk(pos, self._assets, rects=self._compiled.chunk_rects(*self._chunk_table[pos]), image_scale=self._render_scale)
+        if self._tilemap is None:
+            if pos not in self._chunk_data: return None
+            return Chunk(pos, self._assets, rects=self._chunk_data[pos], image_scale=self._render_scale)
+        cols, rows = self._tilemap.cell_range(pygame.Rect(pos[0] * CHUNK_SIZE, pos[1] * CHUNK_SIZE, CHUNK_SIZE, CHUNK_SIZE))
+        if not self._tilemap.any_in(cols, rows): return None
+        return Chunk(pos, self._assets, tilemap=self._tilemap, image_scale=self._render_scale)
+
+    def _unload_chunk(self, pos : tuple[int, int]):
+        chunk : Chunk = self._chunks.pop(pos)
+        self._layers.remove(chunk)
+        for block in chunk.blocks: self._terrain_index.remove(block)
+        self._chunk_version += 1
@@ -0,0 +1,39 @@
+"""
+Compiles JSON levels into the binary format Level memory-maps at load.
+JSON stays the authoring format, run from the repository root:
+    python -m game_objects.other.level_compiler assets/levels/test.json [more.json ...]
+"""
+import argparse
+import os
+from utility.level_format import COMPILED_LEVEL_EXTENSION, write_compiled_level
+from game_objects.other.level import read_level_data, read_triggers, merge_terrain, split_into_chunks, name_key, start_pos_key, \
+    terrain_key, BACKGROUND_KEY, CHUNK_CELLS
+
+def compile_level(level_data : str, output : str = "") -> str:
+    """
+    Merges a JSON level's terrain, splits it into the chunks Level streams and writes it out compiled with its triggers,
+    next to the JSON unless output is given
+    :param level_data: str
+    :param output: str
+    :return str: path written
+    """
+    data : dict = read_level_data(level_data)
+    if output == "": output = os.path.splitext(level_data)[0] + COMPILED_LEVEL_EXTENSION
+    write_compiled_level(output, name=data[name_key], start_pos=tuple(data[start_pos_key]), background=data[BACKGROUND_KEY],
+                         chunks=split_into_chunks(merge_terrain(data[terrain_key])), chunk_cells=CHUNK_CELLS,
+                         triggers=read_triggers(data))
+    return output
+
+def main():
+    parser : argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("levels", nargs="+", help="JSON level files")
+    parser.add_argument("--out-dir", default="", help="write compiled levels here instead of next to the JSON")
+    args = parser.parse_args()
+    for level_data in args.levels:
+        output : str = ""
+        if args.out_dir:
+            output = os.path.join(args.out_dir, os.path.splitext(os.path.basename(level_data))[0] + COMPILED_LEVEL_EXTENSION)
+        print(compile_level(level_data, output))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+import pygame
+from utility.image_loader import ImageLoader
+from utility.input_log import InputRecorder
+from utility.level_format import is_compiled_level
+from utility.game_constants import RENDER_SCALE
+from game_objects.entities.player import INPUT_KEYS
+from game_objects.other.level import level_manifest, read_level_data
+from game_objects.other.simulation import Simulation
+
+class PreparedLevel:
+    """
+    A level loaded in two halves. Making one only reads files: it parses a JSON level and decodes the images the level
+    needs, touching nothing shared, so it can run on a worker thread. finish() then converts the images into the
+    ImageLoader and builds the Simulation and the snapshot restart() goes back to, on the thread the display lives on.
+    """
+    # Attributes
+    level_data : str
+    assets : ImageLoader
+    simulation : Simulation | None # None until finish()
+    initial_state : dict[str, object] | None
+    _data : dict | None # parsed JSON level, None for compiled ones, which are memory-mapped
+    _images : list[tuple[int | tuple[str, str], pygame.Surface]] # decoded but not converted
+
+    # Magic Methods
+    def __init__(self, level_data : str, assets : ImageLoader):
+        self.level_data = level_data
+        self.assets = assets
+        self.simulation = None
+        self.initial_state = None
+        self._data = None if is_compiled_level(level_data) else read_level_data(level_data)
+        self._images = assets.decode(level_manifest(level_data, self._data))
+
+    # Methods
+    def finish(self, render_scale : int = RENDER_SCALE) -> "PreparedLevel":
+        """
+        Builds the level from what was read, once
+        :param render_scale: int, see Level
+        :return PreparedLevel: itself
+        """
+        if self.simulation is not None: return self
+        self.assets.insert(self._images)
+        self.simulation = Simulation(level_data=self.level_data, assets=self.assets, data=self._data, render_scale=render_scale)
+        self.simulation.level.static_layer(self.simulation.camera) # bake the first frame's terrain now, not on the first frame
+        self.initial_state = self.simulation.save_state()
+        self._data, self._images = None, []
+        return self
+
+class LevelManager:
+    """
+    Owns the level being played and reads the one after it on a worker thread meanwhile, JSON parsing and image decoding
+    included, so advance() only has to convert and build it. restart() puts the current level back the way it
+    started from a snapshot taken at load, resetting the Player, its Platforms and the loaded chunks in place.
+    Levels are played in order, then from the first again.
+    """
+    # Attributes
+    assets : ImageLoader
+    levels : list[str]
+    record : bool
+    render_scale : int
+    recorders : list[InputRecorder] # every attempt's, oldest first
+    _index : int
+    _current : PreparedLevel
+    _next : Future | None
+    _executor : ThreadPoolExecutor
+
+    # Magic Methods
+    def __init__(self, levels : list[str], assets : ImageLoader, record : bool = False, render_scale : int = RENDER_SCALE):
+        """
+        :param levels: list[str], level_data paths
+        :param assets: ImageLoader
+        :param record: bool, give every attempt an InputRecorder
+        :param render_scale: int, world px per px of the framebuffer levels are drawn into, see Level
+        """
+        if not levels: raise ValueError("LevelManager: At least one level must be provided")
+        self.assets = assets
+        self.levels = levels
+        self.record = record
+        self.render_scale = render_scale
+        self.recorders = []
+        self._index = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-preload")
+        self._current = PreparedLevel(levels[0], assets).finish(render_scale)
+        self._set_recorder()
+        self._next = None
+        self._preload()
+
+    # Accessors/Setters
+    @property
+    def simulation(self) -> Simulation: return self._current.simulation
+
+    @property
+    def level_data(self) -> str: return self._current.level_data
+
+    @property
+    def index(self) -> int: return self._index
+
+    @property
+    def next_index(self) -> int: return (self._index + 1) % len(self.levels)
+
+    @property
+    def preloaded(self) -> bool: return self._next is not None and self._next.done()
+
+    # Methods
+    def restart(self):
+        """
+        Puts the current level back to how it was loaded, reusing everything already made for it
+        """
+        self.simulation.restart(self._current.initial_state)
+        self._set_recorder()
+
+    def advance(self) -> Simulation:
+        """
+        Swaps in the next level, waiting for its preload only if it hasn't finished yet, and starts preloading the one after.
+        A level followed by itself is restarted instead.
+        :return Simulation: the new current one
+        """
+        self._index = self.next_index
+        if self._next is None: self.restart()
+        else:
+            self._current.simulation.level.close()
+            self._current = self._next.result().finish(self.render_scale)
+            self._set_recorder()
+            self._preload()
+        return self.simulation
+
+    def save_logs(self, path : str) -> list[str]:
+        """
+        Saves the input log of every attempt that played a tick, numbered before the extension: run.jpin becomes
+        run.001.jpin, run.002.jpin, ... in the order they were played
+        :param path: str
+        :return list[str]: paths written
+        """
+        root, extension = os.path.splitext(path)
+        paths : list[str] = []
+        for recorder in self.recorders:
+            if len(recorder.log) == 0: continue
+            paths.append(f"{root}.{len(paths) + 1:03d}{extension}")
+            recorder.save(paths[-1])
+        return paths
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._current.simulation.level.close()
+
+    def _preload(self):
+        next_level : str = self.levels[self.next_index]
+        if next_level == self._current.level_data: self._next = None
+        else: self._next = self._executor.submit(PreparedLevel, next_level, self.assets)
+
+    def _set_recorder(self):
+        # Each attempt gets its own log, replays start from a freshly loaded level
+        if not self.record: return
+        self.recorders.append(InputRecorder(self._current.level_data, INPUT_KEYS))
+        self.simulation.set_recorder(self.recorders[-1])
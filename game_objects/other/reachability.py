@@ -0,0 +1,245 @@
+"""
+Checks whether levels can be finished by searching everything the Player can do on them, headless, with the real
+Player movement and collision code as the transition function. Run from the repository root:
+    python -m game_objects.other.reachability assets/levels/*.json
+    python -m game_objects.other.reachability level.json --goal 70 40 2 2 --out report.json
+The goal is the level's "goal" area unless --goal (cells) is given. Levels are spread across worker processes.
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import time
+import pygame
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+from utility.image_loader import ImageLoader
+from utility.game_constants import SIMULATION_DT, CELL_SIZE
+from game_objects.other.level import Level
+from game_objects.entities.player import Player
+from game_objects.blocks.trigger import HAZARD
+from game_objects.other.simulation import Simulation, ScriptedInput, PRESS, RELEASE, CLICK
+
+# Search Constants
+ACTION_TICKS : int = 6 # ticks each searched input is held for
+POSITION_QUANTUM : int = 8 # px
+VELOCITY_QUANTUM : float = 50 # px/s
+MAX_STATES : int = 20000 # distinct quantized states expanded per level before the search gives up
+PLATFORM_DROP : int = 2 # px below the Player's feet a searched platform is placed
+LEFT_KEY : int = pygame.K_a
+RIGHT_KEY : int = pygame.K_d
+JUMP_KEY : int = pygame.K_SPACE
+# (direction, jump, place a platform), platforms are only tried in the air where they can be landed on
+ACTIONS : list[tuple[int, bool, bool]] = [(direction, jump, platform) for platform in (False, True) for jump in (False, True)
+                                          for direction in (-1, 0, 1)]
+
+class ReachabilityAnalyzer:
+    """
+    Search over what a Player can do on a level. Each searched input is held for ACTION_TICKS ticks from a restored
+    Player snapshot, through Player.move itself, so the search follows whatever the physics and platform rules
+    currently are. States are deduplicated on quantized position, velocity, on-ground, whether a jump is still
+    available and platforms available. States nearest the goal are expanded first, without a goal it is breadth first.
+    Inputs that run into a hazard lead nowhere, the game would send the Player back.
+    """
+    # Attributes
+    level : Level
+    player : Player
+    goal : pygame.Rect | None
+    dt : float
+    _max_states : int
+    _hazards : bool
+    _cells : set[tuple[int, int]] # cells the Player's centre passed through
+
+    # Magic Methods
+    def __init__(self, level_data : str, assets : ImageLoader = None, goal : pygame.Rect = None, dt : float = SIMULATION_DT,
+                 max_states : int = MAX_STATES):
+        """
+        :param level_data: str
+        :param assets: ImageLoader, a lazy one is made if None
+        :param goal: pygame.Rect, world space, defaults to the level's own goal
+        :param dt: float
+        :param max_states: int
+        """
+        assets = assets if assets is not None else ImageLoader(lazy=True)
+        self.level = Level(level_data=level_data, assets=assets)
+        self.player = Player(pos=self.level.start_pos, assets=assets)
+        self.player.set_bounds(self.level.world_rect)
+        self.player.set_collider(self.level.collider)
+        self.goal = goal if goal is not None else self.level.goal
+        self.dt = dt
+        self._max_states = max_states
+        self._hazards = any(trigger.kind == HAZARD for trigger in self.level.triggers)
+        self._cells = set()
+
+    # Accessors/Setters
+    @property
+    def cells(self) -> list[tuple[int, int]]: return sorted(self._cells)
+
+    # Methods
+    def state_key(self, state : dict[str, object]) -> tuple:
+        """
+        The quantized state the Player is in
+        :param state: dict[str, object], Player.save_state() of it as it is now
+        :return tuple
+        """
+        vel_x, vel_y = self.player.vel
+        return (state["rect"][0] // POSITION_QUANTUM, state["rect"][1] // POSITION_QUANTUM, round(vel_x / VELOCITY_QUANTUM),
+                round(vel_y / VELOCITY_QUANTUM), state["on_ground"], state["coyote_time"] > 0,
+                state["max_platforms"] - len(state["platforms"]))
+
+    def apply(self, action : tuple[int, bool, bool], tick : int) -> tuple[list[tuple[int, str, object]], int | None, bool]:
+        """
+        Holds action for ACTION_TICKS ticks from the Player's current state
+        :param action: tuple[int, bool, bool], (direction, jump, place a platform)
+        :param tick: int, tick the action starts on, for the steps it returns
+        :return tuple: the ScriptedInput steps that play the action back, the tick the goal was reached on, if it was,
+                       and whether the Player kept clear of hazards
+        """
+        direction, jump, platform = action
+        steps : list[tuple[int, str, object]] = [(tick, PRESS if held else RELEASE, key)
+                                                 for key, held in ((LEFT_KEY, direction < 0), (RIGHT_KEY, direction > 0), (JUMP_KEY, jump))]
+        if platform: steps.append((tick, CLICK, ((self.player.rect.centerx, self.player.rect.bottom + PLATFORM_DROP), 1)))
+        for event in ScriptedInput(steps).events_for(tick): self.player.handle_input(event)
+
+        player : Player = self.player
+        for i in range(ACTION_TICKS):
+            player.move(dt=self.dt, blocks=self.level.find_near_blocks(player, self.dt))
+            self._cells.add((player.rect.centerx // CELL_SIZE, player.rect.centery // CELL_SIZE))
+            if self.goal is not None and player.rect.colliderect(self.goal): return steps, tick + i + 1, True
+            if self._hazards and self._in_hazard(player.rect): return steps, None, False
+        return steps, None, True
+
+    def search(self) -> dict[str, object]:
+        """
+        Searches from the level's start until the goal is reached, every state is explored or max_states is hit
+        :return dict[str, object]: whether the goal was reached, the witness steps (ScriptedInput) and ticks it takes,
+                                   the states expanded, whether the search ran out of states and the reachable cells
+        """
+        player : Player = self.player
+        start : dict[str, object] = player.save_state()
+        # Per state: parent index, steps from the parent, snapshot (dropped once expanded), ticks from the start
+        nodes : list[list] = [[-1, [], start, 0]]
+        visited : set[tuple] = {self.state_key(start)}
+        frontier : list[tuple[int, int, int]] = [(self._distance(player.rect), 0, 0)] # (distance to the goal, ticks, node)
+        witness : list[tuple[int, str, object]] | None = None
+        witness_ticks : int = 0
+        expanded : int = 0
+
+        while frontier and witness is None and expanded < self._max_states:
+            _, _, index = heapq.heappop(frontier)
+            node : list = nodes[index]
+            snapshot, tick = node[2], node[3]
+            node[2] = None
+            expanded += 1
+            for action in ACTIONS:
+                if action[2] and snapshot["on_ground"]: continue
+                player.load_state(snapshot)
+                steps, reached, survived = self.apply(action, tick)
+                if reached is not None:
+                    witness, witness_ticks = self._path(nodes, index) + steps, reached
+                    break
+                if not survived: continue
+                state : dict[str, object] = player.save_state()
+                key : tuple = self.state_key(state)
+                if key in visited: continue
+                visited.add(key)
+                nodes.append([index, steps, state, tick + ACTION_TICKS])
+                heapq.heappush(frontier, (self._distance(player.rect), tick + ACTION_TICKS, len(nodes) - 1))
+
+        return {"reached": witness is not None, "witness": witness or [], "ticks": witness_ticks, "states": expanded,
+                "exhausted": not frontier and witness is None, "cells": self.cells}
+
+    def _distance(self, rect : pygame.Rect) -> int:
+        if self.goal is None: return 0
+        dx : int = max(self.goal.left - rect.right, rect.left - self.goal.right, 0)
+        dy : int = max(self.goal.top - rect.bottom, rect.top - self.goal.bottom, 0)
+        return (dx + dy) // POSITION_QUANTUM
+
+    def _in_hazard(self, rect : pygame.Rect) -> bool:
+        return any(trigger.kind == HAZARD for trigger in self.level.trigger_index.query(rect))
+
+    def _path(self, nodes : list[list], index : int) -> list[tuple[int, str, object]]:
+        path : list[list[tuple[int, str, object]]] = []
+        while index > 0:
+            path.append(nodes[index][1])
+            index = nodes[index][0]
+        return [step for steps in reversed(path) for step in steps]
+
+# Helpers
+def verify_witness(level_data : str, steps : list[tuple[int, str, object]], goal : pygame.Rect, ticks : int,
+                   dt : float = SIMULATION_DT, assets : ImageLoader = None) -> bool:
+    """
+    Plays witness steps through a fresh Simulation, the way a recorded game would be, and checks they reach the goal
+    :return bool
+    """
+    simulation : Simulation = Simulation(level_data=level_data, assets=assets if assets is not None else ImageLoader(lazy=True),
+                                         dt=dt, inputs=ScriptedInput(steps))
+    for _ in range(ticks):
+        simulation.step()
+        if simulation.player.rect.colliderect(goal): return True
+    return False
+
+def analyze_level(level_data : str, goal : tuple[int, int, int, int] = None, max_states : int = MAX_STATES,
+                  dt : float = SIMULATION_DT) -> dict[str, object]:
+    """
+    Searches one level and verifies the witness found, if any
+    :param level_data: str
+    :param goal: tuple[int, int, int, int], world space (x, y, width, height), defaults to the level's own goal
+    :param max_states: int
+    :param dt: float
+    :return dict[str, object]: ReachabilityAnalyzer.search() plus the level, goal, whether the witness replays and seconds taken
+    """
+    start : float = time.perf_counter()
+    assets : ImageLoader = ImageLoader(lazy=True)
+    analyzer : ReachabilityAnalyzer = ReachabilityAnalyzer(level_data, assets=assets, goal=pygame.Rect(goal) if goal else None,
+                                                           dt=dt, max_states=max_states)
+    result : dict[str, object] = analyzer.search()
+    result["verified"] = result["reached"] and verify_witness(level_data, result["witness"], analyzer.goal, result["ticks"], dt, assets)
+    result["level"] = level_data
+    result["goal"] = tuple(analyzer.goal) if analyzer.goal is not None else None
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+def analyze_batch(levels : list[str], goal : tuple[int, int, int, int] = None, workers : int = None, max_states : int = MAX_STATES,
+                  dt : float = SIMULATION_DT) -> list[dict[str, object]]:
+    """
+    Runs analyze_level on every level, one level per task across worker processes
+    :param levels: list[str]
+    :param goal: tuple[int, int, int, int], world space, overrides every level's own goal
+    :param workers: int, None uses every core
+    :param max_states: int
+    :param dt: float
+    :return list[dict[str, object]]: in the order of levels
+    """
+    if not levels: return []
+    workers = min(workers or os.cpu_count() or 1, len(levels))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(analyze_level, levels, [goal] * len(levels), [max_states] * len(levels), [dt] * len(levels)))
+
+def main():
+    parser : argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("levels", nargs="+", help="level files, JSON or compiled")
+    parser.add_argument("--goal", type=int, nargs=4, metavar=("X", "Y", "WIDTH", "HEIGHT"), default=None, help="goal area in cells")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, every core by default")
+    parser.add_argument("--max-states", type=int, default=MAX_STATES, help="states expanded per level before giving up")
+    parser.add_argument("--out", default="", help="write every result, witness and reachable cells included, here as JSON")
+    args = parser.parse_args()
+
+    goal : tuple[int, int, int, int] | None = tuple(value * CELL_SIZE for value in args.goal) if args.goal else None
+    start : float = time.perf_counter()
+    results : list[dict[str, object]] = analyze_batch(args.levels, goal=goal, workers=args.workers, max_states=args.max_states)
+    for result in results:
+        if result["goal"] is None: outcome = "no goal"
+        elif result["reached"]:
+            outcome = f"goal reached in {result['ticks']} ticks ({result['ticks'] * SIMULATION_DT:.1f} s of play), witness " \
+                      f"{'replays' if result['verified'] else 'does NOT replay'}"
+        else: outcome = "goal unreachable" if result["exhausted"] else "goal not found within the state limit"
+        print(f"{result['level']}: {outcome}, {result['states']} states, {len(result['cells'])} cells reachable, {result['seconds']:.1f} s")
+    print(f"{len(results)} levels in {time.perf_counter() - start:.1f} s")
+    if args.out:
+        with open(args.out, "w") as file: json.dump(results, file)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Plays a recorded input log back headless and reports where the Player ended up.
+Run from the repository root:
+    python -m game_objects.other.replay run.jpin
+    python -m game_objects.other.replay run.jpin --seek 3600
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import time
+from utility.image_loader import ImageLoader
+from utility.input_log import InputLog
+from utility.game_constants import SIMULATION_DT
+from game_objects.entities.player import INPUT_KEYS
+from game_objects.other.simulation import Simulation
+
+# Replay Constants
+SNAPSHOT_INTERVAL : int = 600 # ticks between full snapshots
+
+# Helpers
+def load_input_log(path : str) -> InputLog: return InputLog.load(path, INPUT_KEYS)
+
+class Replay:
+    """
+    Feeds an InputLog through a Simulation one recorded tick at a time, with no window and no frame cap.
+    A full snapshot is kept every snapshot_interval ticks played, so seek() resumes from the nearest one
+    instead of simulating again from tick 0.
+    """
+    # Attributes
+    log : InputLog
+    simulation : Simulation
+    _snapshot_interval : int
+    _snapshots : dict[int, dict[str, object]]
+
+    # Magic Methods
+    def __init__(self, log : InputLog, assets : ImageLoader = None, snapshot_interval : int = SNAPSHOT_INTERVAL, level_data : str = ""):
+        """
+        :param log: InputLog
+        :param assets: ImageLoader, a lazy one is made if None
+        :param snapshot_interval: int
+        :param level_data: str, overrides the level path stored in the log
+        """
+        self.log = log
+        self.simulation = Simulation(level_data=level_data or log.level_data, assets=assets if assets is not None else ImageLoader(lazy=True),
+                                     dt=log.dt or SIMULATION_DT, inputs=log)
+        self._snapshot_interval = snapshot_interval
+        self._snapshots = {0: self.simulation.save_state()}
+
+    # Accessors/Setters
+    @property
+    def tick(self) -> int: return self.simulation.tick
+
+    @property
+    def finished(self) -> bool: return self.simulation.tick >= len(self.log)
+
+    @property
+    def snapshots(self) -> list[int]: return sorted(self._snapshots)
+
+    # Methods
+    def step(self):
+        if self.finished: return
+        self.simulation.step(self.log.dt_for(self.simulation.tick))
+        if self.simulation.tick % self._snapshot_interval == 0 and self.simulation.tick not in self._snapshots:
+            self._snapshots[self.simulation.tick] = self.simulation.save_state()
+
+    def run(self, ticks : int = None):
+        """
+        Plays ticks more ticks, or the rest of the log
+        :param ticks: int
+        """
+        end : int = len(self.log) if ticks is None else min(self.simulation.tick + ticks, len(self.log))
+        while self.simulation.tick < end: self.step()
+
+    def seek(self, tick : int):
+        """
+        Puts the game at the start of tick, loading the nearest earlier snapshot unless playing on from here is shorter
+        :param tick: int
+        """
+        tick = max(0, min(tick, len(self.log)))
+        nearest : int = max(snapshot for snapshot in self._snapshots if snapshot <= tick)
+        if not nearest <= self.simulation.tick <= tick: self.simulation.load_state(self._snapshots[nearest])
+        while self.simulation.tick < tick: self.step()
+
+def main():
+    parser : argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("log", help="input log recorded by Game")
+    parser.add_argument("--level", default="", help="level to play the log on instead of the one it was recorded on")
+    parser.add_argument("--seek", type=int, default=None, help="stop at this tick instead of the end of the log")
+    args = parser.parse_args()
+
+    log : InputLog = load_input_log(args.log)
+    replay : Replay = Replay(log, level_data=args.level)
+    start : float = time.perf_counter()
+    if args.seek is None: replay.run()
+    else: replay.seek(args.seek)
+    elapsed : float = time.perf_counter() - start
+    played : float = sum(log.dt_for(tick) for tick in range(replay.tick))
+    print(replay.simulation.summary())
+    print(f"{replay.tick} ticks ({played:.1f} s of play) in {elapsed:.2f} s, {played / max(elapsed, 1e-9):.0f}x real time")
+
+if __name__ == "__main__":
+    main()
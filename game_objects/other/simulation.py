@@ -0,0 +1,240 @@
+import os
+import pygame
+from concurrent.futures import ProcessPoolExecutor
+from utility.image_loader import ImageLoader
+from utility.input_log import InputLog, InputRecorder
+from utility.game_constants import SIMULATION_DT, RENDER_SCALE
+from game_objects.other.level import Level
+from game_objects.entities.player import Player
+from game_objects.other.camera import Camera
+from game_objects.other.triggers import TriggerTracker, ENTER
+from game_objects.blocks.trigger import Trigger, GOAL, HAZARD, CHECKPOINT
+
+# Script Constants
+PRESS : str = "press"
+RELEASE : str = "release"
+CLICK : str = "click"
+
+class ScriptedInput:
+    """
+    Stand-in for pygame.event.get(): hands a Simulation the events scripted for each tick.
+    Steps are plain (tick, action, value) tuples so scripts can be sent to worker processes.
+    """
+    # Attributes
+    _steps : dict[int, list[tuple[str, int | tuple[int, int]]]]
+
+    # Magic Methods
+    def __init__(self, steps : list[tuple[int, str, int | tuple[int, int]]] = None):
+        self._steps = {}
+        for tick, action, value in steps or []:
+            self._steps.setdefault(tick, []).append((action, value))
+
+    # Methods
+    def press(self, tick : int, key : int) -> "ScriptedInput":
+        self._steps.setdefault(tick, []).append((PRESS, key))
+        return self
+
+    def release(self, tick : int, key : int) -> "ScriptedInput":
+        self._steps.setdefault(tick, []).append((RELEASE, key))
+        return self
+
+    def click(self, tick : int, pos : tuple[int, int], button : int = 1) -> "ScriptedInput":
+        self._steps.setdefault(tick, []).append((CLICK, (pos, button)))
+        return self
+
+    def events_for(self, tick : int) -> list[pygame.event.Event]:
+        """
+        Builds the events scripted for a tick
+        :param tick: int
+        :return list[pygame.event.Event]
+        """
+        events : list[pygame.event.Event] = []
+        for action, value in self._steps.get(tick, ()):
+            if action == PRESS:
+                events.append(pygame.event.Event(pygame.KEYDOWN, key=value))
+            elif action == RELEASE:
+                events.append(pygame.event.Event(pygame.KEYUP, key=value))
+            elif action == CLICK:
+                pos, button = value
+                events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=button))
+        return events
+
+    def steps(self) -> list[tuple[int, str, int | tuple[int, int]]]:
+        return [(tick, action, value) for tick in sorted(self._steps) for action, value in self._steps[tick]]
+
+class Simulation:
+    """
+    Game state advanced by fixed time steps, with no window or event queue needed.
+    Each step reports the Triggers the Player entered, stayed in or left. Hazards put it back at the last checkpoint
+    it entered, or where it started, inside the step, so replays play deaths out the same way.
+    """
+    # Attributes
+    level : Level
+    player : Player
+    camera : Camera
+    triggers : TriggerTracker
+    events : list[tuple[str, Trigger]] # trigger events of the last step
+    dt : float
+    tick : int
+    _spawn : dict[str, object] # the Player as it started
+    _checkpoint : Trigger | None
+    _inputs : ScriptedInput | InputLog | None
+    _recorder : InputRecorder | None
+
+    # Magic Methods
+    def __init__(self, level_data : str, assets : ImageLoader, dt : float = SIMULATION_DT, inputs : ScriptedInput | InputLog = None,
+                 recorder : InputRecorder = None, data : dict = None, render_scale : int = RENDER_SCALE):
+        self.level = Level(level_data=level_data, assets=assets, data=data, render_scale=render_scale)
+        self.player = Player(pos=self.level.start_pos, assets=assets)
+        self.player.set_bounds(self.level.world_rect)
+        self.player.set_collider(self.level.collider)
+        self._spawn = self.player.save_state()
+        self._checkpoint = None
+        self.triggers = TriggerTracker(self.level.trigger_index)
+        self.events = []
+        self.camera = Camera(world=self.level.world_rect)
+        self.camera.follow(self.player.rect)
+        self.level.stream(self.camera.view)
+        self.dt = dt
+        self.tick = 0
+        self._inputs = inputs
+        self._recorder = recorder
+
+    # Accessors/Setters
+    @property
+    def time(self) -> float: return self.tick * self.dt
+
+    @property
+    def recorder(self) -> InputRecorder | None: return self._recorder
+
+    def set_recorder(self, recorder : InputRecorder | None): self._recorder = recorder
+
+    @property
+    def goal_reached(self) -> bool: return any(event == ENTER and trigger.kind == GOAL for event, trigger in self.events)
+
+    @property
+    def checkpoint(self) -> Trigger | None: return self._checkpoint
+
+    # Methods
+    def handle_event(self, event : pygame.event.Event):
+        if self._recorder is not None and event.type == pygame.MOUSEBUTTONDOWN: self._recorder.click(self.tick, event.pos, event.button)
+        self.player.handle_input(event)
+
+    def step(self, dt : float = None):
+        """
+        Advances the game by one tick, feeding in scripted input for that tick first.
+        :param dt: float, defaults to the fixed step
+        """
+        if dt is None: dt = self.dt
+        if self._inputs is not None:
+            for event in self._inputs.events_for(self.tick):
+                self.handle_event(event)
+        if self._recorder is not None: self._recorder.record(self.player.input_bits, dt)
+        self.player.move(dt=dt, blocks=self.level.find_near_blocks(self.player, dt))
+        self._handle_triggers()
+        self.camera.follow(self.player.rect)
+        self.level.stream(self.camera.view)
+        self.tick += 1
+
+    def run(self, ticks : int):
+        for _ in range(ticks): self.step()
+
+    def summary(self) -> dict[str, object]:
+        return {"tick": self.tick, "pos": tuple(self.player.rect.topleft), "vel": self.player.vel}
+
+    def save_state(self) -> dict[str, object]:
+        """
+        A full snapshot of the game at the start of the current tick
+        :return dict[str, object]
+        """
+        return {"tick": self.tick, "player": self.player.save_state(), "level": self.level.save_state(), "camera": self.camera.view.topleft,
+                "triggers": self.triggers.save_state(), "checkpoint": self._checkpoint}
+
+    def load_state(self, state : dict[str, object]):
+        self.player.load_state(state["player"])
+        self._load_world(state)
+
+    def restart(self, state : dict[str, object]):
+        """
+        Goes back to a save_state() taken before any platform was placed, such as the one taken at load.
+        Unlike load_state() the Player's platforms go back to its pool, see Player.respawn
+        :param state: dict[str, object]
+        """
+        self.player.respawn(state["player"])
+        self._load_world(state)
+
+    def _load_world(self, state : dict[str, object]):
+        # Everything load_state() restores but the Player
+        self.tick = state["tick"]
+        self.level.load_state(state["level"])
+        self.camera.view.topleft = state["camera"]
+        self.triggers.load_state(state["triggers"])
+        self._checkpoint = state["checkpoint"]
+        self.events = []
+
+    def _handle_triggers(self):
+        self.events = self.triggers.update(self.player.rect)
+        for event, trigger in self.events:
+            if event != ENTER: continue
+            if trigger.kind == CHECKPOINT: self._checkpoint = trigger
+            elif trigger.kind == HAZARD:
+                self._respawn()
+                self.events = self.events + self.triggers.update(self.player.rect)
+                return
+
+    def _respawn(self):
+        """
+        Puts the Player back at the last checkpoint entered, or where it started, still holding the keys held now
+        """
+        self.player.respawn({**self._spawn, "input_map": self.player.save_state()["input_map"]})
+        if self._checkpoint is not None: self.player.place(self._checkpoint.spawn_pos(self.player.width, self.player.height))
+
+class BatchRunner:
+    """
+    Steps many independent Simulations in one process, sharing one ImageLoader.
+    """
+    # Attributes
+    assets : ImageLoader
+    simulations : list[Simulation]
+
+    # Magic Methods
+    def __init__(self, assets : ImageLoader = None):
+        self.assets = assets if assets is not None else ImageLoader()
+        self.simulations = []
+
+    # Methods
+    def add(self, level_data : str, inputs : ScriptedInput = None, dt : float = SIMULATION_DT) -> Simulation:
+        simulation : Simulation = Simulation(level_data=level_data, assets=self.assets, dt=dt, inputs=inputs)
+        self.simulations.append(simulation)
+        return simulation
+
+    def run(self, ticks : int) -> list[dict[str, object]]:
+        for simulation in self.simulations: simulation.run(ticks)
+        return [simulation.summary() for simulation in self.simulations]
+
+# Helpers
+def _run_chunk(jobs : list[tuple[str, list[tuple[int, str, int | tuple[int, int]]]]], ticks : int, dt : float) -> list[dict[str, object]]:
+    runner : BatchRunner = BatchRunner()
+    for level_data, steps in jobs: runner.add(level_data=level_data, inputs=ScriptedInput(steps), dt=dt)
+    return runner.run(ticks)
+
+def run_batch(jobs : list[tuple[str, ScriptedInput]], ticks : int, workers : int = None,
+              dt : float = SIMULATION_DT) -> list[dict[str, object]]:
+    """
+    Runs every (level_data, inputs) job for ticks steps, spread across worker processes.
+    :param jobs: list[tuple[str, ScriptedInput]]
+    :param ticks: int
+    :param workers: int, None uses every core
+    :param dt: float
+    :return list[dict[str, object]]: Simulation.summary() of each job, in order
+    """
+    if not jobs: return []
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunk_size : int = -(-len(jobs) // workers)
+        chunks : list[list[tuple[str, list]]] = [[(level_data, inputs.steps()) for level_data, inputs in jobs[i:i + chunk_size]]
+                                                 for i in range(0, len(jobs), chunk_size)]
+        results : list[dict[str, object]] = []
+        for summaries in executor.map(_run_chunk, chunks, [ticks] * len(chunks), [dt] * len(chunks)):
+            results.extend(summaries)
+    return results
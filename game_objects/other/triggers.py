@@ -0,0 +1,59 @@
+import pygame
+from utility.spatial_hash import SpatialHash
+from game_objects.blocks.trigger import Trigger
+
+# Event Constants
+ENTER : str = "enter"
+STAY : str = "stay"
+EXIT : str = "exit"
+
+class TriggerTracker:
+    """
+    Which of a level's Triggers an entity is inside. The triggers are looked up in the level's trigger index only when
+    the cells the entity covers change, so a tick costs the same however many triggers the level has, and a tick the
+    footprint didn't change on reports nothing. Each change reports what was left, stayed in and entered, in that order.
+    Triggers are whole cells, so sharing a cell with one is the same as overlapping it.
+    """
+    # Attributes
+    _index : SpatialHash
+    _footprint : tuple[range, range] | None
+    _inside : list[Trigger]
+
+    # Magic Methods
+    def __init__(self, index : SpatialHash):
+        """
+        :param index: SpatialHash, of the level's Triggers
+        """
+        self._index = index
+        self._footprint = None
+        self._inside = []
+
+    # Accessors/Setters
+    @property
+    def inside(self) -> list[Trigger]: return list(self._inside)
+
+    # Methods
+    def update(self, rect : pygame.Rect) -> list[tuple[str, Trigger]]:
+        """
+        Moves the tracked entity to rect
+        :param rect: pygame.Rect, world space
+        :return list[tuple[str, Trigger]]: (ENTER, STAY or EXIT, trigger) events, empty unless the footprint changed
+        """
+        footprint : tuple[range, range] = self._index.cells_for(rect)
+        if footprint == self._footprint: return []
+        self._footprint = footprint
+        inside : list[Trigger] = self._index.query(rect) if len(self._index) else []
+        if not inside and not self._inside: return []
+        was_inside : set[Trigger] = set(self._inside)
+        now_inside : set[Trigger] = set(inside)
+        events : list[tuple[str, Trigger]] = [(EXIT, trigger) for trigger in self._inside if trigger not in now_inside]
+        events.extend((STAY if trigger in was_inside else ENTER, trigger) for trigger in inside)
+        self._inside = inside
+        return events
+
+    def save_state(self) -> tuple[tuple[range, range] | None, list[Trigger]]:
+        return self._footprint, list(self._inside)
+
+    def load_state(self, state : tuple[tuple[range, range] | None, list[Trigger]]):
+        self._footprint, inside = state
+        self._inside = list(inside)
@@ -1,7 +1,19 @@
+import argparse
+from utility.game_constants import RENDER_SCALE, UPSCALE_FILTER, FPS
 from game_objects.other.game import Game, GameState
 
 if __name__ == "__main__":
-    game : Game = Game()
+    parser : argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--record", default="", help="save this session's input logs here, one per attempt numbered before the extension, for game_objects.other.replay")
+    parser.add_argument("--profile", default="", help="time every frame phase and save a Chrome trace here on quit")
+    parser.add_argument("--scale", type=int, default=RENDER_SCALE, help="draw the world at 1/scale resolution and upscale it once per frame")
+    parser.add_argument("--upscale", choices=("integer", "scale2x"), default=UPSCALE_FILTER, help="filter used to upscale the world")
+    parser.add_argument("--levels", nargs="+", default=None, help="levels to play in order, by name under assets/levels (compiled when up to date) or by .json/.jplv path")
+    parser.add_argument("--fps", type=int, default=FPS, help="frames drawn per second at most, 0 for uncapped, the simulation always ticks at TICK_RATE")
+    parser.add_argument("--no-interpolation", action="store_true", help="draw sprites where the last tick left them")
+    args = parser.parse_args()
+    game : Game = Game(record_path=args.record, profile_path=args.profile, render_scale=args.scale, upscale=args.upscale, levels=args.levels,
+                       frame_rate=args.fps, interpolation=not args.no_interpolation)
     running : bool = True
     while running:
         state : GameState = game.run()
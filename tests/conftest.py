@@ -0,0 +1,53 @@
+import os
+import sys
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import pytest
+
+# Tests import from and load assets relative to the repository root, like the game
+ROOT : str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path: sys.path.insert(0, ROOT)
+
+from utility.image_loader import ImageLoader
+from benchmarks.level_generator import write_level
+
+# Test Constants
+LEVEL_BLOCKS : int = 400
+LEVEL_SEED : int = 1
+
+@pytest.fixture(scope="session", autouse=True)
+def game_root():
+    cwd : str = os.getcwd()
+    os.chdir(ROOT)
+    pygame.init()
+    yield
+    pygame.quit()
+    os.chdir(cwd)
+
+@pytest.fixture(scope="session")
+def assets(game_root) -> ImageLoader:
+    return ImageLoader(lazy=True)
+
+@pytest.fixture(scope="session")
+def level_path(tmp_path_factory) -> str:
+    """
+    A synthetic JSON level, see benchmarks.level_generator
+    """
+    return write_level(str(tmp_path_factory.mktemp("levels") / "synthetic.json"), LEVEL_BLOCKS, LEVEL_SEED)
+
+@pytest.fixture
+def make_game(level_path):
+    """
+    Makes windowed Games playing the synthetic level with uncapped frames, pygame is brought back after they go
+    """
+    from game_objects.other.game import Game
+    games : list[Game] = []
+    def make(**kwargs) -> Game:
+        games.append(Game(levels=[level_path], frame_rate=0, **kwargs))
+        return games[-1]
+    yield make
+    for game in games: game.levels.close()
+    games.clear() # Game quits pygame once it goes
+    pygame.init()
@@ -0,0 +1,49 @@
+import pygame
+import pytest
+from utility.collision import TerrainCollider
+from utility.game_constants import CELL_SIZE
+from game_objects.blocks.block import Block
+from game_objects.entities.player import Player
+
+# Test Constants
+LARGE_DT : float = 0.25 # s, a move covers several times a block's size
+FLOOR_Y : int = 600 # px
+
+def thin_block(x : int, y : int, width : int, height : int) -> Block:
+    return Block(pos=(x, y), width=width, height=height, image=pygame.Surface((CELL_SIZE, CELL_SIZE)))
+
+@pytest.mark.parametrize("pixel_collision", [False, True])
+def test_no_tunnelling_when_falling(assets, pixel_collision):
+    player : Player = Player(pos=(400, 0), assets=assets)
+    player.set_pixel_collision(pixel_collision)
+    floor : Block = thin_block(0, FLOOR_Y, 1280, CELL_SIZE)
+    for _ in range(12):
+        player.move(LARGE_DT, [floor])
+        assert player.rect.bottom <= floor.rect.top
+    assert player.rect.bottom >= floor.rect.top - 1 # came to rest on it instead of hanging above
+
+@pytest.mark.parametrize("pixel_collision", [False, True])
+def test_no_tunnelling_when_running(assets, pixel_collision):
+    floor : Block = thin_block(0, FLOOR_Y, 1280, CELL_SIZE)
+    player : Player = Player(pos=(100, FLOOR_Y - 48), assets=assets)
+    player.set_pixel_collision(pixel_collision)
+    wall : Block = thin_block(400, FLOOR_Y - 4 * CELL_SIZE, CELL_SIZE, 4 * CELL_SIZE)
+    player.handle_input(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_d))
+    for _ in range(12):
+        player.move(LARGE_DT, [floor, wall])
+        assert player.rect.right <= wall.rect.left
+    assert player.rect.right >= wall.rect.left - 1
+
+def test_falling_platforms_land_on_terrain(assets):
+    floor : Block = thin_block(0, FLOOR_Y, 1280, CELL_SIZE)
+    player : Player = Player(pos=(400, 0), assets=assets)
+    player.set_collider(lambda rect: TerrainCollider.from_blocks([floor]))
+    player.add_platform((424, 200))
+    platform = next(iter(player._platforms))
+    player.place((platform.rect.x, platform.rect.top - player.rect.height - 2)) # drops it by landing on it
+    for _ in range(120):
+        player.move(1 / 60, [floor])
+        assert platform.rect.bottom <= floor.rect.top
+        if not platform.alive(): break
+    assert not platform.alive() # broke on the floor instead of falling on through it
+    assert platform.rect.bottom >= floor.rect.top - 1
@@ -0,0 +1,34 @@
+import pygame
+from utility.game_constants import GRAVITY_ACC
+from game_objects.entities.entity import Entity
+from game_objects.entities.entity_store import EntityStore
+
+# Test Constants
+DT : float = 1 / 60 # s
+
+def entity(store : EntityStore, pos : tuple[int, int]) -> Entity:
+    return Entity(pos=pos, width=16, height=16, image=pygame.Surface((16, 16)), store=store)
+
+def test_entity_velocity_is_a_view_into_its_row():
+    store : EntityStore = EntityStore()
+    first, second = entity(store, (0, 0)), entity(store, (100, 0))
+    first._vel_x = 120.0
+    assert store.vel[first.index, 0] == 120.0
+    store.vel[second.index, 1] = -60.0
+    assert second.vel == (0.0, -60.0)
+
+def test_entities_sharing_a_store_step_together():
+    store : EntityStore = EntityStore()
+    entities : list[Entity] = [entity(store, (32 * i, 0)) for i in range(5)]
+    store.step(DT)
+    for i, moved in enumerate(entities):
+        moved.sync()
+        assert moved.vel[1] == GRAVITY_ACC * DT
+        assert moved.rect.topleft == (32 * i, int(GRAVITY_ACC * DT * DT))
+
+def test_view_survives_the_store_growing():
+    store : EntityStore = EntityStore(capacity=1)
+    first : Entity = entity(store, (0, 0))
+    first._vel_x = 50.0
+    entity(store, (0, 0)) # reallocates the arrays
+    assert first.vel == (50.0, 0.0)
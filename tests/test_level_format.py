@@ -0,0 +1,43 @@
+import os
+import shutil
+import game_objects.other.game as game
+from utility.level_format import CompiledLevel
+from game_objects.other.level import Level, read_level_data, merge_terrain, split_into_chunks, terrain_key
+from game_objects.other.level_compiler import compile_level
+
+def normalized(chunks : dict) -> dict:
+    return {pos: sorted((kind, x, y, width, height, sorted(map(tuple, members))) for kind, x, y, width, height, members in rects)
+            for pos, rects in chunks.items()}
+
+def terrain_of(level : Level) -> list[tuple]:
+    level.stream(level.world_rect)
+    return sorted((tuple(block.rect), tuple(block.passthrough.values())) for block in level.terrain)
+
+def test_compiled_chunks_match_json(level_path, tmp_path):
+    compiled_path : str = compile_level(level_path, str(tmp_path / "synthetic.jplv"))
+    expected : dict = normalized(split_into_chunks(merge_terrain(read_level_data(level_path)[terrain_key])))
+    with CompiledLevel(compiled_path) as compiled:
+        chunks : dict = {pos: compiled.chunk_rects(*span) for pos, span in compiled.chunks().items()}
+    assert normalized(chunks) == expected
+
+def test_compiled_level_loads_same_terrain(level_path, tmp_path, assets):
+    compiled_path : str = compile_level(level_path, str(tmp_path / "synthetic.jplv"))
+    json_level : Level = Level(level_path, assets)
+    compiled_level : Level = Level(compiled_path, assets)
+    try:
+        assert (compiled_level.name, tuple(compiled_level.start_pos)) == (json_level.name, tuple(json_level.start_pos))
+        assert compiled_level.world_rect == json_level.world_rect
+        assert terrain_of(compiled_level) == terrain_of(json_level)
+        assert compiled_level.loaded_chunks == json_level.loaded_chunks
+    finally:
+        compiled_level.close()
+
+def test_named_levels_prefer_an_up_to_date_compiled_copy(level_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(game, "LEVEL_DATA_BASE_PATH", str(tmp_path))
+    source : str = shutil.copy(level_path, tmp_path / "named.json")
+    assert game.get_level_data("named") == str(source)
+    compiled : str = compile_level(str(source))
+    assert game.get_level_data("named") == compiled
+    os.utime(source, (os.path.getmtime(compiled) + 10,) * 2) # edited after compiling
+    assert game.get_level_data("named") == str(source)
+    assert game.get_level_data(compiled) == compiled # paths are used as given
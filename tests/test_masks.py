@@ -0,0 +1,18 @@
+import pygame
+import pytest
+from game_objects.entities.player import mirror_frame, HOP_ANIMATION, IDLE_ANIMATION
+
+@pytest.fixture(params=[False, True], ids=["headless", "window"])
+def display(request):
+    if request.param: pygame.display.set_mode((64, 64))
+    yield request.param
+    if request.param: pygame.display.quit()
+
+@pytest.mark.parametrize("animation", [HOP_ANIMATION, IDLE_ANIMATION])
+def test_left_masks_mirror_right_masks(assets, display, animation):
+    for frame in assets.get_animation(animation):
+        right_image, right_mask, left_image, left_mask = mirror_frame(frame)
+        width, height = right_mask.get_size()
+        assert left_mask.get_size() == (width, height)
+        assert 0 < left_mask.count() == right_mask.count() < width * height
+        assert all(left_mask.get_at((width - 1 - x, y)) == right_mask.get_at((x, y)) for x in range(width) for y in range(height))
@@ -0,0 +1,46 @@
+import pygame
+import pytest
+import game_objects.blocks.platform as platform_module
+from utility.collision import TerrainCollider
+from utility.game_constants import CELL_SIZE
+from game_objects.blocks.block import Block
+from game_objects.entities.player import Player, MAX_PLATFORMS, PLATFORM_POOL_SPARE
+
+# Test Constants
+DT : float = 1 / 60 # s
+TICKS : int = 600
+FLOOR_Y : int = 600 # px
+
+@pytest.fixture
+def made(monkeypatch) -> list[int]:
+    """
+    Counts Platforms constructed while the test runs
+    """
+    count : list[int] = [0]
+    init = platform_module.Platform.__init__
+    def counting_init(self, *args, **kwargs):
+        count[0] += 1
+        init(self, *args, **kwargs)
+    monkeypatch.setattr(platform_module.Platform, "__init__", counting_init)
+    return count
+
+def test_player_warms_its_pool(assets, made):
+    player : Player = Player(pos=(400, 300), assets=assets)
+    assert made[0] == len(player._platform_pool) == MAX_PLATFORMS + PLATFORM_POOL_SPARE
+
+def test_no_platforms_are_made_after_warm_up(assets, made):
+    floor : Block = Block(pos=(0, FLOOR_Y), width=1280, height=CELL_SIZE, image=pygame.Surface((CELL_SIZE, CELL_SIZE)))
+    player : Player = Player(pos=(400, 300), assets=assets)
+    player.set_collider(lambda rect: TerrainCollider.from_blocks([floor]))
+    made[0] = 0
+    placed : int = 0
+    for tick in range(TICKS):
+        # Keep jumping and putting a platform under the Player, which breaks it and drops it onto the floor
+        if tick % 15 == 0 and not player._platforms:
+            player.add_platform((player.rect.centerx, player.rect.bottom + 8))
+            placed += len(player._platforms)
+        if tick % 40 == 0: player.handle_input(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+        elif tick % 40 == 5: player.handle_input(pygame.event.Event(pygame.KEYUP, key=pygame.K_SPACE))
+        player.move(DT, [floor])
+    assert placed > 10
+    assert made[0] == 0
@@ -0,0 +1,17 @@
+import pytest
+from game_objects.other.game import Game, FRAME_PHASE
+
+# Test Constants
+FRAMES : int = 5
+DRAW_PHASE : str = "layers.draw"
+
+@pytest.mark.parametrize("dirty_rendering, render_scale", [(True, 1), (False, 1), (False, 2)])
+def test_every_frame_times_the_draw_game_runs(make_game, tmp_path, dirty_rendering, render_scale):
+    game : Game = make_game(dirty_rendering=dirty_rendering, render_scale=render_scale, profile_path=str(tmp_path / "trace.json"))
+    for _ in range(FRAMES): game.run()
+    records : list[tuple[str, int, int]] = game.profiler.records()
+    frames : list[tuple[int, int]] = [(start, end) for name, start, end in records if name == FRAME_PHASE]
+    draws : list[tuple[int, int]] = [(start, end) for name, start, end in records if name == DRAW_PHASE]
+    assert len(frames) == FRAMES
+    for frame_start, frame_end in frames:
+        assert any(frame_start <= start <= end <= frame_end for start, end in draws)
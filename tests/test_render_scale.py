@@ -0,0 +1,29 @@
+import pygame
+from utility.game_constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from utility.render_layers import WORLD_LAYERS, BACKGROUND_LAYER
+from game_objects.other.level import Level, Chunk
+
+# Test Constants
+SCALE : int = 2
+VIEW : pygame.Rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+
+def framebuffer(level : Level) -> pygame.Surface:
+    surface : pygame.Surface = pygame.Surface((SCREEN_WIDTH // SCALE, SCREEN_HEIGHT // SCALE))
+    level.stream(VIEW)
+    level.layers.draw(surface, VIEW, WORLD_LAYERS, SCALE)
+    return surface
+
+def test_low_resolution_levels_only_make_small_images(level_path, assets):
+    level : Level = Level(level_path, assets, render_scale=SCALE)
+    level.stream(VIEW)
+    assert level.loaded_chunks > 0
+    chunks : list[Chunk] = [sprite for sprite in level.layers.sprites() if isinstance(sprite, Chunk)]
+    assert len(chunks) == level.loaded_chunks
+    for sprite in chunks + level.layers.get_sprites_from_layer(BACKGROUND_LAYER):
+        assert sprite.image.get_size() == (sprite.rect.width // SCALE, sprite.rect.height // SCALE)
+    assert level.static_layer()[0].get_size() == (SCREEN_WIDTH // SCALE, SCREEN_HEIGHT // SCALE)
+
+def test_low_resolution_levels_draw_like_reduced_ones(level_path, assets):
+    small : pygame.Surface = framebuffer(Level(level_path, assets, render_scale=SCALE))
+    reduced : pygame.Surface = framebuffer(Level(level_path, assets, render_scale=1))
+    assert pygame.image.tobytes(small, "RGB") == pygame.image.tobytes(reduced, "RGB")
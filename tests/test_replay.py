@@ -0,0 +1,44 @@
+import pygame
+from utility.input_log import InputRecorder
+from game_objects.entities.player import INPUT_KEYS
+from game_objects.other.simulation import Simulation, ScriptedInput
+from game_objects.other.replay import Replay, load_input_log
+
+# Test Constants
+TICKS : int = 240
+SNAPSHOT_INTERVAL : int = 60
+
+def scripted_run() -> ScriptedInput:
+    return (ScriptedInput().press(0, pygame.K_d).press(30, pygame.K_SPACE).release(45, pygame.K_SPACE)
+            .click(60, (700, 500)).click(75, (760, 450)).release(90, pygame.K_d).press(100, pygame.K_a).press(150, pygame.K_SPACE))
+
+def record(level_path : str, assets, log_path : str) -> list[dict[str, object]]:
+    """
+    Plays the scripted run and saves its input log
+    :return list[dict[str, object]]: Simulation.summary() at the start of every tick and at the end
+    """
+    recorder : InputRecorder = InputRecorder(level_path, INPUT_KEYS)
+    simulation : Simulation = Simulation(level_path, assets, inputs=scripted_run(), recorder=recorder)
+    summaries : list[dict[str, object]] = [simulation.summary()]
+    for _ in range(TICKS):
+        simulation.step()
+        summaries.append(simulation.summary())
+    recorder.save(log_path)
+    return summaries
+
+def test_replay_reproduces_recording(level_path, assets, tmp_path):
+    summaries : list[dict[str, object]] = record(level_path, assets, str(tmp_path / "run.jpin"))
+    replay : Replay = Replay(load_input_log(str(tmp_path / "run.jpin")), assets, snapshot_interval=SNAPSHOT_INTERVAL)
+    replay.run()
+    assert replay.simulation.summary() == summaries[-1]
+
+def test_seek_reproduces_state(level_path, assets, tmp_path):
+    summaries : list[dict[str, object]] = record(level_path, assets, str(tmp_path / "run.jpin"))
+    replay : Replay = Replay(load_input_log(str(tmp_path / "run.jpin")), assets, snapshot_interval=SNAPSHOT_INTERVAL)
+    replay.run()
+    # Backwards onto a snapshot, between snapshots, forwards again and back to the start
+    for tick in (SNAPSHOT_INTERVAL * 2, 137, 201, 0, 75):
+        replay.seek(tick)
+        assert replay.simulation.summary() == summaries[tick]
+    replay.run()
+    assert replay.simulation.summary() == summaries[-1]
@@ -0,0 +1,45 @@
+from game_objects.blocks.platform import Platform
+from game_objects.entities.player import Player
+from game_objects.other.level_manager import LevelManager
+from game_objects.other.simulation import Simulation
+
+# Test Constants
+PLATFORM_SPOTS : list[tuple[int, int]] = [(100, 100), (300, 100), (500, 100)]
+
+def place_platforms(player : Player) -> set[Platform]:
+    player.set_max_platforms(len(PLATFORM_SPOTS))
+    for pos in PLATFORM_SPOTS: player.add_platform(pos)
+    platforms : set[Platform] = set(player._platform_group)
+    assert len(platforms) == len(PLATFORM_SPOTS)
+    return platforms
+
+def assert_all_pooled(player : Player, platforms : set[Platform]):
+    assert len(player._platform_group) == 0
+    pooled : set[Platform] = set(player._platform_pool._free)
+    assert pooled >= platforms
+    assert len(player._platform_pool.store) == 1 # the Player's own row
+    for pos in PLATFORM_SPOTS: player.add_platform(pos)
+    assert set(player._platform_group) <= pooled # placed again without making any
+
+def test_restart_hands_platforms_back_to_the_pool(level_path, assets):
+    levels : LevelManager = LevelManager([level_path], assets)
+    try:
+        platforms : set[Platform] = place_platforms(levels.simulation.player)
+        levels.simulation.run(30)
+        levels.restart()
+        assert levels.simulation.tick == 0
+        assert levels.simulation.player.rect.topleft == tuple(levels.simulation.level.start_pos)
+        assert_all_pooled(levels.simulation.player, platforms)
+    finally:
+        levels.close()
+
+def test_respawn_hands_platforms_back_to_the_pool(level_path, assets):
+    simulation : Simulation = Simulation(level_path, assets)
+    try:
+        platforms : set[Platform] = place_platforms(simulation.player)
+        simulation.run(30)
+        simulation._respawn()
+        assert simulation.player.rect.topleft == tuple(simulation.level.start_pos)
+        assert_all_pooled(simulation.player, platforms)
+    finally:
+        simulation.level.close()
@@ -0,0 +1,77 @@
+import json
+import pygame
+import pytest
+from utility.game_constants import CELL_SIZE
+from utility.spatial_hash import SpatialHash
+from game_objects.entities.player import Player
+from game_objects.other.level import Level, CHUNK_SIZE
+
+# Test Constants
+LARGE_DT : float = 0.25 # s, the swept rect reaches several cells past the Player
+START : tuple[int, int] = (200, 200) # px, the swept rect crosses into the next chunk right and below
+
+def sprite(x : int, y : int, width : int = CELL_SIZE, height : int = CELL_SIZE) -> pygame.sprite.Sprite:
+    new_sprite : pygame.sprite.Sprite = pygame.sprite.Sprite()
+    new_sprite.rect = pygame.Rect(x, y, width, height)
+    return new_sprite
+
+def test_query_finds_sprites_in_shared_cells():
+    index : SpatialHash = SpatialHash(CELL_SIZE)
+    inside : pygame.sprite.Sprite = sprite(16, 16)
+    wide : pygame.sprite.Sprite = sprite(0, 48, 5 * CELL_SIZE, CELL_SIZE) # spans five cells
+    far : pygame.sprite.Sprite = sprite(320, 320)
+    for new_sprite in (inside, wide, far): index.insert(new_sprite)
+    index.insert(inside) # inserting twice changes nothing
+    assert len(index) == 3
+    assert index.query(pygame.Rect(0, 0, 64, 64)) == [inside, wide]
+    assert index.query(pygame.Rect(70, 50, 1, 1)) == [wide] # found once, from any cell it covers
+    assert index.query(pygame.Rect(0, 0, 16, 16)) == [] # edges are exclusive, touching a cell is not sharing it
+    assert index.query(pygame.Rect(100, 100, 50, 50)) == []
+
+def test_query_keeps_insertion_order():
+    index : SpatialHash = SpatialHash(CELL_SIZE)
+    sprites : list[pygame.sprite.Sprite] = [sprite(x, 0) for x in (64, 0, 32, 16)]
+    for new_sprite in sprites: index.insert(new_sprite)
+    assert index.query(pygame.Rect(0, 0, 80, 16)) == sprites
+
+def test_remove_empties_cells():
+    index : SpatialHash = SpatialHash(CELL_SIZE)
+    wide : pygame.sprite.Sprite = sprite(0, 0, 3 * CELL_SIZE, 2 * CELL_SIZE)
+    small : pygame.sprite.Sprite = sprite(16, 0)
+    index.insert(wide)
+    index.insert(small)
+    index.remove(wide)
+    index.remove(wide) # removing twice changes nothing
+    assert len(index) == 1
+    assert index.query(pygame.Rect(0, 0, 64, 64)) == [small]
+    index.remove(small)
+    assert index.query(pygame.Rect(0, 0, 64, 64)) == []
+    assert index._cells == {}
+
+def test_cells_for_crosses_cell_borders():
+    index : SpatialHash = SpatialHash(CELL_SIZE)
+    assert index.cells_for(pygame.Rect(0, 0, 16, 16)) == (range(0, 1), range(0, 1))
+    assert index.cells_for(pygame.Rect(15, 15, 2, 2)) == (range(0, 2), range(0, 2))
+    assert index.cells_for(pygame.Rect(-1, -17, 2, 1)) == (range(-1, 1), range(-2, -1))
+
+@pytest.fixture
+def swept_level(tmp_path, assets) -> Level:
+    """
+    A level with one cell just inside and one just outside of where a Player at START can reach in LARGE_DT,
+    to the right and below, the inside ones past the chunk border
+    """
+    blocks : list[tuple[int, int]] = [(17, 13), (21, 13), (13, 17), (13, 21)] # cells
+    data : dict = {"level_name": "swept", "start_pos": list(START), "background": "background.png",
+                   "terrain": [{"x": x, "y": y, "kind": 1, "width": 1, "height": 1} for x, y in blocks]}
+    with open(tmp_path / "swept.json", "w") as file: json.dump(data, file)
+    return Level(str(tmp_path / "swept.json"), assets)
+
+def test_find_near_blocks_reaches_across_chunks(swept_level, assets):
+    player : Player = Player(pos=START, assets=assets)
+    swept : pygame.Rect = player.swept_rect(LARGE_DT)
+    assert player.rect.right < CHUNK_SIZE < swept.right and player.rect.bottom < CHUNK_SIZE < swept.bottom
+    assert swept_level.loaded_chunks == 0 # nothing streamed yet, the query loads what it crosses
+    near : set[tuple[int, int]] = {block.pos for block in swept_level.find_near_blocks(player, LARGE_DT)}
+    assert near == {(17, 13), (13, 17)}
+    # A short step stays inside the first chunk
+    assert {block.pos for block in swept_level.find_near_blocks(player, 1 / 60)} == set()
@@ -0,0 +1,50 @@
+import json
+import pygame
+import pytest
+import game_objects.other.level as level_module
+from utility.game_constants import CELL_SIZE
+from game_objects.other.level import Level, Chunk, merge_terrain, CHUNK_SIZE
+from game_objects.other.level_compiler import compile_level
+
+# Test Constants
+# The first merged rect holds only the later, taller block, the wide one it overlaps is drawn in a later rect
+TERRAIN : list[dict] = [{"x": 0, "y": 2, "kind": 1, "width": 4, "height": 1}, {"x": 1, "y": 0, "kind": 1, "width": 2, "height": 3}]
+
+@pytest.fixture
+def striped(monkeypatch) -> pygame.Surface:
+    """
+    Blocks drawn with an image whose top and bottom differ, the real one is a single colour that hides the draw order
+    """
+    image : pygame.Surface = pygame.Surface((2, 2), pygame.SRCALPHA)
+    image.fill((255, 0, 0, 255), pygame.Rect(0, 0, 2, 1))
+    image.fill((0, 0, 255, 255), pygame.Rect(0, 1, 2, 1))
+    monkeypatch.setattr(level_module, "block_image", lambda kind, assets: image if kind == 1 else None)
+    return image
+
+def write(tmp_path, terrain : list[dict]) -> str:
+    data : dict = {"level_name": "merge", "start_pos": [400, 400], "background": "background.png", "terrain": terrain}
+    with open(tmp_path / "merge.json", "w") as file: json.dump(data, file)
+    return str(tmp_path / "merge.json")
+
+def first_chunk(level_data : str, assets) -> Chunk:
+    level : Level = Level(level_data, assets, render_scale=1)
+    level.stream(pygame.Rect(0, 0, CHUNK_SIZE, CHUNK_SIZE))
+    chunk : Chunk = level._chunks[(0, 0)]
+    level.close()
+    return chunk
+
+def test_merge_covers_every_cell_once():
+    merged : list[tuple] = merge_terrain(TERRAIN)
+    cells : list[tuple[int, int]] = [(x, y) for _, rx, ry, width, height, _ in merged for x in range(rx, rx + width) for y in range(ry, ry + height)]
+    assert sorted(cells) == sorted({(x, y) for block in TERRAIN for x in range(block["x"], block["x"] + block["width"])
+                                    for y in range(block["y"], block["y"] + block["height"])})
+    assert [member[4] for member in merged[0][5]] == [1] # the case the bake order has to undo
+
+def test_chunks_draw_blocks_in_level_order(tmp_path, assets, striped):
+    level_data : str = write(tmp_path, TERRAIN)
+    expected : pygame.Surface = pygame.Surface((CHUNK_SIZE, CHUNK_SIZE), pygame.SRCALPHA)
+    for block in TERRAIN:
+        expected.blit(pygame.transform.scale(striped, (block["width"] * CELL_SIZE, block["height"] * CELL_SIZE)),
+                      (block["x"] * CELL_SIZE, block["y"] * CELL_SIZE))
+    for path in (level_data, compile_level(level_data)):
+        assert pygame.image.tobytes(first_chunk(path, assets).image, "RGBA") == pygame.image.tobytes(expected, "RGBA")
@@ -0,0 +1,43 @@
+import pygame
+import pytest
+import utility.tilemap as tilemap_module
+from utility.tilemap import TileMap, MAX_KIND
+
+# Test Constants
+CELL : int = 16 # px
+CACHE_SIZE : int = 8
+
+def make_map() -> TileMap:
+    tilemap : TileMap = TileMap(64, 4, lambda kind, flags, x, y: pygame.sprite.Sprite(), cell_size=CELL)
+    tilemap.fill(0, 0, 64, 1, 1)
+    return tilemap
+
+def cell(x : int) -> pygame.Rect: return pygame.Rect(x * CELL, 0, CELL, CELL)
+
+def test_blocks_in_keeps_recently_used_blocks(monkeypatch):
+    monkeypatch.setattr(tilemap_module, "BLOCK_CACHE_SIZE", CACHE_SIZE)
+    tilemap : TileMap = make_map()
+    hot : pygame.sprite.Sprite = tilemap.blocks_in(cell(0))[0]
+    for x in range(1, 40):
+        tilemap.blocks_in(cell(x))
+        assert tilemap.blocks_in(cell(0))[0] is hot # used every query, so never the one dropped
+    assert len(tilemap._blocks) == CACHE_SIZE
+
+def test_blocks_in_drops_least_recently_used_first(monkeypatch):
+    monkeypatch.setattr(tilemap_module, "BLOCK_CACHE_SIZE", CACHE_SIZE)
+    tilemap : TileMap = make_map()
+    first : list[pygame.sprite.Sprite] = tilemap.blocks_in(pygame.Rect(0, 0, CACHE_SIZE * CELL, CELL))
+    tilemap.blocks_in(cell(CACHE_SIZE))
+    again : list[pygame.sprite.Sprite] = tilemap.blocks_in(pygame.Rect(CELL, 0, (CACHE_SIZE - 1) * CELL, CELL))
+    assert again == first[1:]
+    assert tilemap.blocks_in(cell(0))[0] is not first[0]
+
+@pytest.mark.parametrize("kind", [-1, MAX_KIND + 1, 1000])
+def test_fill_rejects_kinds_that_do_not_fit(kind):
+    with pytest.raises(ValueError):
+        make_map().fill(0, 0, 1, 1, kind)
+
+def test_fill_accepts_the_widest_kind():
+    tilemap : TileMap = make_map()
+    tilemap.fill(2, 1, 1, 1, MAX_KIND)
+    assert tilemap.kind_at(2, 1) == MAX_KIND
@@ -0,0 +1,34 @@
+from utility.game_constants import MAX_SPEED, MAX_TICK_MOVE, SIMULATION_DT
+from game_objects.other.game import Game
+
+def move_player(game : Game, distance : int) -> tuple[int, int]:
+    game._previous = game._positions()
+    start : tuple[int, int] = game.player.rect.topleft
+    game.player.rect.move_ip(distance, -distance)
+    return start
+
+def test_max_tick_move_covers_the_fastest_tick():
+    assert MAX_SPEED * SIMULATION_DT < MAX_TICK_MOVE
+
+def test_fast_movement_is_interpolated(make_game):
+    game : Game = make_game()
+    start : tuple[int, int] = move_player(game, MAX_TICK_MOVE)
+    current : dict[object, tuple[int, int]] = game._interpolate(0.5)
+    assert game.player.rect.topleft == (round(start[0] + MAX_TICK_MOVE / 2), round(start[1] - MAX_TICK_MOVE / 2))
+    game._restore_positions(current)
+    assert game.player.rect.topleft == (start[0] + MAX_TICK_MOVE, start[1] - MAX_TICK_MOVE)
+
+def test_teleports_are_not_interpolated(make_game):
+    game : Game = make_game()
+    start : tuple[int, int] = move_player(game, MAX_TICK_MOVE + 1)
+    game._interpolate(0.5)
+    assert game.player.rect.topleft == (start[0] + MAX_TICK_MOVE + 1, start[1] - MAX_TICK_MOVE - 1)
+
+def test_respawn_is_not_interpolated(make_game):
+    game : Game = make_game()
+    start_pos : tuple[int, int] = game.player.rect.topleft
+    game.player.place((start_pos[0] + 10 * MAX_TICK_MOVE, start_pos[1]))
+    game._previous = game._positions()
+    game.simulation._respawn()
+    game._interpolate(0.5)
+    assert game.player.rect.topleft == tuple(game.level.start_pos)
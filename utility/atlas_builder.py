@@ -0,0 +1,93 @@
+"""
+Packs the images under ./assets, and the animation frames assets/animations.json cuts out of sprite sheets, into a few
+atlas sheets with a JSON index of named rects. ImageLoader hands out views into the sheets once they exist.
+Frames are stored at the size they are drawn, colour key already turned into transparency.
+Run from the repository root after changing any art:
+    python -m utility.atlas_builder
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import pygame
+from utility.image_loader import ASSET_SUB_DIRECTORIES, load_image, cut_frames
+from utility.atlas_format import read_animations, write_atlas_index, pack_rects, image_key, ATLAS_DIRECTORY, ANIMATIONS_PATH, \
+    ATLAS_INDEX_NAME, ATLAS_SHEET_NAME, ATLAS_MAX_SIZE, ATLAS_PADDING, SOURCE_KEY, FRAMES_KEY
+
+# Helpers
+def to_rgba(surface : pygame.Surface) -> pygame.Surface:
+    """
+    A 32 bit copy with per pixel alpha, colour keyed pixels become fully transparent
+    :param surface: pygame.Surface
+    :return pygame.Surface
+    """
+    if surface.get_colorkey() is None: return pygame.image.frombytes(pygame.image.tobytes(surface, "RGBA"), surface.get_size(), "RGBA")
+    rgba : pygame.Surface = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+    rgba.blit(surface, (0, 0))
+    return rgba
+
+def build_atlas(directory : str = ATLAS_DIRECTORY, animations_path : str = ANIMATIONS_PATH, max_size : int = ATLAS_MAX_SIZE,
+                padding : int = ATLAS_PADDING) -> list[str]:
+    """
+    Packs every asset image into atlas sheets and writes them and their index to directory.
+    Images that are only there as animation sources are packed as their frames, not whole.
+    :param directory: str
+    :param animations_path: str
+    :param max_size: int
+    :param padding: int
+    :return list[str]: paths written
+    """
+    animations : dict[str, dict] = read_animations(animations_path)
+    sources : dict[str, pygame.Surface] = {}
+    for category in ASSET_SUB_DIRECTORIES:
+        for name in sorted(os.listdir(f"./assets/{category}")):
+            sources[image_key(category, name)] = load_image(f"./assets/{category}/{name}")
+    sheet_sources : set[str] = {animation[SOURCE_KEY] for animation in animations.values()}
+
+    # Everything packed, named: ("image", key) or ("frame", animation name)
+    entries : list[tuple[str, str]] = []
+    surfaces : list[pygame.Surface] = []
+    for key, image in sources.items():
+        if key in sheet_sources: continue
+        entries.append(("image", key))
+        surfaces.append(to_rgba(image))
+    for name, animation in animations.items():
+        for frame in cut_frames(sources[animation[SOURCE_KEY]], animation):
+            entries.append(("frame", name))
+            surfaces.append(to_rgba(frame))
+
+    placed : list[tuple[int, int, int]] = pack_rects([surface.get_size() for surface in surfaces], max_size, padding)
+    sizes : list[tuple[int, int]] = [(0, 0)] * (max(sheet for sheet, _, _ in placed) + 1 if placed else 0)
+    for (sheet, x, y), surface in zip(placed, surfaces):
+        sizes[sheet] = (max(sizes[sheet][0], x + surface.get_width()), max(sizes[sheet][1], y + surface.get_height()))
+    sheets : list[pygame.Surface] = [pygame.Surface(size, pygame.SRCALPHA) for size in sizes]
+
+    images : dict[str, list[int]] = {}
+    frames : dict[str, dict] = {name: {SOURCE_KEY: animation[SOURCE_KEY], FRAMES_KEY: []} for name, animation in animations.items()}
+    for (kind, name), (sheet, x, y), surface in zip(entries, placed, surfaces):
+        # Max onto the cleared sheet copies the pixels exactly, a normal blit would blend the alpha
+        sheets[sheet].blit(surface, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        rect : list[int] = [sheet, x, y, surface.get_width(), surface.get_height()]
+        if kind == "image": images[name] = rect
+        else: frames[name][FRAMES_KEY].append(rect)
+
+    os.makedirs(directory, exist_ok=True)
+    sheet_names : list[str] = [ATLAS_SHEET_NAME.format(sheet) for sheet in range(len(sheets))]
+    written : list[str] = []
+    for sheet_name, sheet in zip(sheet_names, sheets):
+        pygame.image.save(sheet, os.path.join(directory, sheet_name))
+        written.append(os.path.join(directory, sheet_name))
+    write_atlas_index(directory, sheet_names, images, frames)
+    written.append(os.path.join(directory, ATLAS_INDEX_NAME))
+    return written
+
+def main():
+    parser : argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out-dir", default=ATLAS_DIRECTORY, help="where to write the sheets and their index")
+    parser.add_argument("--max-size", type=int, default=ATLAS_MAX_SIZE, help="widest and tallest a sheet gets, in px")
+    args = parser.parse_args()
+    for path in build_atlas(directory=args.out_dir, max_size=args.max_size): print(path)
+
+if __name__ == "__main__":
+    main()
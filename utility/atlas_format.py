@@ -0,0 +1,93 @@
+import json
+import math
+import os
+
+# Format Constants
+ATLAS_DIRECTORY : str = "./assets/atlas"
+ATLAS_INDEX_NAME : str = "atlas.json"
+ATLAS_SHEET_NAME : str = "atlas_{}.png"
+ANIMATIONS_PATH : str = "./assets/animations.json"
+ATLAS_MAX_SIZE : int = 2048 # px, widest and tallest a sheet gets
+ATLAS_PADDING : int = 1 # px between packed rects
+# Index Keys
+SHEETS_KEY : str = "sheets"
+IMAGES_KEY : str = "images"
+ANIMATIONS_KEY : str = "animations"
+SOURCE_KEY : str = "image"
+FRAMES_KEY : str = "frames"
+# Animation Keys
+AREA_KEY : str = "area"
+STEP_KEY : str = "step"
+COUNT_KEY : str = "count"
+SIZE_KEY : str = "size"
+COLORKEY_KEY : str = "colorkey"
+
+# Helpers
+def image_key(category : str, name : str) -> str: return f"{category}/{name}"
+
+def read_animations(path : str = ANIMATIONS_PATH) -> dict[str, dict]:
+    """
+    Animation definitions: for each name, the sprite sheet image ("category/name") its frames are cut from, the area of
+    frame 0, the step between frames, the frame count and optionally the size they are scaled to and the colour keyed out
+    :param path: str
+    :return dict[str, dict]
+    """
+    if not os.path.exists(path): return {}
+    with open(path, "r") as file:
+        return json.load(file)
+
+def frame_area(animation : dict, frame : int) -> tuple[int, int, int, int]:
+    """
+    (x, y, width, height) of one frame of an animation definition in its sprite sheet
+    :param animation: dict
+    :param frame: int
+    :return tuple[int, int, int, int]
+    """
+    x, y, width, height = animation[AREA_KEY]
+    return x + frame * animation[STEP_KEY], y, width, height
+
+def pack_rects(sizes : list[tuple[int, int]], max_size : int = ATLAS_MAX_SIZE, padding : int = ATLAS_PADDING) -> list[tuple[int, int, int]]:
+    """
+    Shelf-packs rects into as few sheets as it can, tallest first. Shelves are as wide as the power of two
+    that would hold everything in a square, so a single sheet doesn't come out a long strip.
+    :param sizes: list[tuple[int, int]], (width, height)
+    :param max_size: int, widest and tallest a sheet gets
+    :param padding: int
+    :return list[tuple[int, int, int]]: (sheet, x, y) of each size, in the order given
+    """
+    placed : list[tuple[int, int, int]] = [(0, 0, 0)] * len(sizes)
+    if not sizes: return placed
+    area : int = sum((width + padding) * (height + padding) for width, height in sizes)
+    width_limit : int = 1 << math.isqrt(max(0, area - 1)).bit_length()
+    width_limit = min(max_size, max(width_limit, max(width for width, _ in sizes)))
+    sheet : int = 0
+    x : int = 0
+    y : int = 0
+    shelf : int = 0 # height of the current row
+    for i in sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0])):
+        width, height = sizes[i]
+        if width > max_size or height > max_size: raise ValueError(f"pack_rects: {width}x{height} does not fit in {max_size}x{max_size}")
+        if x + width > width_limit: # next shelf
+            x, y, shelf = 0, y + shelf + padding, 0
+        if y + height > max_size: # next sheet
+            sheet, x, y, shelf = sheet + 1, 0, 0, 0
+        placed[i] = (sheet, x, y)
+        x += width + padding
+        shelf = max(shelf, height)
+    return placed
+
+def read_atlas_index(directory : str = ATLAS_DIRECTORY) -> dict | None:
+    """
+    The index of a built atlas, None if there is none
+    :param directory: str
+    :return dict | None: sheet file names, "category/name" -> [sheet, x, y, width, height] of whole images and
+                         animation name -> {"image": "category/name", "frames": [[sheet, x, y, width, height], ...]}
+    """
+    path : str = os.path.join(directory, ATLAS_INDEX_NAME)
+    if not os.path.exists(path): return None
+    with open(path, "r") as file:
+        return json.load(file)
+
+def write_atlas_index(directory : str, sheets : list[str], images : dict[str, list[int]], animations : dict[str, dict]):
+    with open(os.path.join(directory, ATLAS_INDEX_NAME), "w") as file:
+        json.dump({SHEETS_KEY: sheets, IMAGES_KEY: images, ANIMATIONS_KEY: animations}, file)
@@ -0,0 +1,244 @@
+import numpy as np
+import pygame
+from utility.game_constants import GROUND_TOLERANCE
+from utility.tilemap import PASS_TOP, PASS_BOT, PASS_LEFT, PASS_RIGHT, pack_passthrough
+
+# Collision Constants
+GRID_CELL : int = 128 # px, broadphase cell
+DENSE_PAIRS : int = 4096 # below this many mover/terrain pairs every pair is tested, no broadphase
+_KEY_OFFSET : int = 1 << 20 # keeps packed cell keys positive for cell coordinates down to -2^20
+
+# Helpers
+def round_like_rect(values : np.ndarray) -> np.ndarray:
+    """
+    pygame.Rect rounds float coordinates half away from zero, positions resolved here follow suit
+    :param values: np.ndarray
+    :return np.ndarray
+    """
+    return np.trunc(values + np.copysign(0.5, values))
+
+def sweep_hits(start_lo : float, start_hi : float, end_lo : float, end_hi : float, lo : float, hi : float) -> bool:
+    """
+    Whether a span moving from [start_lo, start_hi) to [end_lo, end_hi) ends inside [lo, hi) or jumps clean over it,
+    so moves longer than a block is thick can't tunnel through it
+    """
+    if hi > end_lo and lo < end_hi: return True
+    if end_lo >= start_lo: return start_hi <= lo < end_hi
+    return end_lo < hi <= start_lo
+
+def stands_on(rect : pygame.Rect, other : pygame.Rect, tolerance : int = GROUND_TOLERANCE) -> bool:
+    """
+    Whether rect rests on other's top edge: at most tolerance px above it and overlapping it horizontally
+    """
+    return 0 <= other.top - rect.bottom <= tolerance and rect.left < other.right and rect.right > other.left
+
+def mask_overlap(mask : pygame.Mask, pos : tuple[int, int], other : pygame.Mask, other_pos : tuple[int, int]) -> pygame.Rect | None:
+    """
+    Bounding rect of the pixels two masks share, relative to mask's topleft, None if they don't touch
+    :param mask: pygame.Mask
+    :param pos: tuple[int, int], topleft of mask in the world
+    :param other: pygame.Mask
+    :param other_pos: tuple[int, int]
+    :return pygame.Rect | None
+    """
+    offset : tuple[int, int] = (other_pos[0] - pos[0], other_pos[1] - pos[1])
+    if mask.overlap(other, offset) is None: return None
+    bounds : list[pygame.Rect] = mask.overlap_mask(other, offset).get_bounding_rects()
+    return bounds[0].unionall(bounds[1:])
+
+def _sweep_hits(start_lo : np.ndarray, start_hi : np.ndarray, end_lo : np.ndarray, end_hi : np.ndarray,
+                lo : np.ndarray, hi : np.ndarray) -> np.ndarray:
+    """
+    sweep_hits() for arrays
+    """
+    forwards : np.ndarray = end_lo >= start_lo
+    return (((hi > end_lo) & (lo < end_hi)) |
+            (forwards & (start_hi <= lo) & (lo < end_hi)) | (~forwards & (end_lo < hi) & (hi <= start_lo)))
+
+def _ragged_arange(counts : np.ndarray) -> np.ndarray:
+    """
+    Concatenation of arange(count) for every count, e.g. [2, 3] -> [0, 1, 0, 1, 2]
+    """
+    return np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+def _grid_cells(left : np.ndarray, top : np.ndarray, right : np.ndarray, bottom : np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Packed keys of the GRID_CELL cells each box covers, with the index of the box each key came from
+    :return tuple[np.ndarray, np.ndarray]: keys, owners
+    """
+    col_lo : np.ndarray = np.floor_divide(left, GRID_CELL).astype(np.int64)
+    row_lo : np.ndarray = np.floor_divide(top, GRID_CELL).astype(np.int64)
+    cols : np.ndarray = np.floor_divide(np.maximum(right - 1, left), GRID_CELL).astype(np.int64) - col_lo + 1
+    rows : np.ndarray = np.floor_divide(np.maximum(bottom - 1, top), GRID_CELL).astype(np.int64) - row_lo + 1
+    counts : np.ndarray = cols * rows
+    owners : np.ndarray = np.repeat(np.arange(len(counts)), counts)
+    local : np.ndarray = _ragged_arange(counts)
+    width : np.ndarray = np.repeat(cols, counts)
+    col : np.ndarray = np.repeat(col_lo, counts) + local % width
+    row : np.ndarray = np.repeat(row_lo, counts) + local // width
+    return (col + _KEY_OFFSET) * (_KEY_OFFSET * 4) + (row + _KEY_OFFSET), owners
+
+class TerrainCollider:
+    """
+    Static terrain as NumPy arrays of edges plus one byte of PASS_* flags per rect.
+    resolve() moves any number of rects through it at once, x axis first then y, like Player always has.
+    Large batches only test the terrain sharing a grid cell with each mover.
+    """
+    # Attributes
+    _left : np.ndarray
+    _top : np.ndarray
+    _right : np.ndarray
+    _bottom : np.ndarray
+    _passthrough : np.ndarray
+    _cell_keys : np.ndarray | None # sorted packed cell keys, built on first broadphase query
+    _cell_rects : np.ndarray | None # terrain index for every entry of _cell_keys
+
+    # Magic Methods
+    def __init__(self, rects : np.ndarray, passthrough : np.ndarray = None):
+        """
+        :param rects: np.ndarray, (m, 4) of x, y, width, height
+        :param passthrough: np.ndarray, (m,) PASS_* flags, None for solid terrain
+        """
+        rects = np.asarray(rects, dtype=np.int64).reshape(-1, 4)
+        self._left = rects[:, 0]
+        self._top = rects[:, 1]
+        self._right = rects[:, 0] + rects[:, 2]
+        self._bottom = rects[:, 1] + rects[:, 3]
+        self._passthrough = np.zeros(len(rects), dtype=np.uint8) if passthrough is None else np.asarray(passthrough, dtype=np.uint8)
+        self._cell_keys = None
+        self._cell_rects = None
+
+    def __len__(self) -> int: return len(self._left)
+
+    @classmethod
+    def from_blocks(cls, blocks : list[pygame.sprite.Sprite]) -> "TerrainCollider":
+        """
+        Builds a collider from Blocks, keeping their order and passthrough dicts
+        :param blocks: list[Block]
+        :return TerrainCollider
+        """
+        return cls([tuple(block.rect) for block in blocks], [pack_passthrough(**block.passthrough) for block in blocks])
+
+    # Methods
+    def candidates(self, left : np.ndarray, top : np.ndarray, right : np.ndarray, bottom : np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (mover, terrain) index pairs worth testing for n boxes, may hold pairs that don't overlap and repeated pairs
+        :return tuple[np.ndarray, np.ndarray]
+        """
+        n : int = len(left)
+        m : int = len(self)
+        if n * m <= DENSE_PAIRS: return np.repeat(np.arange(n), m), np.tile(np.arange(m), n)
+        if self._cell_keys is None:
+            keys, owners = _grid_cells(self._left, self._top, self._right, self._bottom)
+            order : np.ndarray = np.argsort(keys, kind="stable")
+            self._cell_keys, self._cell_rects = keys[order], owners[order]
+        keys, movers = _grid_cells(left, top, right, bottom)
+        first : np.ndarray = np.searchsorted(self._cell_keys, keys, side="left")
+        counts : np.ndarray = np.searchsorted(self._cell_keys, keys, side="right") - first
+        return np.repeat(movers, counts), self._cell_rects[np.repeat(first, counts) + _ragged_arange(counts)]
+
+    def swept(self, movers : np.ndarray, rects : np.ndarray, start : np.ndarray, end : np.ndarray, size : np.ndarray, axis : int) -> np.ndarray:
+        """
+        Whether each mover, moving along one axis from start to end, ends inside or jumps over the terrain of its pair
+        :param start: np.ndarray, (n, 2) top left before the move
+        :param end: np.ndarray, (n, 2) top left after it
+        :param size: np.ndarray, (n, 2)
+        :param axis: int, 0 for x, 1 for y
+        :return np.ndarray: bool per pair
+        """
+        lows : tuple[np.ndarray, np.ndarray] = (self._left, self._top)
+        highs : tuple[np.ndarray, np.ndarray] = (self._right, self._bottom)
+        across : int = 1 - axis
+        edge : np.ndarray = end[movers, across]
+        overlaps_across : np.ndarray = (edge < highs[across][rects]) & (edge + size[movers, across] > lows[across][rects])
+        start_lo : np.ndarray = start[movers, axis]
+        end_lo : np.ndarray = end[movers, axis]
+        return overlaps_across & _sweep_hits(start_lo, start_lo + size[movers, axis], end_lo, end_lo + size[movers, axis],
+                                             lows[axis][rects], highs[axis][rects])
+
+    def blocking(self, movers : np.ndarray, rects : np.ndarray, vel : np.ndarray) -> np.ndarray:
+        """
+        Whether the terrain of each pair stops its mover moving with vel, the rules of Player._can_passthrough
+        :param vel: np.ndarray, (n, 2)
+        :return np.ndarray: bool per pair
+        """
+        flags : np.ndarray = self._passthrough[rects]
+        vel_x : np.ndarray = vel[movers, 0]
+        vel_y : np.ndarray = vel[movers, 1]
+        passable : np.ndarray = (((vel_x > 0) & ((flags & PASS_LEFT) != 0)) | ((vel_x < 0) & ((flags & PASS_RIGHT) != 0)) |
+                                 ((vel_y > 0) & ((flags & PASS_TOP) != 0)) | ((vel_y < 0) & ((flags & PASS_BOT) != 0)))
+        return ~passable
+
+    def resolve(self, pos : np.ndarray, size : np.ndarray, vel : np.ndarray, dt : float,
+                bounds : pygame.Rect = None) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Moves n rects by vel * dt and stops them at the first terrain they would end up in or pass through
+        :param pos: np.ndarray, (n, 2) top left
+        :param size: np.ndarray, (n, 2) width, height
+        :param vel: np.ndarray, (n, 2) px/s
+        :param dt: float
+        :param bounds: pygame.Rect, world edges to keep the rects inside (left, right, bottom), None for no edges
+        :return tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: corrected positions, velocities with blocked axes
+        zeroed, whether each rect stands on something, whether each rect landed this step
+        """
+        pos = np.array(pos, dtype=np.float64).reshape(-1, 2)
+        vel = np.array(vel, dtype=np.float64).reshape(-1, 2)
+        size = np.asarray(size, dtype=np.float64).reshape(-1, 2)
+        n : int = len(pos)
+        dx : np.ndarray = vel[:, 0] * dt
+        dy : np.ndarray = vel[:, 1] * dt
+        empty : bool = len(self) == 0
+
+        # x axis, swept so nothing thinner than a move is skipped
+        start : np.ndarray = pos.copy()
+        pos[:, 0] = round_like_rect(pos[:, 0] + dx)
+        if not empty:
+            movers, rects = self.candidates(np.minimum(start[:, 0], pos[:, 0]), pos[:, 1],
+                                            np.maximum(start[:, 0], pos[:, 0]) + size[:, 0], pos[:, 1] + size[:, 1])
+            hits : np.ndarray = self.swept(movers, rects, start, pos, size, 0) & self.blocking(movers, rects, vel)
+            movers, rects = movers[hits], rects[hits]
+            stop : np.ndarray = np.full(n, np.inf)
+            np.minimum.at(stop, movers, np.where(dx[movers] > 0, self._left[rects], np.inf))
+            push : np.ndarray = np.full(n, -np.inf)
+            np.maximum.at(push, movers, np.where(dx[movers] < 0, self._right[rects], -np.inf))
+            hit : np.ndarray = np.zeros(n, dtype=bool)
+            hit[movers] = True
+            pos[:, 0] = np.where(hit & (dx > 0), stop - size[:, 0], np.where(hit & (dx < 0), push, pos[:, 0]))
+            vel[hit, 0] = 0
+        if bounds is not None:
+            outside : np.ndarray = (pos[:, 0] + size[:, 0] > bounds.right) | (pos[:, 0] < bounds.left)
+            pos[:, 0] = np.maximum(np.minimum(pos[:, 0], bounds.right - size[:, 0]), bounds.left)
+            vel[outside, 0] = 0
+
+        # y axis
+        start = pos.copy()
+        pos[:, 1] = round_like_rect(pos[:, 1] + dy)
+        landed : np.ndarray = np.zeros(n, dtype=bool)
+        on_ground : np.ndarray = np.zeros(n, dtype=bool)
+        if not empty:
+            movers, rects = self.candidates(pos[:, 0], np.minimum(start[:, 1], pos[:, 1]),
+                                            pos[:, 0] + size[:, 0], np.maximum(start[:, 1], pos[:, 1]) + size[:, 1])
+            hits = self.swept(movers, rects, start, pos, size, 1) & self.blocking(movers, rects, vel)
+            movers, rects = movers[hits], rects[hits]
+            stop = np.full(n, np.inf)
+            np.minimum.at(stop, movers, np.where(dy[movers] > 0, self._top[rects], np.inf))
+            push = np.full(n, -np.inf)
+            np.maximum.at(push, movers, np.where(dy[movers] < 0, self._bottom[rects], -np.inf))
+            hit = np.zeros(n, dtype=bool)
+            hit[movers] = True
+            landed = hit & (dy > 0)
+            pos[:, 1] = np.where(landed, stop - size[:, 1], np.where(hit & (dy < 0), push, pos[:, 1]))
+            vel[hit, 1] = 0
+            # Standing on terrain: a top edge at most GROUND_TOLERANCE px below the rect, overlapping it horizontally
+            left, right, bottom = pos[:, 0], pos[:, 0] + size[:, 0], pos[:, 1] + size[:, 1]
+            movers, rects = self.candidates(left, bottom, right, bottom + GROUND_TOLERANCE + 1)
+            gap : np.ndarray = self._top[rects] - bottom[movers]
+            standing : np.ndarray = ((gap >= 0) & (gap <= GROUND_TOLERANCE) &
+                                     (left[movers] < self._right[rects]) & (right[movers] > self._left[rects]))
+            on_ground[movers[standing]] = True
+        if bounds is not None:
+            below : np.ndarray = pos[:, 1] + size[:, 1] > bounds.bottom
+            pos[below, 1] = bounds.bottom - size[below, 1]
+            vel[below, 1] = 0
+            landed |= below
+        return pos, vel, on_ground | landed, landed
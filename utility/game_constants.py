@@ -1,13 +1,28 @@
 # Game
-FPS : int = 60
+TICK_RATE : int = 60 # simulation ticks per second, whatever the frame rate
+SIMULATION_DT : float = 1 / TICK_RATE # s, fixed step of every tick
+FPS : int = 60 # frames drawn per second at most, 0 draws as often as it can
+INPUT_POLL_RATE : int = 250 # Hz, input is read this often between frames
+MAX_FRAME_TIME : float = 0.25 # s, longest stall caught up on, the simulation only falls behind real time past it
+INTERPOLATION : bool = True # draw moving sprites between their last two ticks instead of where the last tick left them
 NAME : str = 'Juman Ping'
 CELL_SIZE : int = 16
 SCREEN_WIDTH : int = 1280
 SCREEN_HEIGHT : int = 800
+DIRTY_RENDERING : bool = True # only redraw and push what moved each frame
+TILEMAP_TERRAIN : bool = False # keep terrain as a compact cell grid, multi-cell blocks are drawn tiled instead of stretched
+PROFILING : bool = False # time every frame phase, see utility.profiler
+PROFILER_OVERLAY : bool = True # show frame p50/p99 while profiling, F3 toggles it
+RENDER_SCALE : int = 1 # world px per framebuffer px, above 1 the world is drawn small and upscaled once per frame
+UPSCALE_FILTER : str = "integer" # "integer" (nearest neighbour) or "scale2x" (edge smoothing, only at a factor of 2)
 
 # Movement
 GRAVITY_ACC : float = 1250
 TERMINAL_VELOCITY : float = 3000
+MAX_SPEED : float = TERMINAL_VELOCITY # px/s, nothing moves faster on either axis, falling is the fastest anything goes
+MAX_TICK_MOVE : int = int(MAX_SPEED * SIMULATION_DT) + 1 # px, anything that moved further in a tick was placed there
+GROUND_TOLERANCE : int = 1 # px between feet and a top edge that still counts as standing on it
+PIXEL_COLLISION : bool = False # Player collides by sprite masks once rects overlap, instead of by rects alone
 
 # COLOURS
 WHITE = (255, 255, 255)
@@ -1,5 +1,20 @@
 import os
+import threading
+import weakref
 import pygame
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from utility.atlas_format import read_animations, read_atlas_index, frame_area, image_key, ATLAS_DIRECTORY, SHEETS_KEY, IMAGES_KEY, \
+    ANIMATIONS_KEY, SOURCE_KEY, FRAMES_KEY, COUNT_KEY, SIZE_KEY, COLORKEY_KEY
+
+def convert_surface(surface : pygame.Surface) -> pygame.Surface:
+    """
+    Converts a surface to the display's pixel format, headless runs (no window) keep it as is
+    :param surface: pygame.Surface
+    :return: pygame.Surface
+    """
+    if pygame.display.get_surface() is None: return surface
+    return surface.convert_alpha()
 
 def load_image(path : str) -> pygame.Surface:
     """
@@ -7,7 +22,7 @@ def load_image(path : str) -> pygame.Surface:
     :param path:
     :return: pygame.Surface
     """
-    img : pygame.Surface = pygame.image.load(path).convert_alpha()
+    img : pygame.Surface = convert_surface(pygame.image.load(path))
     return img
 
 def load_images(path) -> dict[str, pygame.Surface]:
@@ -23,15 +38,388 @@ def load_images(path) -> dict[str, pygame.Surface]:
 
 # Constants
 ASSET_SUB_DIRECTORIES : list[str] = ["backgrounds", "blocks", "entities"]
+ASSET_LOAD_WORKERS : int = 4
+SURFACE_CACHE_BYTES : int = 64 * 1024 * 1024
+
+class SurfaceCache:
+    """
+    LRU cache of decoded files and surfaces derived from a source image (cropped, scaled, flipped, colour keyed),
+    keyed by the source and the transform, and bounded by the bytes of pixel data it keeps alive.
+    It also remembers how each derived surface was made, so reduce() can redo it from the source at a lower resolution.
+    Surfaces it hands out are shared, so callers must not draw onto them. The bookkeeping is locked, so levels can
+    be loaded on a worker thread while the game plays, at worst two threads both derive a surface missing from it.
+    """
+    # Attributes
+    _lock : threading.Lock
+    _entries : OrderedDict[tuple, tuple[pygame.Surface | None, pygame.Surface, int]]
+    _origins : weakref.WeakKeyDictionary[pygame.Surface, tuple] # derived surface -> (source, size, flip, colorkey, area)
+    _reduced : weakref.WeakKeyDictionary[pygame.Surface, dict[int, pygame.Surface]] # surface -> scale -> reduced surface
+    _max_bytes : int
+    _bytes : int
+    hits : int
+    misses : int
+
+    # Magic Methods
+    def __init__(self, max_bytes : int = SURFACE_CACHE_BYTES):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._origins = weakref.WeakKeyDictionary()
+        self._reduced = weakref.WeakKeyDictionary()
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int: return len(self._entries)
+
+    # Accessors/Setters
+    @property
+    def bytes(self) -> int: return self._bytes
+
+    @property
+    def max_bytes(self) -> int: return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes : int):
+        with self._lock:
+            self._max_bytes = max_bytes
+            self._evict()
+
+    # Methods
+    def load(self, path : str) -> pygame.Surface:
+        """
+        Decodes and converts an image file once, later calls share the same surface
+        :param path: str
+        :return: pygame.Surface
+        """
+        key : tuple = ("file", path)
+        entry = self._lookup(key, None)
+        if entry is not None: return entry
+        return self._store(key, None, load_image(path))
+
+    def derive(self, source : pygame.Surface, size : tuple[int, int] = None, flip : tuple[bool, bool] = (False, False),
+               colorkey : tuple[int, int, int] = None, area : tuple[int, int, int, int] = None) -> pygame.Surface:
+        """
+        Returns source cropped to area (onto black), scaled to size, flipped, colour keyed and converted, in that order.
+        Keying before converting turns the key into alpha, so a source that was keyed already can be keyed again.
+        A surface that only needs converting is not cached, there is nothing to share.
+        :param source: pygame.Surface
+        :param size: tuple[int, int]
+        :param flip: tuple[bool, bool], (horizontal, vertical)
+        :param colorkey: tuple[int, int, int]
+        :param area: tuple[int, int, int, int], (x, y, width, height) of source
+        :return: pygame.Surface
+        """
+        if size is not None: size = (int(size[0]), int(size[1]))
+        if area is None and colorkey is None and not any(flip) and (size is None or size == source.get_size()):
+            return convert_surface(source)
+
+        key : tuple = ("derived", id(source), size, tuple(flip), colorkey, area)
+        entry = self._lookup(key, source)
+        if entry is not None: return entry
+
+        image : pygame.Surface = source
+        if area is not None:
+            image = pygame.Surface(area[2:])
+            image.blit(source, (0, 0), area)
+        if size is not None and size != image.get_size(): image = pygame.transform.scale(image, size=size)
+        if any(flip): image = pygame.transform.flip(image, *flip)
+        if colorkey is not None:
+            if image.get_flags() & pygame.SRCALPHA: # a key is ignored next to per pixel alpha, so flatten onto black first
+                flat : pygame.Surface = pygame.Surface(image.get_size())
+                flat.blit(image, (0, 0))
+                image = flat
+            elif image is source: image = source.copy()
+            image.set_colorkey(colorkey)
+        image = convert_surface(image)
+        if image is source: image = source.copy()
+        self._origins[image] = (source, size, tuple(flip), colorkey, area)
+        return self._store(key, source, image)
+
+    def reduce(self, surface : pygame.Surface, scale : int) -> pygame.Surface:
+        """
+        surface at 1/scale of its size, for drawing into a low resolution framebuffer. Derived surfaces are derived again
+        from their source at the smaller size, so pixel art scaled up at load is not scaled up and back down.
+        Anything else is shrunk with nearest neighbour. Each is made once and kept for as long as surface lives.
+        :param surface: pygame.Surface
+        :param scale: int
+        :return: pygame.Surface
+        """
+        if scale == 1: return surface
+        reduced : dict[int, pygame.Surface] | None = self._reduced.get(surface)
+        if reduced is None:
+            reduced = {}
+            self._reduced[surface] = reduced
+        if scale in reduced: return reduced[scale]
+
+        size : tuple[int, int] = (max(1, surface.get_width() // scale), max(1, surface.get_height() // scale))
+        origin : tuple | None = self._origins.get(surface)
+        if origin is None:
+            image : pygame.Surface = pygame.transform.scale(surface, size)
+            if surface.get_colorkey() is not None: image.set_colorkey(surface.get_colorkey())
+        else:
+            source, _, flip, colorkey, area = origin
+            # A crop is in the source's own pixels, so only uncropped derivations can start from the reduced source
+            if area is None and source in self._origins: source = self.reduce(source, scale)
+            image = self.derive(source, size=size, flip=flip, colorkey=colorkey, area=area)
+        reduced[scale] = image
+        return image
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _lookup(self, key : tuple, source : pygame.Surface | None) -> pygame.Surface | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            # The source is kept in the entry, so its id cannot be reused while the entry exists
+            if entry is None or entry[0] is not source:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def _store(self, key : tuple, source : pygame.Surface | None, image : pygame.Surface) -> pygame.Surface:
+        size : int = image.get_bytesize() * image.get_width() * image.get_height()
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None: self._bytes -= old[2]
+            self._entries[key] = (source, image, size)
+            self._bytes += size
+            self._evict()
+        return image
+
+    def _evict(self):
+        while self._bytes > self._max_bytes and len(self._entries) > 1:
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+
+SURFACE_CACHE : SurfaceCache = SurfaceCache()
+
+def derive_surface(source : pygame.Surface, size : tuple[int, int] = None, flip : tuple[bool, bool] = (False, False),
+                   colorkey : tuple[int, int, int] = None, area : tuple[int, int, int, int] = None) -> pygame.Surface:
+    """
+    Shared, cached version of a transformed surface, see SurfaceCache.derive
+    :return: pygame.Surface
+    """
+    return SURFACE_CACHE.derive(source, size=size, flip=flip, colorkey=colorkey, area=area)
+
+def reduce_surface(surface : pygame.Surface, scale : int) -> pygame.Surface:
+    """
+    Shared, cached version of surface at 1/scale of its size, see SurfaceCache.reduce
+    :return: pygame.Surface
+    """
+    return SURFACE_CACHE.reduce(surface, scale)
+
+def load_cached(path : str) -> pygame.Surface:
+    """
+    Shared, cached version of load_image
+    :param path: str
+    :return: pygame.Surface
+    """
+    return SURFACE_CACHE.load(path)
+
+def cut_frames(sheet : pygame.Surface, animation : dict) -> list[pygame.Surface]:
+    """
+    Every frame of an animation definition cut out of its sprite sheet, see utility.atlas_format.read_animations
+    :param sheet: pygame.Surface
+    :param animation: dict
+    :return list[pygame.Surface]
+    """
+    size : tuple[int, int] | None = tuple(animation[SIZE_KEY]) if SIZE_KEY in animation else None
+    colorkey : tuple[int, int, int] | None = tuple(animation[COLORKEY_KEY]) if COLORKEY_KEY in animation else None
+    return [derive_surface(sheet, size=size, colorkey=colorkey, area=frame_area(animation, frame)) for frame in range(animation[COUNT_KEY])]
+
+MASK_CACHE : weakref.WeakKeyDictionary[pygame.Surface, tuple[pygame.Mask, pygame.Rect]] = weakref.WeakKeyDictionary()
+
+def _mask_entry(surface : pygame.Surface) -> tuple[pygame.Mask, pygame.Rect]:
+    entry : tuple[pygame.Mask, pygame.Rect] | None = MASK_CACHE.get(surface)
+    if entry is None:
+        mask : pygame.Mask = pygame.mask.from_surface(surface)
+        rects : list[pygame.Rect] = mask.get_bounding_rects()
+        entry = (mask, rects[0].unionall(rects[1:]) if rects else pygame.Rect(0, 0, 0, 0))
+        MASK_CACHE[surface] = entry
+    return entry
+
+def mask_for(surface : pygame.Surface) -> pygame.Mask:
+    """
+    Collision mask of a surface, built on first use and kept for as long as the surface lives.
+    Masks are shared like cached surfaces, so callers must not draw onto them.
+    :param surface: pygame.Surface
+    :return: pygame.Mask
+    """
+    return _mask_entry(surface)[0]
+
+def mask_bounds(surface : pygame.Surface) -> pygame.Rect:
+    """
+    Bounding rect of the set pixels of mask_for(surface), relative to its topleft. Shared, so don't modify it
+    :param surface: pygame.Surface
+    :return: pygame.Rect
+    """
+    return _mask_entry(surface)[1]
+
+class TextureAtlas:
+    """
+    The sheets written by utility.atlas_builder and the index of named rects in them. Each sheet is decoded once,
+    on first use or in ImageLoader.prefetch, and images and animation frames are handed out as subsurfaces of it.
+    """
+    # Attributes
+    directory : str
+    _sheet_names : list[str]
+    _sheets : list[pygame.Surface | None]
+    _images : dict[str, list[int]] # "category/name" -> [sheet, x, y, width, height]
+    _animations : dict[str, dict] # name -> {"image": "category/name", "frames": [[sheet, x, y, width, height], ...]}
+
+    # Magic Methods
+    def __init__(self, index : dict, directory : str = ATLAS_DIRECTORY):
+        self.directory = directory
+        self._sheet_names = index[SHEETS_KEY]
+        self._sheets = [None] * len(self._sheet_names)
+        self._images = index[IMAGES_KEY]
+        self._animations = index[ANIMATIONS_KEY]
+
+    # Methods
+    @classmethod
+    def load(cls, directory : str = ATLAS_DIRECTORY) -> "TextureAtlas | None":
+        """
+        The atlas built in directory, None if it has not been built
+        :param directory: str
+        :return TextureAtlas | None
+        """
+        index : dict | None = read_atlas_index(directory)
+        return cls(index, directory) if index is not None else None
+
+    def has_image(self, key : str) -> bool: return key in self._images
+
+    def has_animation(self, name : str) -> bool: return name in self._animations
+
+    def sheet_path(self, sheet : int) -> str: return os.path.join(self.directory, self._sheet_names[sheet])
+
+    def is_decoded(self, sheet : int) -> bool: return self._sheets[sheet] is not None
+
+    def sheet(self, sheet : int) -> pygame.Surface:
+        if self._sheets[sheet] is None: self._sheets[sheet] = load_image(self.sheet_path(sheet))
+        return self._sheets[sheet]
+
+    def set_sheet(self, sheet : int, surface : pygame.Surface): self._sheets[sheet] = surface
+
+    def sheets_for(self, key : str) -> list[int]:
+        """
+        Sheets holding an image or the animation frames cut from it, empty if the atlas has neither
+        :param key: str, "category/name"
+        :return list[int]
+        """
+        sheets : set[int] = {self._images[key][0]} if key in self._images else set()
+        for animation in self._animations.values():
+            if animation[SOURCE_KEY] == key: sheets.update(frame[0] for frame in animation[FRAMES_KEY])
+        return sorted(sheets)
+
+    def image(self, key : str) -> pygame.Surface:
+        sheet, x, y, width, height = self._images[key]
+        return self.sheet(sheet).subsurface((x, y, width, height))
+
+    def animation(self, name : str) -> list[pygame.Surface]:
+        return [self.sheet(sheet).subsurface((x, y, width, height)) for sheet, x, y, width, height in self._animations[name][FRAMES_KEY]]
 
 class ImageLoader:
-    _catalog : dict[str, dict[str, pygame.Surface]]
+    """
+    Catalog of the images under ./assets. Eager loaders decode everything up front,
+    lazy loaders only list the files and decode each on first get_image or in a prefetch.
+    Once an atlas has been built (python -m utility.atlas_builder) images and animation frames come out of its sheets
+    as subsurfaces, the loose files are only opened for anything it doesn't have.
+    """
+    _catalog : dict[str, dict[str, pygame.Surface | None]]
+    _animation_data : dict[str, dict]
+    _animations : dict[str, list[pygame.Surface]]
+    atlas : TextureAtlas | None
+    cache : SurfaceCache
 
-    def __init__(self):
+    def __init__(self, cache_bytes : int = None, lazy : bool = False, atlas : bool = True):
         self._catalog = {}
+        self._animation_data = read_animations()
+        self._animations = {}
+        self.atlas = TextureAtlas.load() if atlas else None
+        self.cache = SURFACE_CACHE
+        if cache_bytes is not None: self.cache.max_bytes = cache_bytes
         for sub_dir in ASSET_SUB_DIRECTORIES:
-            self._catalog[sub_dir] = load_images(f"./assets/{sub_dir}")
+            self._catalog[sub_dir] = dict.fromkeys(os.listdir(f"./assets/{sub_dir}"))
+            if lazy: continue
+            for name in self._catalog[sub_dir]: self.get_image(sub_dir, name)
 
     def get_image(self, category : str, name : str) -> pygame.Surface | None:
         if category not in ASSET_SUB_DIRECTORIES: return None
-        return self._catalog[category].get(name, None)
\ No newline at end of file
+        images : dict[str, pygame.Surface | None] = self._catalog[category]
+        if name not in images: return None
+        if images[name] is None:
+            key : str = image_key(category, name)
+            if self.atlas is not None and self.atlas.has_image(key): images[name] = self.atlas.image(key)
+            else: images[name] = load_image(f"./assets/{category}/{name}")
+        return images[name]
+
+    def get_animation(self, name : str) -> list[pygame.Surface] | None:
+        """
+        Frames of an animation defined in assets/animations.json, views into the atlas when it has them
+        and otherwise cut out of the sprite sheet they are defined on. Frames are shared, so don't draw onto them.
+        :param name: str
+        :return list[pygame.Surface] | None
+        """
+        if name not in self._animations:
+            if self.atlas is not None and self.atlas.has_animation(name): self._animations[name] = self.atlas.animation(name)
+            elif name in self._animation_data:
+                animation : dict = self._animation_data[name]
+                self._animations[name] = cut_frames(self.get_image(*animation[SOURCE_KEY].split("/", 1)), animation)
+            else: return None
+        return self._animations[name]
+
+    def is_loaded(self, category : str, name : str) -> bool:
+        return self._catalog.get(category, {}).get(name) is not None
+
+    def prefetch(self, manifest : list[tuple[str, str]], workers : int = ASSET_LOAD_WORKERS):
+        """
+        Decodes the (category, name) images in manifest that are not loaded yet on a thread pool,
+        then converts them on the calling thread, since convert_alpha has to run where the display lives.
+        :param manifest: list[tuple[str, str]]
+        :param workers: int
+        """
+        self.insert(self.decode(manifest, workers))
+
+    def decode(self, manifest : list[tuple[str, str]], workers : int = ASSET_LOAD_WORKERS) -> list[tuple[int | tuple[str, str], pygame.Surface]]:
+        """
+        Decodes the (category, name) images in manifest that are not loaded yet on a thread pool, without converting or
+        keeping them, so it can run off the thread the display lives on. Images in the atlas decode the sheets they
+        are on instead, each sheet once.
+        :param manifest: list[tuple[str, str]]
+        :param workers: int
+        :return list[tuple[int | tuple[str, str], pygame.Surface]]: (atlas sheet or (category, name), image), for insert()
+        """
+        pending : list[tuple[str, str]] = [(category, name) for category, name in dict.fromkeys(manifest)
+                                           if name in self._catalog.get(category, {}) and not self.is_loaded(category, name)]
+        sheets : list[int] = []
+        if self.atlas is not None:
+            in_atlas : dict[tuple[str, str], list[int]] = {entry: self.atlas.sheets_for(image_key(*entry)) for entry in pending}
+            sheets = sorted({sheet for entry_sheets in in_atlas.values() for sheet in entry_sheets if not self.atlas.is_decoded(sheet)})
+            pending = [entry for entry in pending if not in_atlas[entry]]
+        if not pending and not sheets: return []
+        paths : list[str] = [self.atlas.sheet_path(sheet) for sheet in sheets] + [f"./assets/{category}/{name}" for category, name in pending]
+        with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+            decoded : list[pygame.Surface] = list(executor.map(pygame.image.load, paths))
+        return list(zip(sheets + pending, decoded))
+
+    def insert(self, decoded : list[tuple[int | tuple[str, str], pygame.Surface]]):
+        """
+        Converts what decode() returned and adds it to the catalog or the atlas, on the thread the display lives on.
+        Anything that was loaded in the meantime is kept as it is.
+        :param decoded: list[tuple[int | tuple[str, str], pygame.Surface]]
+        """
+        for target, image in decoded:
+            if isinstance(target, int):
+                if not self.atlas.is_decoded(target): self.atlas.set_sheet(target, convert_surface(image))
+            elif not self.is_loaded(*target): self._catalog[target[0]][target[1]] = convert_surface(image)
+
+    def get_derived(self, category : str, name : str, size : tuple[int, int] = None, flip : tuple[bool, bool] = (False, False),
+                    colorkey : tuple[int, int, int] = None) -> pygame.Surface | None:
+        image : pygame.Surface | None = self.get_image(category, name)
+        if image is None: return None
+        return self.cache.derive(image, size=size, flip=flip, colorkey=colorkey)
\ No newline at end of file
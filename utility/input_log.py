@@ -0,0 +1,155 @@
+import struct
+import sys
+import pygame
+from array import array
+
+# Format Constants
+# Header: magic, version, flags, tick count, click count, fixed dt, level path length
+HEADER : struct.Struct = struct.Struct("<4sHHIIdH")
+MAGIC : bytes = b"JPIN"
+VERSION : int = 1
+VARIABLE_DT : int = 1 # header flag: every tick stores its own dt, in ms
+CLICK_FIELDS : int = 4 # tick, x, y, button
+MAX_DT_MS : int = 0xFFFF
+INPUT_LOG_EXTENSION : str = ".jpin"
+
+class InputLog:
+    """
+    What a player did, tick by tick: the held keys as one byte of bits per tick, the clicks and the dt of every tick.
+    Also works as the inputs of a Simulation, turning changed bits back into key events.
+    """
+    # Attributes
+    level_data : str
+    dt : float # fixed dt, 0 when every tick has its own
+    keys : bytearray # per tick
+    dt_ms : array # per tick, only used when dt is 0
+    clicks : dict[int, list[tuple[tuple[int, int], int]]] # tick -> (world pos, button)
+    _key_codes : list[int]
+
+    # Magic Methods
+    def __init__(self, level_data : str, key_codes : list[int], dt : float = 0):
+        """
+        :param level_data: str, level the log was recorded on
+        :param key_codes: list[int], pygame key of every bit, lowest first
+        :param dt: float, fixed dt, 0 to store one per tick
+        """
+        self.level_data = level_data
+        self.dt = dt
+        self.keys = bytearray()
+        self.dt_ms = array("H")
+        self.clicks = {}
+        self._key_codes = key_codes
+
+    def __len__(self) -> int: return len(self.keys)
+
+    # Methods
+    def dt_for(self, tick : int) -> float: return self.dt if self.dt else self.dt_ms[tick] / 1000.0
+
+    def events_for(self, tick : int) -> list[pygame.event.Event]:
+        """
+        Key events for the bits that changed since the previous tick, then the tick's clicks
+        :param tick: int
+        :return list[pygame.event.Event]
+        """
+        events : list[pygame.event.Event] = []
+        if tick >= len(self.keys): return events
+        previous : int = self.keys[tick - 1] if tick > 0 else 0
+        changed : int = previous ^ self.keys[tick]
+        for bit, key in enumerate(self._key_codes):
+            if changed >> bit & 1:
+                events.append(pygame.event.Event(pygame.KEYDOWN if self.keys[tick] >> bit & 1 else pygame.KEYUP, key=key))
+        for pos, button in self.clicks.get(tick, ()):
+            events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=button))
+        return events
+
+    def save(self, path : str):
+        """
+        Writes the log: a header, the level path, one key byte per tick, a dt per tick when they vary,
+        then int32 click records
+        :param path: str
+        """
+        click_table : array = array("i")
+        for tick in sorted(self.clicks):
+            for (x, y), button in self.clicks[tick]: click_table.extend((tick, x, y, button))
+        dt_table : array = array("H", self.dt_ms) if not self.dt else array("H")
+        if sys.byteorder != "little":
+            click_table.byteswap()
+            dt_table.byteswap()
+        level_bytes : bytes = self.level_data.encode("utf-8")
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, 0 if self.dt else VARIABLE_DT, len(self.keys),
+                                   len(click_table) // CLICK_FIELDS, self.dt, len(level_bytes)))
+            file.write(level_bytes)
+            file.write(self.keys)
+            file.write(dt_table.tobytes())
+            file.write(click_table.tobytes())
+
+    @classmethod
+    def load(cls, path : str, key_codes : list[int]) -> "InputLog":
+        """
+        Reads a log written by save()
+        :param path: str
+        :param key_codes: list[int], pygame key of every bit, lowest first
+        :return InputLog
+        """
+        with open(path, "rb") as file: data : bytes = file.read()
+        magic, version, flags, tick_count, click_count, dt, level_length = HEADER.unpack_from(data, 0)
+        if magic != MAGIC: raise ValueError(f"InputLog: {path} is not an input log")
+        if version != VERSION: raise ValueError(f"InputLog: {path} has version {version}, expected {VERSION}")
+
+        offset : int = HEADER.size
+        log : InputLog = cls(data[offset:offset + level_length].decode("utf-8"), key_codes, dt)
+        offset += level_length
+        log.keys = bytearray(data[offset:offset + tick_count])
+        offset += tick_count
+        if flags & VARIABLE_DT:
+            log.dt_ms.frombytes(data[offset:offset + tick_count * log.dt_ms.itemsize])
+            offset += tick_count * log.dt_ms.itemsize
+        click_table : array = array("i", data[offset:offset + click_count * CLICK_FIELDS * 4])
+        if sys.byteorder != "little":
+            log.dt_ms.byteswap()
+            click_table.byteswap()
+        for base in range(0, len(click_table), CLICK_FIELDS):
+            tick, x, y, button = click_table[base:base + CLICK_FIELDS]
+            log.clicks.setdefault(tick, []).append(((x, y), button))
+        return log
+
+class InputRecorder:
+    """
+    Builds an InputLog while a Simulation runs: clicks as they arrive, then the held keys and dt once per tick.
+    """
+    # Attributes
+    _log : InputLog
+    _dts : list[float]
+
+    # Magic Methods
+    def __init__(self, level_data : str, key_codes : list[int]):
+        self._log = InputLog(level_data, key_codes)
+        self._dts = []
+
+    # Methods
+    def click(self, tick : int, pos : tuple[int, int], button : int):
+        self._log.clicks.setdefault(tick, []).append(((int(pos[0]), int(pos[1])), button))
+
+    def record(self, keys : int, dt : float):
+        """
+        Ends a tick
+        :param keys: int, held key bits
+        :param dt: float
+        """
+        self._log.keys.append(keys)
+        self._dts.append(dt)
+
+    @property
+    def log(self) -> InputLog:
+        """
+        The log so far, with one fixed dt if every tick had the same one, else a dt per tick in whole ms
+        """
+        log : InputLog = self._log
+        if self._dts and all(dt == self._dts[0] for dt in self._dts): log.dt = self._dts[0]
+        else:
+            log.dt = 0
+            log.dt_ms = array("H", (min(round(dt * 1000), MAX_DT_MS) for dt in self._dts))
+        return log
+
+    def save(self, path : str): self.log.save(path)
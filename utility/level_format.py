@@ -0,0 +1,220 @@
+import mmap
+import struct
+import sys
+from array import array
+
+# Format Constants
+# Header: magic, version, flags, start x, start y, rect count, member count, name length, background length, trigger count,
+# chunk count, chunk cells, world width, world height
+HEADER : struct.Struct = struct.Struct("<4sHHiiIIHHIIHII")
+MAGIC : bytes = b"JPLV"
+VERSION : int = 4
+CHUNK_FIELDS : int = 4 # chunk x, chunk y, first rect, rect count, sorted by chunk
+RECT_FIELDS : int = 7 # kind, x, y, width, height, first member, member count
+MEMBER_FIELDS : int = 5 # x, y, width, height, order in the source level
+TRIGGER_FIELDS : int = 6 # x, y, width, height, kind length, name length, the strings follow the table
+FIELD_SIZE : int = 4 # int32, little endian
+COMPILED_LEVEL_EXTENSION : str = ".jplv"
+
+# Helpers
+def _padding(length : int) -> int: return -length % FIELD_SIZE
+
+def is_compiled_level(path : str) -> bool:
+    with open(path, "rb") as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+def write_compiled_level(path : str, name : str, start_pos : tuple[int, int], background : str,
+                         chunks : dict[tuple[int, int], list[tuple[int, int, int, int, int, list[tuple[int, int, int, int, int]]]]],
+                         chunk_cells : int, triggers : list[tuple[str, int, int, int, int, str]] = None):
+    """
+    Writes a compiled level: a header, then fixed-width int32 records for every chunk, for the terrain rects of each
+    chunk, kept together, for the blocks drawn inside each rect and for every trigger, followed by the triggers' kinds
+    and names. A chunk's rects can then be read on their own, without walking the rest of the file.
+    :param path: str
+    :param name: str
+    :param start_pos: tuple[int, int]
+    :param background: str
+    :param chunks: dict of chunk -> (kind, x, y, width, height, members) clipped to it, members being (x, y, width, height, order) in cells
+    :param chunk_cells: int, cells per chunk side the rects were clipped at
+    :param triggers: list of (kind, x, y, width, height, name) in cells
+    """
+    triggers = triggers or []
+    chunk_table : array = array("i")
+    rect_table : array = array("i")
+    member_table : array = array("i")
+    trigger_table : array = array("i")
+    trigger_strings : bytes = b""
+    world_width : int = 0
+    world_height : int = 0
+    for pos in sorted(chunks):
+        chunk_table.extend((pos[0], pos[1], len(rect_table) // RECT_FIELDS, len(chunks[pos])))
+        for kind, x, y, width, height, members in chunks[pos]:
+            rect_table.extend((kind, x, y, width, height, len(member_table) // MEMBER_FIELDS, len(members)))
+            for member in members: member_table.extend(member)
+            world_width, world_height = max(world_width, x + width), max(world_height, y + height)
+    for kind, x, y, width, height, trigger_name in triggers:
+        kind_bytes, name_bytes = kind.encode("utf-8"), trigger_name.encode("utf-8")
+        trigger_table.extend((x, y, width, height, len(kind_bytes), len(name_bytes)))
+        trigger_strings += kind_bytes + name_bytes
+    if sys.byteorder != "little":
+        chunk_table.byteswap()
+        rect_table.byteswap()
+        member_table.byteswap()
+        trigger_table.byteswap()
+
+    name_bytes : bytes = name.encode("utf-8")
+    background_bytes : bytes = background.encode("utf-8")
+    strings : bytes = name_bytes + background_bytes
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, 0, start_pos[0], start_pos[1], len(rect_table) // RECT_FIELDS,
+                               len(member_table) // MEMBER_FIELDS, len(name_bytes), len(background_bytes), len(triggers),
+                               len(chunks), chunk_cells, world_width, world_height))
+        file.write(strings + bytes(_padding(HEADER.size + len(strings))))
+        file.write(chunk_table.tobytes())
+        file.write(rect_table.tobytes())
+        file.write(member_table.tobytes())
+        file.write(trigger_table.tobytes())
+        file.write(trigger_strings)
+
+class CompiledLevel:
+    """
+    Memory-mapped view of a compiled level. Records are read straight out of the map through int32 memoryviews,
+    so they are only valid inside the with block, or between open() and close() for a level that streams its chunks in.
+    """
+    # Attributes
+    name : str
+    start_pos : tuple[int, int]
+    background : str
+    rect_count : int
+    trigger_count : int
+    chunk_count : int
+    chunk_cells : int
+    world_size : tuple[int, int] # cells, as far as the terrain reaches
+    _path : str
+    _file : object
+    _map : mmap.mmap | None
+    _chunks : memoryview | array
+    _rects : memoryview | array
+    _members : memoryview | array
+    _triggers : memoryview | array
+    _trigger_strings : int # offset of the triggers' kinds and names
+
+    # Magic Methods
+    def __init__(self, path : str):
+        self._path = path
+        self._map = None
+
+    def __enter__(self) -> "CompiledLevel": return self.open()
+
+    def __exit__(self, *exc_info): self.close()
+
+    # Methods
+    def open(self) -> "CompiledLevel":
+        self._file = open(self._path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, start_x, start_y, rect_count, member_count, name_length, background_length, trigger_count, \
+            chunk_count, chunk_cells, world_width, world_height = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC: raise ValueError(f"CompiledLevel: {self._path} is not a compiled level")
+        if version != VERSION: raise ValueError(f"CompiledLevel: {self._path} has version {version}, expected {VERSION}")
+
+        offset : int = HEADER.size
+        self.name = self._map[offset:offset + name_length].decode("utf-8")
+        offset += name_length
+        self.background = self._map[offset:offset + background_length].decode("utf-8")
+        offset += background_length + _padding(HEADER.size + name_length + background_length)
+        self.start_pos = (start_x, start_y)
+        self.rect_count = rect_count
+        self.trigger_count = trigger_count
+        self.chunk_count = chunk_count
+        self.chunk_cells = chunk_cells
+        self.world_size = (world_width, world_height)
+
+        chunks_end : int = offset + chunk_count * CHUNK_FIELDS * FIELD_SIZE
+        rects_end : int = chunks_end + rect_count * RECT_FIELDS * FIELD_SIZE
+        members_end : int = rects_end + member_count * MEMBER_FIELDS * FIELD_SIZE
+        self._trigger_strings = members_end + trigger_count * TRIGGER_FIELDS * FIELD_SIZE
+        view : memoryview = memoryview(self._map)
+        if sys.byteorder == "little":
+            self._chunks = view[offset:chunks_end].cast("i")
+            self._rects = view[chunks_end:rects_end].cast("i")
+            self._members = view[rects_end:members_end].cast("i")
+            self._triggers = view[members_end:self._trigger_strings].cast("i")
+        else: # big endian machines pay for a swapped copy
+            self._chunks = array("i", view[offset:chunks_end].tobytes())
+            self._rects = array("i", view[chunks_end:rects_end].tobytes())
+            self._members = array("i", view[rects_end:members_end].tobytes())
+            self._triggers = array("i", view[members_end:self._trigger_strings].tobytes())
+            self._chunks.byteswap()
+            self._rects.byteswap()
+            self._members.byteswap()
+            self._triggers.byteswap()
+        view.release()
+        return self
+
+    def close(self):
+        if self._map is None: return
+        if isinstance(self._chunks, memoryview): self._chunks.release()
+        if isinstance(self._rects, memoryview): self._rects.release()
+        if isinstance(self._members, memoryview): self._members.release()
+        if isinstance(self._triggers, memoryview): self._triggers.release()
+        self._map.close()
+        self._file.close()
+        self._map = None
+
+    def kinds(self) -> set[int]:
+        return set(self._rects[::RECT_FIELDS])
+
+    def boxes(self):
+        """
+        Yields (kind, x, y, width, height) for every merged rect, without its members
+        """
+        rects : memoryview | array = self._rects
+        for base in range(0, self.rect_count * RECT_FIELDS, RECT_FIELDS):
+            yield tuple(rects[base:base + 5])
+
+    def chunks(self) -> dict[tuple[int, int], tuple[int, int]]:
+        """
+        Where each chunk's rects are, for chunk_rects()
+        :return dict[tuple[int, int], tuple[int, int]]: chunk -> (first rect, rect count)
+        """
+        table : memoryview | array = self._chunks
+        return dict(zip(zip(table[0::CHUNK_FIELDS], table[1::CHUNK_FIELDS]), zip(table[2::CHUNK_FIELDS], table[3::CHUNK_FIELDS])))
+
+    def chunk_rects(self, first : int, count : int) -> list[tuple[int, int, int, int, int, list[tuple[int, int, int, int, int]]]]:
+        """
+        The rects of one chunk, see chunks()
+        :param first: int
+        :param count: int
+        :return list: (kind, x, y, width, height, members), members being (x, y, width, height, order) in cells
+        """
+        rects : memoryview | array = self._rects[first * RECT_FIELDS:(first + count) * RECT_FIELDS]
+        members : memoryview | array = self._members
+        chunk : list[tuple[int, int, int, int, int, list[tuple[int, int, int, int, int]]]] = []
+        for base in range(0, count * RECT_FIELDS, RECT_FIELDS):
+            kind, x, y, width, height, first_member, member_count = rects[base:base + RECT_FIELDS]
+            first_member *= MEMBER_FIELDS
+            chunk.append((kind, x, y, width, height, [tuple(members[i:i + MEMBER_FIELDS])
+                                                      for i in range(first_member, first_member + member_count * MEMBER_FIELDS, MEMBER_FIELDS)]))
+        return chunk
+
+    def rects(self):
+        """
+        Yields (kind, x, y, width, height, members) for every rect, chunk by chunk, members being (x, y, width, height, order) in cells
+        """
+        for first, count in self.chunks().values(): yield from self.chunk_rects(first, count)
+
+    def triggers(self) -> list[tuple[str, int, int, int, int, str]]:
+        """
+        (kind, x, y, width, height, name) of every trigger, in cells
+        :return list[tuple[str, int, int, int, int, str]]
+        """
+        triggers : list[tuple[str, int, int, int, int, str]] = []
+        table : memoryview | array = self._triggers
+        offset : int = self._trigger_strings
+        for base in range(0, self.trigger_count * TRIGGER_FIELDS, TRIGGER_FIELDS):
+            x, y, width, height, kind_length, name_length = table[base:base + TRIGGER_FIELDS]
+            kind : str = self._map[offset:offset + kind_length].decode("utf-8")
+            offset += kind_length
+            triggers.append((kind, x, y, width, height, self._map[offset:offset + name_length].decode("utf-8")))
+            offset += name_length
+        return triggers
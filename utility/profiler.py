@@ -0,0 +1,170 @@
+import json
+import time
+import pygame
+from array import array
+
+# Profiler Constants
+PROFILER_CAPACITY : int = 32768 # phase records kept, the oldest are overwritten first
+RECORD_FIELDS : int = 3 # phase, start ns, end ns
+STATS_INTERVAL : int = 30 # overlay draws between refreshes of its numbers
+OVERLAY_POS : tuple[int, int] = (8, 8)
+OVERLAY_COLOUR : tuple[int, int, int] = (255, 255, 255)
+OVERLAY_BACKGROUND : tuple[int, int, int] = (0, 0, 0)
+
+# Helpers
+def percentile(ordered : list[float], p : float) -> float:
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))] if ordered else 0.0
+
+class FrameProfiler:
+    """
+    Times named phases into a fixed-size ring buffer of (phase, start, end) records, in perf_counter_ns.
+    A disabled profiler records nothing and instrument() leaves methods as they are, so turning it off costs nothing.
+    """
+    # Attributes
+    enabled : bool
+    _names : list[str]
+    _ids : dict[str, int]
+    _records : array
+    _capacity : int
+    _count : int # records ever written
+    _font : pygame.font.Font | None
+    _overlay : pygame.Surface | None
+    _overlay_age : int # draws since the overlay was last rendered
+
+    # Magic Methods
+    def __init__(self, enabled : bool = True, capacity : int = PROFILER_CAPACITY):
+        self.enabled = enabled
+        self._names = []
+        self._ids = {}
+        self._records = array("q", bytes(8 * RECORD_FIELDS * capacity)) if enabled else array("q")
+        self._capacity = capacity
+        self._count = 0
+        self._font = None
+        self._overlay = None
+        self._overlay_age = 0
+
+    def __len__(self) -> int: return min(self._count, self._capacity)
+
+    # Methods
+    def phase(self, name : str) -> int:
+        """
+        Id of a phase name, registered on first use
+        :param name: str
+        :return int
+        """
+        if name not in self._ids:
+            self._ids[name] = len(self._names)
+            self._names.append(name)
+        return self._ids[name]
+
+    def now(self) -> int: return time.perf_counter_ns() if self.enabled else 0
+
+    def record(self, phase : int, start : int):
+        """
+        Ends a phase started at start (from now())
+        :param phase: int, from phase()
+        :param start: int
+        """
+        if not self.enabled: return
+        end : int = time.perf_counter_ns()
+        base : int = self._count % self._capacity * RECORD_FIELDS
+        records : array = self._records
+        records[base] = phase
+        records[base + 1] = start
+        records[base + 2] = end
+        self._count += 1
+
+    def instrument(self, owner : object, method : str, name : str):
+        """
+        Replaces owner.method with a wrapper recording it as phase name, nothing happens while disabled
+        :param owner: object, usually an instance so only it is timed
+        :param method: str
+        :param name: str
+        """
+        if not self.enabled: return
+        function = getattr(owner, method)
+        phase : int = self.phase(name)
+        record = self.record
+        now = time.perf_counter_ns
+        def timed(*args, **kwargs):
+            start : int = now()
+            try: return function(*args, **kwargs)
+            finally: record(phase, start)
+        setattr(owner, method, timed)
+
+    def records(self) -> list[tuple[str, int, int]]:
+        """
+        The records still in the buffer, oldest first, as (phase name, start ns, end ns)
+        :return list[tuple[str, int, int]]
+        """
+        first : int = max(0, self._count - self._capacity)
+        records : array = self._records
+        result : list[tuple[str, int, int]] = []
+        for i in range(first, self._count):
+            base : int = i % self._capacity * RECORD_FIELDS
+            result.append((self._names[records[base]], records[base + 1], records[base + 2]))
+        return result
+
+    def durations(self, name : str) -> list[float]:
+        """
+        Durations of a phase still in the buffer, in ms, oldest first
+        """
+        if name not in self._ids: return []
+        phase : int = self._ids[name]
+        first : int = max(0, self._count - self._capacity)
+        records : array = self._records
+        durations : list[float] = []
+        for i in range(first, self._count):
+            base : int = i % self._capacity * RECORD_FIELDS
+            if records[base] == phase: durations.append((records[base + 2] - records[base + 1]) / 1e6)
+        return durations
+
+    def stats(self, name : str) -> dict[str, float]:
+        """
+        p50, p99 and max of a phase in ms, over the records still in the buffer
+        :return dict[str, float]
+        """
+        ordered : list[float] = sorted(self.durations(name))
+        return {"n": len(ordered), "p50_ms": percentile(ordered, 0.5), "p99_ms": percentile(ordered, 0.99),
+                "max_ms": ordered[-1] if ordered else 0.0}
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        return {name: self.stats(name) for name in self._names}
+
+    def export_trace(self, path : str):
+        """
+        Writes the buffer as Chrome trace-event JSON (complete events), for chrome://tracing or Perfetto
+        :param path: str
+        """
+        records : list[tuple[str, int, int]] = self.records()
+        origin : int = min((start for _, start, _ in records), default=0)
+        events : list[dict[str, object]] = [
+            {"name": name, "cat": name.split(".")[0], "ph": "X", "pid": 0, "tid": 0,
+             "ts": (start - origin) / 1000, "dur": (end - start) / 1000}
+            for name, start, end in records
+        ]
+        with open(path, "w") as file: json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+    def draw_overlay(self, surface : pygame.Surface, name : str) -> pygame.Rect:
+        """
+        Draws p50/p99 of a phase in the corner of surface
+        :param surface: pygame.Surface
+        :param name: str, usually the whole frame
+        :return pygame.Rect: area drawn to
+        """
+        return surface.blit(self.overlay(name), OVERLAY_POS)
+
+    def overlay(self, name : str) -> pygame.Surface:
+        """
+        p50/p99 of a phase rendered as text, the numbers are refreshed every STATS_INTERVAL calls
+        :param name: str, usually the whole frame
+        :return pygame.Surface
+        """
+        if self._overlay is None or self._overlay_age >= STATS_INTERVAL:
+            if self._font is None: self._font = pygame.font.Font(None, 20)
+            stats : dict[str, float] = self.stats(name)
+            text : str = f"{name} p50 {stats['p50_ms']:.2f} ms  p99 {stats['p99_ms']:.2f} ms  max {stats['max_ms']:.2f} ms"
+            self._overlay = self._font.render(text, True, OVERLAY_COLOUR, OVERLAY_BACKGROUND)
+            self._overlay_age = 0
+        self._overlay_age += 1
+        return self._overlay
@@ -0,0 +1,82 @@
+import pygame
+from utility.image_loader import reduce_surface
+
+# Layer Constants, drawn bottom to top
+BACKGROUND_LAYER : int = 0
+TERRAIN_LAYER : int = 1
+PLATFORM_LAYER : int = 2
+ENTITY_LAYER : int = 3
+UI_LAYER : int = 4
+SCREEN_LAYERS : frozenset[int] = frozenset({BACKGROUND_LAYER, UI_LAYER}) # screen space, never scrolled or culled
+STATIC_LAYERS : tuple[int, ...] = (BACKGROUND_LAYER, TERRAIN_LAYER) # only change when the view or the loaded terrain does
+DYNAMIC_LAYERS : tuple[int, ...] = (PLATFORM_LAYER, ENTITY_LAYER, UI_LAYER)
+ALL_LAYERS : tuple[int, ...] = STATIC_LAYERS + DYNAMIC_LAYERS
+WORLD_LAYERS : tuple[int, ...] = (BACKGROUND_LAYER, TERRAIN_LAYER, PLATFORM_LAYER, ENTITY_LAYER) # everything but UI
+
+class RenderLayers(pygame.sprite.LayeredDirty):
+    """
+    The DirtySprites of one scene, sorted into layers. Sprites have world space rects, except on SCREEN_LAYERS.
+    draw() culls the world layers against the view, skips sprites that aren't visible, and sends everything left,
+    bottom layer first, to the target in a single Surface.blits call. With a scale above 1 it draws at 1/scale resolution:
+    sprites whose image_scale is scale were made that small and are drawn as they are, the rest through reduced copies.
+    """
+    # Methods
+    def draw(self, surface : pygame.Surface, view : pygame.Rect = None, layers : tuple[int, ...] = ALL_LAYERS,
+             scale : int = 1) -> list[pygame.Rect]:
+        """
+        Draws the sprites of layers in view onto surface
+        :param surface: pygame.Surface
+        :param view: pygame.Rect, world space area surface shows, None for an unscrolled surface
+        :param layers: tuple[int, ...]
+        :param scale: int, world px per surface px
+        :return list[pygame.Rect]: areas drawn to
+        """
+        if view is None: view = pygame.Rect((0, 0), (surface.get_width() * scale, surface.get_height() * scale))
+        return surface.blits(self.blit_sequence(view, layers, scale))
+
+    def blit_sequence(self, view : pygame.Rect, layers : tuple[int, ...] = ALL_LAYERS, scale : int = 1) -> list[tuple]:
+        """
+        The Surface.blits arguments draw() uses, in layer order
+        :param view: pygame.Rect, world space
+        :param layers: tuple[int, ...]
+        :param scale: int, world px per surface px
+        :return list[tuple]
+        """
+        if scale != 1: return self._reduced_sequence(view, layers, scale)
+        wanted : set[int] = set(layers)
+        layer_of : dict[pygame.sprite.DirtySprite, int] = self._spritelayers
+        colliderect = view.colliderect
+        vx, vy = view.topleft
+        sequence : list[tuple] = []
+        append = sequence.append
+        for sprite in self._spritelist: # kept sorted by layer by LayeredUpdates
+            layer : int = layer_of[sprite]
+            if layer not in wanted or not sprite.visible: continue
+            rect : pygame.Rect = sprite.rect
+            if layer in SCREEN_LAYERS: dest : tuple[int, int] = rect.topleft
+            elif colliderect(rect): dest = (rect.x - vx, rect.y - vy)
+            else: continue
+            if sprite.source_rect is None and not sprite.blendmode: append((sprite.image, dest))
+            else: append((sprite.image, dest, sprite.source_rect, sprite.blendmode))
+        return sequence
+
+    def _reduced_sequence(self, view : pygame.Rect, layers : tuple[int, ...], scale : int) -> list[tuple]:
+        wanted : set[int] = set(layers)
+        layer_of : dict[pygame.sprite.DirtySprite, int] = self._spritelayers
+        colliderect = view.colliderect
+        vx, vy = view.topleft
+        sequence : list[tuple] = []
+        for sprite in self._spritelist:
+            layer : int = layer_of[sprite]
+            if layer not in wanted or not sprite.visible: continue
+            rect : pygame.Rect = sprite.rect
+            if layer in SCREEN_LAYERS: dest : tuple[int, int] = (rect.x // scale, rect.y // scale)
+            elif colliderect(rect): dest = ((rect.x - vx) // scale, (rect.y - vy) // scale)
+            else: continue
+            area : pygame.Rect | None = sprite.source_rect
+            if getattr(sprite, "image_scale", 1) == scale: image : pygame.Surface = sprite.image
+            else:
+                image = reduce_surface(sprite.image, scale)
+                if area is not None: area = pygame.Rect(area.x // scale, area.y // scale, area.width // scale, area.height // scale)
+            sequence.append((image, dest, area, sprite.blendmode))
+        return sequence
@@ -0,0 +1,70 @@
+import pygame
+from utility.game_constants import CELL_SIZE
+
+class SpatialHash:
+    """
+    Uniform grid that buckets sprites by the cells their rect covers, so rect queries only touch nearby sprites.
+    """
+    # Attributes
+    _cell_size : int
+    _cells : dict[tuple[int, int], list[pygame.sprite.Sprite]]
+    _order : dict[pygame.sprite.Sprite, int]
+    _next_id : int
+
+    # Magic Methods
+    def __init__(self, cell_size : int = CELL_SIZE):
+        self._cell_size = cell_size
+        self._cells = {}
+        self._order = {}
+        self._next_id = 0
+
+    def __len__(self) -> int: return len(self._order)
+
+    # Accessors/Setters
+    @property
+    def cell_size(self) -> int: return self._cell_size
+
+    # Methods
+    def cells_for(self, rect : pygame.Rect) -> tuple[range, range]:
+        """
+        Cell coordinate ranges covered by a rect
+        :param rect: pygame.Rect
+        :return tuple[range, range]
+        """
+        size : int = self._cell_size
+        return (range(rect.left // size, (rect.right - 1) // size + 1),
+                range(rect.top // size, (rect.bottom - 1) // size + 1))
+
+    def insert(self, sprite : pygame.sprite.Sprite):
+        if sprite in self._order: return
+        self._order[sprite] = self._next_id
+        self._next_id += 1
+        cols, rows = self.cells_for(sprite.rect)
+        for cx in cols:
+            for cy in rows:
+                self._cells.setdefault((cx, cy), []).append(sprite)
+
+    def remove(self, sprite : pygame.sprite.Sprite):
+        if self._order.pop(sprite, None) is None: return
+        cols, rows = self.cells_for(sprite.rect)
+        for cx in cols:
+            for cy in rows:
+                bucket : list[pygame.sprite.Sprite] = self._cells.get((cx, cy))
+                if bucket is None: continue
+                bucket.remove(sprite)
+                if not bucket: del self._cells[(cx, cy)]
+
+    def query(self, rect : pygame.Rect) -> list[pygame.sprite.Sprite]:
+        """
+        Finds every sprite sharing at least one cell with rect, in insertion order
+        :param rect: pygame.Rect
+        :return list[pygame.sprite.Sprite]
+        """
+        found : set[pygame.sprite.Sprite] = set()
+        cols, rows = self.cells_for(rect)
+        for cx in cols:
+            for cy in rows:
+                bucket : list[pygame.sprite.Sprite] = self._cells.get((cx, cy))
+                if bucket is not None: found.update(bucket)
+        # Keep terrain order stable, collision resolution is order dependent
+        return sorted(found, key=self._order.__getitem__)
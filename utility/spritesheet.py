@@ -1,4 +1,5 @@
 import pygame
+from utility.image_loader import derive_surface, load_cached, cut_frames
 
 class SpriteSheet:
 	_sheet : pygame.Surface
@@ -6,13 +7,25 @@ class SpriteSheet:
 	def __init__(self, image : pygame.Surface = None, image_path : str = ""):
 		if image is None and image_path == "": raise ValueError("SpriteSheet: At least one of sprite_path or image must be provided")
 		if image is not None: self._sheet = image
-		else: self._sheet = pygame.image.load(image_path).convert_alpha()
+		else: self._sheet = load_cached(image_path)
 
 
 	def get_frame(self, frame : int, width : int, height : int, scale : tuple[int, int], colour : tuple[int, int, int],
 				  gap : int, x_offset : int = 0, y_offset : int = 0) -> pygame.Surface:
-		image = pygame.Surface((width, height)).convert_alpha()
-		image.blit(self._sheet, (0, 0), ((frame * gap) + x_offset, y_offset, width, height))
-		image = pygame.transform.scale(image, size=scale)
-		image.set_colorkey(colour)
-		return image
+		return derive_surface(self._sheet, size=scale, colorkey=colour, area=((frame * gap) + x_offset, y_offset, width, height))
+
+	def get_view(self, rect : tuple[int, int, int, int]) -> pygame.Surface:
+		"""
+		A frame that shares the sheet's pixels instead of copying them, for frames stored at the size they are drawn
+		:param rect: tuple[int, int, int, int], (x, y, width, height)
+		:return pygame.Surface
+		"""
+		return self._sheet.subsurface(rect)
+
+	def get_frames(self, animation : dict) -> list[pygame.Surface]:
+		"""
+		Every frame of an animation definition, see utility.atlas_format.read_animations
+		:param animation: dict
+		:return list[pygame.Surface]
+		"""
+		return cut_frames(self._sheet, animation)
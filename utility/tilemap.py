@@ -0,0 +1,130 @@
+import pygame
+from collections import OrderedDict
+from typing import Callable
+from utility.game_constants import CELL_SIZE
+
+# Tile Constants
+EMPTY : int = 0
+PASS_TOP : int = 1
+PASS_BOT : int = 2
+PASS_LEFT : int = 4
+PASS_RIGHT : int = 8
+MAX_KIND : int = 255 # kinds are stored in a byte
+BLOCK_CACHE_SIZE : int = 4096 # cell Blocks kept around for find_near_blocks callers, least recently used dropped first
+
+# Helpers
+def pack_passthrough(top : bool = False, bot : bool = False, left : bool = False, right : bool = False) -> int:
+    return (PASS_TOP if top else 0) | (PASS_BOT if bot else 0) | (PASS_LEFT if left else 0) | (PASS_RIGHT if right else 0)
+
+class TileMap:
+    """
+    Static terrain as a grid of one byte kind ids and one byte of passthrough flags per cell, row major.
+    Sprites for code that wants Block objects are built per cell on demand by make_block(kind, flags, x, y).
+    """
+    # Attributes
+    _width : int
+    _height : int
+    _cell_size : int
+    _kinds : bytearray
+    _flags : bytearray
+    _make_block : Callable[[int, int, int, int], pygame.sprite.Sprite | None]
+    _blocks : OrderedDict[int, pygame.sprite.Sprite | None] # cell -> its Block, least recently used first
+
+    # Magic Methods
+    def __init__(self, width : int, height : int, make_block : Callable[[int, int, int, int], pygame.sprite.Sprite | None],
+                 cell_size : int = CELL_SIZE):
+        self._width = width
+        self._height = height
+        self._cell_size = cell_size
+        self._kinds = bytearray(width * height)
+        self._flags = bytearray(width * height)
+        self._make_block = make_block
+        self._blocks = OrderedDict()
+
+    # Accessors/Setters
+    @property
+    def width(self) -> int: return self._width
+
+    @property
+    def height(self) -> int: return self._height
+
+    @property
+    def nbytes(self) -> int: return len(self._kinds) + len(self._flags)
+
+    def kind_at(self, x : int, y : int) -> int:
+        if not (0 <= x < self._width and 0 <= y < self._height): return EMPTY
+        return self._kinds[y * self._width + x]
+
+    def flags_at(self, x : int, y : int) -> int:
+        if not (0 <= x < self._width and 0 <= y < self._height): return 0
+        return self._flags[y * self._width + x]
+
+    # Methods
+    def fill(self, x : int, y : int, width : int, height : int, kind : int, flags : int = 0):
+        """
+        Sets a rect of cells (clipped to the map) to kind, later fills overwrite earlier ones like later blocks did
+        """
+        if not EMPTY <= kind <= MAX_KIND: raise ValueError(f"TileMap: kind {kind} does not fit in a cell, kinds go from {EMPTY} to {MAX_KIND}")
+        left : int = max(x, 0)
+        right : int = min(x + width, self._width)
+        if right <= left: return
+        kind_row : bytes = bytes((kind,)) * (right - left)
+        flag_row : bytes = bytes((flags,)) * (right - left)
+        for row in range(max(y, 0), min(y + height, self._height)):
+            start : int = row * self._width + left
+            self._kinds[start:start + right - left] = kind_row
+            self._flags[start:start + right - left] = flag_row
+            for i in range(start, start + right - left): self._blocks.pop(i, None)
+
+    def cell_range(self, rect : pygame.Rect) -> tuple[range, range]:
+        """
+        Cell coordinates rect overlaps, clipped to the map
+        :param rect: pygame.Rect
+        :return tuple[range, range]
+        """
+        size : int = self._cell_size
+        return (range(max(rect.left // size, 0), min((rect.right - 1) // size + 1, self._width)),
+                range(max(rect.top // size, 0), min((rect.bottom - 1) // size + 1, self._height)))
+
+    def any_in(self, cols : range, rows : range) -> bool:
+        for row in rows:
+            start : int = row * self._width
+            if self._kinds[start + cols.start:start + cols.stop].strip(b"\0"): return True
+        return False
+
+    def cells_in(self, rect : pygame.Rect) -> list[tuple[int, int, int]]:
+        """
+        Non-empty cells rect overlaps, as (x, y, kind)
+        :param rect: pygame.Rect
+        :return list[tuple[int, int, int]]
+        """
+        cols, rows = self.cell_range(rect)
+        cells : list[tuple[int, int, int]] = []
+        kinds : bytearray = self._kinds
+        for row in rows:
+            start : int = row * self._width
+            for col in cols:
+                kind : int = kinds[start + col]
+                if kind != EMPTY: cells.append((col, row, kind))
+        return cells
+
+    def blocks_in(self, rect : pygame.Rect) -> list[pygame.sprite.Sprite]:
+        """
+        One sprite per non-empty cell rect overlaps, in row order, reused between calls.
+        The BLOCK_CACHE_SIZE most recently returned are kept, so the cells around the Player stay made as it moves on.
+        :param rect: pygame.Rect
+        :return list[pygame.sprite.Sprite]
+        """
+        cache : OrderedDict[int, pygame.sprite.Sprite | None] = self._blocks
+        blocks : list[pygame.sprite.Sprite] = []
+        for col, row, kind in self.cells_in(rect):
+            index : int = row * self._width + col
+            if index in cache:
+                cache.move_to_end(index)
+                block : pygame.sprite.Sprite | None = cache[index]
+            else:
+                block = self._make_block(kind, self._flags[index], col, row)
+                cache[index] = block
+            if block is not None: blocks.append(block)
+        while len(cache) > BLOCK_CACHE_SIZE: cache.popitem(last=False)
+        return blocks
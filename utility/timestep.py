@@ -0,0 +1,89 @@
+import time
+from typing import Callable
+from utility.game_constants import SIMULATION_DT, FPS, INPUT_POLL_RATE, MAX_FRAME_TIME
+
+class FixedTimestep:
+    """
+    Turns real time into fixed length simulation ticks and paced frames. Time passing goes into an accumulator that
+    whole ticks are taken out of, what is left is how far into the next tick the frame is drawn, see alpha.
+    A frame is only drawn once every tick due before it has run, so a machine that can't keep up draws fewer frames
+    while the simulation keeps real time. Stalls longer than max_frame_time aren't caught up on, so a slow tick can't
+    make every following frame run more of them.
+    """
+    # Attributes
+    dt : float
+    frame_time : float # s, 0 when frames aren't capped
+    poll_time : float
+    max_frame_time : float
+    _now : Callable[[], float]
+    _sleep : Callable[[float], None]
+    _accumulator : float
+    _last : float
+    _next_frame : float
+
+    # Magic Methods
+    def __init__(self, dt : float = SIMULATION_DT, frame_rate : int = FPS, poll_rate : int = INPUT_POLL_RATE,
+                 max_frame_time : float = MAX_FRAME_TIME, now : Callable[[], float] = time.perf_counter,
+                 sleep : Callable[[float], None] = time.sleep):
+        """
+        :param dt: float, s per tick
+        :param frame_rate: int, frames per second at most, 0 for uncapped
+        :param poll_rate: int, Hz input is read at between frames
+        :param max_frame_time: float, s
+        :param now: Callable[[], float], s, a monotonic clock
+        :param sleep: Callable[[float], None]
+        """
+        self.dt = dt
+        self.frame_time = 1 / frame_rate if frame_rate > 0 else 0
+        self.poll_time = 1 / poll_rate
+        self.max_frame_time = max_frame_time
+        self._now = now
+        self._sleep = sleep
+        self.reset()
+
+    # Accessors/Setters
+    @property
+    def alpha(self) -> float:
+        """
+        How far real time has got between the last tick and the next one
+        :return float: 0 to 1
+        """
+        return min(self._accumulator / self.dt, 1)
+
+    # Methods
+    def reset(self):
+        """
+        Starts counting from now, for after a load whose time shouldn't be played
+        """
+        self._accumulator = 0
+        self._last = self._now()
+        self._next_frame = self._last
+
+    def advance(self) -> int:
+        """
+        Adds the time since the last call to the accumulator
+        :return int: ticks due now, taken out of the accumulator
+        """
+        now : float = self._now()
+        self._accumulator += min(now - self._last, self.max_frame_time)
+        self._last = now
+        ticks : int = int(self._accumulator // self.dt)
+        self._accumulator -= ticks * self.dt
+        return ticks
+
+    def frame_due(self) -> bool: return self._now() >= self._next_frame
+
+    def frame_drawn(self):
+        """
+        Schedules the next frame, frames that were missed are dropped rather than drawn late
+        """
+        self._next_frame = max(self._next_frame + self.frame_time, self._now())
+
+    def wait(self):
+        """
+        Sleeps until the next frame, tick or input poll, whichever is first
+        """
+        now : float = self._now()
+        until_tick : float = self.dt - self._accumulator - (now - self._last)
+        delay : float = min(self.poll_time, until_tick, self._next_frame - now)
+        if delay > 0: self._sleep(delay)